@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2022 by SCICO Developers
+# All rights reserved. BSD 3-clause License.
+# This file is part of the SCICO package. Details of the copyright and
+# user license can be found in the 'LICENSE' file distributed with the
+# package.
+
+"""Host callbacks for interfacing with external libraries."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+import numpy as np
+
+import jax
+
+try:
+    from jax.custom_batching import custom_vmap
+except ImportError:
+    have_custom_vmap = False
+else:
+    have_custom_vmap = True
+
+from scico.typing import Array
+
+
+def host_view(x: Array, dtype: Any = None) -> np.ndarray:
+    """Obtain a C-contiguous host array view of an array.
+
+    A copy is only made if `x` is not C-contiguous, is not of the
+    specified dtype, or is not already on the host. Since the result
+    may share memory with a JAX array, it is not writeable, and must not
+    be modified by the caller.
+
+    Args:
+        x: Input array.
+        dtype: Required dtype of the result. Defaults to the dtype of
+            `x`.
+
+    Returns:
+        Host array with the same values as `x`.
+    """
+    return np.ascontiguousarray(x, dtype=dtype)
+
+
+def _host_executor() -> ThreadPoolExecutor:
+    """Get the thread pool used for batched host callbacks."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+    return _executor
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _batched_host_callback(
+    func: Callable, result_shape: jax.ShapeDtypeStruct, batch_shape: Tuple[int, ...], *args: Any
+) -> Any:
+    """Call a host function on a batch of arguments.
+
+    All arguments have leading axes of shape `batch_shape`, and `func`
+    is applied to each element of the batch on a thread pool. Batching
+    of the call by :func:`jax.vmap` adds a leading batch axis.
+    """
+
+    def host_func(*args):
+        def item(index):
+            out = func(*[arg[index] for arg in args])
+            return np.asarray(out, dtype=result_shape.dtype).reshape(result_shape.shape)
+
+        if batch_shape == ():
+            return item(())
+        results = list(_host_executor().map(item, np.ndindex(*batch_shape)))
+        return np.stack(results).reshape(batch_shape + result_shape.shape)
+
+    def call(*args):
+        return jax.pure_callback(
+            host_func,
+            jax.ShapeDtypeStruct(batch_shape + result_shape.shape, result_shape.dtype),
+            *args,
+        )
+
+    if not have_custom_vmap:
+        # batched calls are performed sequentially by the default
+        # batching rule of jax.pure_callback
+        return call(*args)
+
+    call = custom_vmap(call)
+
+    @call.def_vmap
+    def call_vmap(axis_size, in_batched, *args):
+        args = [
+            arg if batched else jax.numpy.broadcast_to(arg, (axis_size,) + arg.shape)
+            for arg, batched in zip(args, in_batched)
+        ]
+        return _batched_host_callback(func, result_shape, (axis_size,) + batch_shape, *args), True
+
+    return call(*args)
+
+
+def pure_host_callback(func: Callable, result_shape: jax.ShapeDtypeStruct, *args: Any) -> Any:
+    """Call a host function from within JAX.
+
+    Call a pure function `func` of array arguments implemented by an
+    external library, via :func:`jax.pure_callback`. In contrast to
+    :func:`jax.experimental.host_callback.call`, on the CPU the
+    arguments are passed to `func` as :class:`numpy.ndarray` views of
+    the XLA buffers, without copying, and the call is compatible with
+    :func:`jax.jit` and :func:`jax.vmap`. The result of `func` is only
+    converted if it is not already of the required dtype. Note that,
+    since the arguments are read-only views, `func` may not modify them
+    in place.
+
+    When the call is batched by :func:`jax.vmap`, a single host
+    callback receives the full stack of arguments, and `func` is
+    applied to each element of the stack in parallel on a shared thread
+    pool, so that external libraries that release the GIL process
+    multiple inputs concurrently. Arguments that are not batched are
+    broadcast along the batch axes. If :mod:`jax.custom_batching` is not
+    available in the installed version of JAX, batched calls are
+    instead performed sequentially, with one host callback per element.
+
+    Args:
+        func: Host function mapping :class:`numpy.ndarray` arguments
+            to an array of shape and dtype specified by `result_shape`.
+        result_shape: Shape and dtype of the result.
+        *args: Array arguments of `func`.
+
+    Returns:
+        Result of `func` as a JAX array.
+    """
+    return _batched_host_callback(func, result_shape, (), *args)
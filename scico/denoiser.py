@@ -12,7 +12,7 @@ from typing import Any, Union
 
 import numpy as np
 
-from jax.experimental import host_callback as hcb
+import jax
 
 try:
     import bm3d as tubm3d
@@ -33,6 +33,7 @@ else:
     from bm4d.profiles import BM4DProfile  # type: ignore
 
 import scico.numpy as snp
+from scico._callback import pure_host_callback
 from scico._flax import DnCNNNet, load_weights
 from scico.data import _flax_data_path
 from scico.typing import JaxArray
@@ -48,6 +49,8 @@ def bm3d(x: JaxArray, sigma: float, is_rgb: bool = False, profile: Union[BM3DPro
     :cite:`makinen-2019-exact`. Since this package is an interface
     to compiled C code, JAX features such as automatic differentiation
     and support for GPU devices are not available.
+    A stack of inputs may be denoised via :func:`jax.vmap`, in which
+    case the inputs are denoised in parallel on the host.
 
     Args:
         x: Input image. Expected to be a 2D array (gray-scale denoising)
@@ -87,7 +90,7 @@ def bm3d(x: JaxArray, sigma: float, is_rgb: bool = False, profile: Union[BM3DPro
             "BM3D requires two-dimensional or three dimensional inputs; got ndim = {x.ndim}."
         )
 
-    # This check is also performed inside the BM3D call, but due to the host_callback,
+    # This check is also performed inside the BM3D call, but due to the host callback,
     # no exception is raised and the program will crash with no traceback.
     # NOTE: if BM3D is extended to allow for different profiles, the block size must be
     #       updated; this presumes 'np' profile (bs=8)
@@ -106,7 +109,12 @@ def bm3d(x: JaxArray, sigma: float, is_rgb: bool = False, profile: Union[BM3DPro
                 " the additional axes are singletons."
             )
 
-    y = hcb.call(lambda args: bm3d_eval(*args).astype(x.dtype), (x, sigma), result_shape=x)
+    y = pure_host_callback(
+        lambda x, sigma: bm3d_eval(x, float(sigma)),
+        jax.ShapeDtypeStruct(x.shape, x.dtype),
+        x,
+        sigma,
+    )
 
     # undo squeezing, if neccessary
     y = y.reshape(x_in_shape)
@@ -122,6 +130,8 @@ def bm4d(x: JaxArray, sigma: float, profile: Union[BM4DProfile, str] = "np"):
     :cite:`maggioni-2012-nonlocal`. Since this package is an interface
     to compiled C code, JAX features such as automatic differentiation
     and support for GPU devices are not available.
+    A stack of inputs may be denoised via :func:`jax.vmap`, in which
+    case the inputs are denoised in parallel on the host.
 
     Args:
         x: Input image. Expected to be a 3D array. Higher-dimensional
@@ -148,7 +158,7 @@ def bm4d(x: JaxArray, sigma: float, profile: Union[BM4DProfile, str] = "np"):
     if isinstance(x.ndim, tuple) or x.ndim < 3:
         raise ValueError(f"BM4D requires three-dimensional inputs; got ndim = {x.ndim}.")
 
-    # This check is also performed inside the BM4D call, but due to the host_callback,
+    # This check is also performed inside the BM4D call, but due to the host callback,
     # no exception is raised and the program will crash with no traceback.
     # NOTE: if BM4D is extended to allow for different profiles, the block size must be
     #       updated; this presumes 'np' profile (bs=8)
@@ -167,7 +177,12 @@ def bm4d(x: JaxArray, sigma: float, profile: Union[BM4DProfile, str] = "np"):
                 " the additional axes are singletons."
             )
 
-    y = hcb.call(lambda args: bm4d_eval(*args).astype(x.dtype), (x, sigma), result_shape=x)
+    y = pure_host_callback(
+        lambda x, sigma: bm4d_eval(x, float(sigma)),
+        jax.ShapeDtypeStruct(x.shape, x.dtype),
+        x,
+        sigma,
+    )
 
     # undo squeezing, if neccessary
     y = y.reshape(x_in_shape)
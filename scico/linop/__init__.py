@@ -15,8 +15,21 @@ from ._dft import DFT
 from ._diag import Diagonal, Identity
 from ._diff import FiniteDifference, SingleAxisFiniteDifference
 from ._func import Crop, Pad, Reshape, Slice, Sum, Transpose, linop_from_function
-from ._linop import ComposedLinearOperator, LinearOperator
-from ._matrix import MatrixOperator
+from ._linop import (
+    ComposedLinearOperator,
+    LinearOperator,
+    ScaledLinearOperator,
+    SumLinearOperator,
+)
+from ._matrix import MatrixOperator, OutOfCoreMatrixOperator
+from ._precond import (
+    block_jacobi_preconditioner,
+    circulant_preconditioner,
+    estimate_diagonal,
+    jacobi_preconditioner,
+)
+from ._simplify import simplify
+from ._sparse import SparseMatrixOperator
 from ._stack import DiagonalStack, VerticalStack
 from ._util import jacobian, operator_norm, power_iteration, valid_adjoint
 
@@ -31,6 +44,8 @@ __all__ = [
     "VerticalStack",
     "DiagonalStack",
     "MatrixOperator",
+    "OutOfCoreMatrixOperator",
+    "SparseMatrixOperator",
     "Pad",
     "Crop",
     "Reshape",
@@ -39,11 +54,18 @@ __all__ = [
     "Transpose",
     "LinearOperator",
     "ComposedLinearOperator",
+    "SumLinearOperator",
+    "ScaledLinearOperator",
+    "simplify",
     "linop_from_function",
     "operator_norm",
     "power_iteration",
     "valid_adjoint",
     "jacobian",
+    "estimate_diagonal",
+    "jacobi_preconditioner",
+    "block_jacobi_preconditioner",
+    "circulant_preconditioner",
 ]
 
 # Imported items in __all__ appear to originate in top-level linop module
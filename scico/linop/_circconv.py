@@ -23,7 +23,7 @@ from scico.numpy.util import is_nested
 from scico.operator import Operator
 from scico.typing import Array, DType, JaxArray, Shape
 
-from ._linop import LinearOperator, _wrap_add_sub, _wrap_mul_div_scalar
+from ._linop import LinearOperator, _cache_gram_op, _wrap_add_sub, _wrap_mul_div_scalar
 
 
 class CircularConvolve(LinearOperator):
@@ -167,6 +167,15 @@ class CircularConvolve(LinearOperator):
         self.ifft_axes = list(range(len(output_shape) - self.ndims, len(output_shape)))
         self.x_fft_axes = list(range(len(input_shape) - self.ndims, len(input_shape)))
 
+        # DFT of the filter of the Gram operator, which is only
+        # computed when it is known to be circulant with the same input
+        # shape, i.e. when h is known to be real for real output
+        self.h_gram_dft: Optional[JaxArray] = None
+        if not self.real or not h_is_dft:
+            h_gram_dft = snp.sum(snp.conj(self.h_dft) * self.h_dft, axis=self.batch_axes)
+            if np.broadcast_shapes(h_gram_dft.shape, input_shape) == tuple(input_shape):
+                self.h_gram_dft = h_gram_dft
+
         super().__init__(
             input_shape=input_shape,
             output_shape=output_shape,
@@ -199,6 +208,35 @@ class CircularConvolve(LinearOperator):
             H_adj_x = H_adj_x.real
         return H_adj_x
 
+    def _gram(self, x: JaxArray) -> JaxArray:
+        if self.h_gram_dft is None or self.input_dtype != self.output_dtype:
+            return super()._gram(x)
+        x = x.astype(self.input_dtype)
+        x_dft = snp.fft.fftn(x, axes=self.x_fft_axes)
+        HHx = snp.fft.ifftn(self.h_gram_dft * x_dft, axes=self.x_fft_axes)
+        if self.real:
+            HHx = HHx.real
+        return HHx
+
+    @property
+    @_cache_gram_op
+    def gram_op(self) -> LinearOperator:
+        r"""Gram operator of this :class:`CircularConvolve`.
+
+        Return a :class:`CircularConvolve` with DFT domain filter
+        :math:`\sum_m \abs{\hat{\mb{h}}_m}^2`, where the sum is over
+        the filters :math:`\mb{h}_m` of a multi-filter operator.
+        """
+        if self.h_gram_dft is None or self.input_dtype != self.output_dtype:
+            return super().gram_op
+        return CircularConvolve(
+            h=self.h_gram_dft,
+            input_shape=self.input_shape,
+            ndims=self.ndims,
+            input_dtype=self.input_dtype,
+            h_is_dft=True,
+        )
+
     @partial(_wrap_add_sub, op=operator.add)
     def __add__(self, other):
         if self.ndims != other.ndims:
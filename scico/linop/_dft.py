@@ -19,7 +19,8 @@ import numpy as np
 import scico.numpy as snp
 from scico.typing import JaxArray, Shape
 
-from ._linop import LinearOperator
+from ._diag import Identity
+from ._linop import LinearOperator, _cache_gram_op
 
 
 class DFT(LinearOperator):
@@ -71,6 +72,14 @@ class DFT(LinearOperator):
         self.axes_shape = axes_shape
         self.norm = norm
 
+        # The Gram operator is a multiple of the identity unless the
+        # input is zero-padded or truncated on the DFT axes.
+        self.gram_scale: Optional[float] = None
+        if axes_shape is None or list(axes_shape) == self.inv_axes_shape:
+            dft_axes = range(len(input_shape)) if axes is None else axes
+            size = int(np.prod([input_shape[i] for i in dft_axes]))
+            self.gram_scale = {"ortho": 1.0, "forward": 1.0 / size}.get(norm, float(size))
+
         # To satisfy mypy -- DFT shapes must be tuples, not list of tuple
         # These get set inside of super().__init__ call, but we want to have
         # more restrictive type than the general LinearOperator
@@ -89,6 +98,25 @@ class DFT(LinearOperator):
     def _eval(self, x: JaxArray) -> JaxArray:
         return snp.fft.fftn(x, s=self.axes_shape, axes=self.axes, norm=self.norm)
 
+    def _gram(self, x: JaxArray) -> JaxArray:
+        if self.gram_scale is None:
+            return super()._gram(x)
+        return (self.gram_scale * x).astype(self.input_dtype)
+
+    @property
+    @_cache_gram_op
+    def gram_op(self) -> LinearOperator:
+        """Gram operator of this :class:`DFT`.
+
+        Return an :class:`.Identity`, or a scalar multiple of it
+        represented as a :class:`.Diagonal`, unless the input is
+        zero-padded or truncated on the DFT axes.
+        """
+        if self.gram_scale is None:
+            return super().gram_op
+        I = Identity(self.input_shape, input_dtype=self.input_dtype)
+        return I if self.gram_scale == 1.0 else self.gram_scale * I
+
     def inv(self, z: JaxArray) -> JaxArray:
         """Compute the inverse of this LinearOperator.
 
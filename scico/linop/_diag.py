@@ -21,7 +21,7 @@ from scico.numpy.util import ensure_on_device, is_nested
 from scico.operator._operator import _wrap_mul_div_scalar
 from scico.typing import BlockShape, DType, JaxArray, Shape
 
-from ._linop import LinearOperator, _wrap_add_sub
+from ._linop import LinearOperator, _cache_gram_op, _wrap_add_sub
 
 __all__ = [
     "Diagonal",
@@ -77,6 +77,28 @@ class Diagonal(LinearOperator):
     def _eval(self, x):
         return x * self.diagonal
 
+    def _gram(self, x):
+        if self.output_shape != self.input_shape:
+            return super()._gram(x)
+        return x * (snp.conj(self.diagonal) * self.diagonal)
+
+    @property
+    @_cache_gram_op
+    def gram_op(self) -> LinearOperator:
+        r"""Gram operator of this :class:`Diagonal`.
+
+        Return a :class:`Diagonal` with diagonal elements
+        :math:`\abs{d_i}^2`, unless broadcasting of the diagonal
+        results in an output shape that differs from the input shape.
+        """
+        if self.output_shape != self.input_shape:
+            return super().gram_op
+        return Diagonal(
+            snp.conj(self.diagonal) * self.diagonal,
+            input_shape=self.input_shape,
+            input_dtype=self.input_dtype,
+        )
+
     @partial(_wrap_add_sub, op=operator.add)
     def __add__(self, other):
         if self.diagonal.shape == other.diagonal.shape:
@@ -117,5 +139,14 @@ class Identity(Diagonal):
     def _eval(self, x: Union[JaxArray, BlockArray]) -> Union[JaxArray, BlockArray]:
         return x
 
+    def _gram(self, x: Union[JaxArray, BlockArray]) -> Union[JaxArray, BlockArray]:
+        return x
+
+    @property
+    @_cache_gram_op
+    def gram_op(self) -> Identity:
+        """Gram operator of this :class:`Identity`, which is itself."""
+        return self
+
     def __rmatmul__(self, x: Union[JaxArray, BlockArray]) -> Union[JaxArray, BlockArray]:
         return x
@@ -280,3 +280,23 @@ class SingleAxisFiniteDifference(LinearOperator):
                 append = 0
 
         return snp.diff(x, axis=self.axis, prepend=prepend, append=append)
+
+    def _gram(self, x: JaxArray) -> JaxArray:
+        # The Gram operator is a second order difference (a Laplacian
+        # stencil along the axis), with boundary handling depending on
+        # the boundary extension of the difference.
+        if self.circular:
+            return 2 * x - snp.roll(x, 1, axis=self.axis) - snp.roll(x, -1, axis=self.axis)
+        y = -snp.diff(snp.diff(x, axis=self.axis), axis=self.axis, prepend=0, append=0)
+        if self.prepend == 1:
+            ind = tuple(
+                slice(0, 1) if i == self.axis else slice(None) for i in range(len(self.input_shape))
+            )
+            y = y.at[ind].add(x[ind])
+        if self.append == 1:
+            ind = tuple(
+                slice(-1, None) if i == self.axis else slice(None)
+                for i in range(len(self.input_shape))
+            )
+            y = y.at[ind].add(x[ind])
+        return y
@@ -10,10 +10,12 @@ from typing import Any, Callable, Optional, Sequence, Union
 
 import scico.numpy as snp
 from scico._autograd import linear_adjoint
+from scico.numpy import BlockArray
 from scico.numpy.util import indexed_shape, is_nested
 from scico.typing import ArrayIndex, BlockShape, DType, JaxArray, Shape
 
-from ._linop import LinearOperator
+from ._diag import Diagonal
+from ._linop import LinearOperator, _cache_gram_op
 
 __all__ = ["operator_from_function", "Tranpose", "Sum", "Crop", "Pad", "Reshape", "Slice"]
 
@@ -127,6 +129,23 @@ class Crop(LinearOperator):
             **kwargs,
         )
 
+    def _gram(self, x: JaxArray) -> JaxArray:
+        # zero the cropped border of x
+        return snp.pad(self(x), pad_width=self.crop_width)
+
+    @property
+    @_cache_gram_op
+    def gram_op(self) -> LinearOperator:
+        """Gram operator of this :class:`Crop`.
+
+        Return a :class:`.Diagonal` with diagonal elements equal to one
+        within the cropped region and zero elsewhere.
+        """
+        return Diagonal(
+            self._gram(snp.ones(self.input_shape, dtype=self.input_dtype)),
+            input_dtype=self.input_dtype,
+        )
+
 
 class Slice(LinearOperator):
     """A linear operator for slicing an array."""
@@ -175,3 +194,26 @@ class Slice(LinearOperator):
 
     def _eval(self, x: JaxArray) -> JaxArray:
         return x[self.idx]
+
+    def _gram(self, x: Union[JaxArray, BlockArray]) -> Union[JaxArray, BlockArray]:
+        if is_nested(self.input_shape):
+            return super()._gram(x)
+        # the sliced elements of x, multiplied by the number of times
+        # they are selected by the index
+        return snp.zeros_like(x).at[self.idx].add(x[self.idx])
+
+    @property
+    @_cache_gram_op
+    def gram_op(self) -> LinearOperator:
+        """Gram operator of this :class:`Slice`.
+
+        Return a :class:`.Diagonal` with diagonal elements equal to the
+        number of times each input element is selected by the slice,
+        unless the input is a :class:`.BlockArray`.
+        """
+        if is_nested(self.input_shape):
+            return super().gram_op
+        return Diagonal(
+            self._gram(snp.ones(self.input_shape, dtype=self.input_dtype)),
+            input_dtype=self.input_dtype,
+        )
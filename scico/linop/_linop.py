@@ -68,14 +68,7 @@ def _wrap_add_sub(func: Callable, op: Callable) -> Callable:
                 if isinstance(
                     b, LinearOperator
                 ):  # LinearOperator + LinearOperator -> LinearOperator
-                    return LinearOperator(
-                        input_shape=a.input_shape,
-                        output_shape=a.output_shape,
-                        eval_fn=lambda x: op(a(x), b(x)),
-                        adj_fn=lambda x: op(a(x), b(x)),
-                        input_dtype=a.input_dtype,
-                        output_dtype=result_type(a.output_dtype, b.output_dtype),
-                    )
+                    return SumLinearOperator(a, -b if op is operator.sub else b)
                 # LinearOperator + Operator -> Operator
                 return Operator(
                     input_shape=a.input_shape,
@@ -90,6 +83,34 @@ def _wrap_add_sub(func: Callable, op: Callable) -> Callable:
     return wrapper
 
 
+def _cache_gram_op(func: Callable) -> Callable:
+    """Wrapper function for defining `gram_op` properties.
+
+    Wrapper function that caches the Gram operator computed by a
+    `gram_op` property, so that it is constructed once for each
+    :class:`LinearOperator`, and the same object is returned on each
+    access. This avoids recompilation of functions, such as
+    :func:`scico.solver.cg`, that are compiled for a specific operator
+    object. The Gram operator is constructed within
+    :func:`jax.ensure_compile_time_eval` so that the cached operator
+    does not hold tracers when first accessed within a traced function.
+
+    Args:
+        func: Function computing the Gram operator.
+    """
+
+    @wraps(func)
+    def wrapper(self):
+        gram_op = self.__dict__.get("_gram_op_cache")
+        if gram_op is None:
+            with jax.ensure_compile_time_eval():
+                gram_op = func(self)
+            self._gram_op_cache = gram_op
+        return gram_op
+
+    return wrapper
+
+
 class LinearOperator(Operator):
     """Generic linear operator base class"""
 
@@ -102,6 +123,7 @@ class LinearOperator(Operator):
         input_dtype: DType = np.float32,
         output_dtype: Optional[DType] = None,
         jit: bool = False,
+        gram_fn: Optional[Callable] = None,
     ):
         r"""
         Args:
@@ -129,6 +151,13 @@ class LinearOperator(Operator):
                 :class:`LinearOperator` to jit the forward, adjoint, and
                 gram functions. Same as calling :meth:`.jit` after the
                 :class:`LinearOperator` is created.
+            gram_fn: Function used to evaluate the Gram operator
+                `A.adj(A(x))` of this :class:`LinearOperator`, when a
+                more efficient implementation than evaluation of the
+                forward operator followed by the adjoint is available.
+                Defaults to ``None``. If ``None``, the Gram operator is
+                computed by the :meth:`._gram` method, which may be
+                overridden in derived classes.
         """
 
         super().__init__(
@@ -142,28 +171,38 @@ class LinearOperator(Operator):
 
         if not hasattr(self, "_adj"):
             self._adj: Optional[Callable] = None
-        if not hasattr(self, "_gram"):
-            self._gram: Optional[Callable] = None
         if callable(adj_fn):
             self._adj = adj_fn
-            self._gram = lambda x: self.adj(self(x))
         elif adj_fn is not None:
             raise TypeError(f"Parameter adj_fn must be either a Callable or None; got {adj_fn}.")
+        if callable(gram_fn):
+            self._gram = gram_fn
+        elif gram_fn is not None:
+            raise TypeError(f"Parameter gram_fn must be either a Callable or None; got {gram_fn}.")
 
         if jit:
             self.jit()
 
     def _set_adjoint(self):
-        """Automatically create adjoint and gram methods."""
+        """Automatically create adjoint method."""
         adj_fun = linear_adjoint(self.__call__, snp.zeros(self.input_shape, dtype=self.input_dtype))
         self._adj = lambda x: adj_fun(x)[0]
-        self._gram = lambda x: self.adj(self(x))
+
+    def _gram(self, x: Union[JaxArray, BlockArray]) -> Union[JaxArray, BlockArray]:
+        """Compute the Gram operator by evaluating the forward operator
+        followed by the adjoint.
+
+        Derived classes with a structured Gram operator, e.g. a diagonal
+        or circulant matrix, should override this method with a more
+        efficient closed-form implementation.
+        """
+        return self.adj(self(x))
 
     def jit(self):
         """Replace the private functions :meth:`._eval`, :meth:`_adj`, :meth:`._gram`
         with jitted versions.
         """
-        if (self._adj is None) or (self._gram is None):
+        if self._adj is None:
             self._set_adjoint()
 
         self._eval = jax.jit(self._eval)
@@ -172,58 +211,23 @@ class LinearOperator(Operator):
 
     @partial(_wrap_add_sub, op=operator.add)
     def __add__(self, other):
-        return LinearOperator(
-            input_shape=self.input_shape,
-            output_shape=self.output_shape,
-            eval_fn=lambda x: self(x) + other(x),
-            adj_fn=lambda x: self.adj(x) + other.adj(x),
-            input_dtype=self.input_dtype,
-            output_dtype=result_type(self.output_dtype, other.output_dtype),
-        )
+        return SumLinearOperator(self, other)
 
     @partial(_wrap_add_sub, op=operator.sub)
     def __sub__(self, other):
-        return LinearOperator(
-            input_shape=self.input_shape,
-            output_shape=self.output_shape,
-            eval_fn=lambda x: self(x) - other(x),
-            adj_fn=lambda x: self.adj(x) - other.adj(x),
-            input_dtype=self.input_dtype,
-            output_dtype=result_type(self.output_dtype, other.output_dtype),
-        )
+        return SumLinearOperator(self, -other)
 
     @_wrap_mul_div_scalar
     def __mul__(self, other):
-        return LinearOperator(
-            input_shape=self.input_shape,
-            output_shape=self.output_shape,
-            eval_fn=lambda x: other * self(x),
-            adj_fn=lambda x: snp.conj(other) * self.adj(x),
-            input_dtype=self.input_dtype,
-            output_dtype=result_type(self.output_dtype, other),
-        )
+        return ScaledLinearOperator(other, self)
 
     @_wrap_mul_div_scalar
     def __rmul__(self, other):
-        return LinearOperator(
-            input_shape=self.input_shape,
-            output_shape=self.output_shape,
-            eval_fn=lambda x: other * self(x),
-            adj_fn=lambda x: snp.conj(other) * self.adj(x),
-            input_dtype=self.input_dtype,
-            output_dtype=result_type(self.output_dtype, other),
-        )
+        return ScaledLinearOperator(other, self)
 
     @_wrap_mul_div_scalar
     def __truediv__(self, other):
-        return LinearOperator(
-            input_shape=self.input_shape,
-            output_shape=self.output_shape,
-            eval_fn=lambda x: self(x) / other,
-            adj_fn=lambda x: self.adj(x) / snp.conj(other),
-            input_dtype=self.input_dtype,
-            output_dtype=result_type(self.output_dtype, other),
-        )
+        return ScaledLinearOperator(1.0 / other, self)
 
     def __matmul__(self, other):
         # self @ other
@@ -367,15 +371,18 @@ class LinearOperator(Operator):
         )
 
     @property
+    @_cache_gram_op
     def gram_op(self) -> LinearOperator:
         """Gram operator of this :class:`LinearOperator`.
 
-        Return a new :class:`LinearOperator` `G` such that
-        `G(x) = A.adj(A(x)))`.
+        Return a :class:`LinearOperator` `G` such that
+        `G(x) = A.adj(A(x)))`. Derived classes may override this
+        property to return an operator of a structured type, e.g. a
+        :class:`.Diagonal` or :class:`.CircularConvolve`, which can be
+        merged with other operators by :func:`.simplify`. The Gram
+        operator is constructed on first access, and the same object
+        is returned on subsequent accesses.
         """
-        if self._gram is None:
-            self._set_adjoint()
-
         return LinearOperator(
             input_shape=self.input_shape,
             output_shape=self.input_shape,
@@ -400,9 +407,8 @@ class LinearOperator(Operator):
         Returns:
             Result of `A.adj(A(x))`.
         """
-        if self._gram is None:
-            self._set_adjoint()
-        assert self._gram is not None
+        if isinstance(x, LinearOperator):
+            return ComposedLinearOperator(self.gram_op, x)
         return self._gram(x)
 
 
@@ -461,3 +467,93 @@ class ComposedLinearOperator(LinearOperator):
             adj_fn=lambda z: self.B.adj(self.A.adj(z)),
             jit=jit,
         )
+
+
+class SumLinearOperator(LinearOperator):
+    """A sum of two :class:`LinearOperator` objects.
+
+    A new :class:`LinearOperator` formed by the sum of two other
+    :class:`LinearOperator` objects.
+    """
+
+    def __init__(self, A: LinearOperator, B: LinearOperator, jit: bool = False):
+        r"""
+        A :class:`SumLinearOperator` `S` implements
+        `S @ x == A @ x + B @ x`. :class:`LinearOperator` `A` and `B` are
+        stored as attributes of the :class:`SumLinearOperator`, so that
+        the structure of the sum is available to :func:`.simplify`.
+
+        Args:
+            A: First :class:`LinearOperator`.
+            B: Second :class:`LinearOperator`.
+            jit: If ``True``, call :meth:`~.LinearOperator.jit()` on this
+                :class:`LinearOperator` to jit the forward, adjoint, and
+                gram functions. Same as calling
+                :meth:`~.LinearOperator.jit` after the
+                :class:`LinearOperator` is created.
+        """
+        if not isinstance(A, LinearOperator) or not isinstance(B, LinearOperator):
+            raise TypeError(
+                "The arguments to SumLinearOperator must be LinearOperators; "
+                f"got {type(A)} and {type(B)}."
+            )
+        if A.shape != B.shape:
+            raise ValueError(f"Shapes {A.shape} and {B.shape} do not match.")
+
+        self.A = A
+        self.B = B
+
+        super().__init__(
+            input_shape=self.A.input_shape,
+            output_shape=self.A.output_shape,
+            input_dtype=self.A.input_dtype,
+            output_dtype=result_type(self.A.output_dtype, self.B.output_dtype),
+            eval_fn=lambda x: self.A(x) + self.B(x),
+            adj_fn=lambda z: self.A.adj(z) + self.B.adj(z),
+            jit=jit,
+        )
+
+
+class ScaledLinearOperator(LinearOperator):
+    """A scalar multiple of a :class:`LinearOperator`.
+
+    A new :class:`LinearOperator` formed by the product of a scalar and
+    another :class:`LinearOperator`.
+    """
+
+    def __init__(
+        self, scalar: Union[float, complex, JaxArray], A: LinearOperator, jit: bool = False
+    ):
+        r"""
+        A :class:`ScaledLinearOperator` `S` implements
+        `S @ x == scalar * (A @ x)`. The scalar and
+        :class:`LinearOperator` `A` are stored as attributes of the
+        :class:`ScaledLinearOperator`, so that the structure of the
+        product is available to :func:`.simplify`.
+
+        Args:
+            scalar: Scalar multiplier. May be a traced value.
+            A: :class:`LinearOperator` to be scaled.
+            jit: If ``True``, call :meth:`~.LinearOperator.jit()` on this
+                :class:`LinearOperator` to jit the forward, adjoint, and
+                gram functions. Same as calling
+                :meth:`~.LinearOperator.jit` after the
+                :class:`LinearOperator` is created.
+        """
+        if not isinstance(A, LinearOperator):
+            raise TypeError(
+                f"The second argument to ScaledLinearOperator must be a LinearOperator; got {type(A)}."
+            )
+
+        self.scalar = scalar
+        self.A = A
+
+        super().__init__(
+            input_shape=self.A.input_shape,
+            output_shape=self.A.output_shape,
+            input_dtype=self.A.input_dtype,
+            output_dtype=result_type(self.A.output_dtype, scalar),
+            eval_fn=lambda x: self.scalar * self.A(x),
+            adj_fn=lambda z: snp.conj(self.scalar) * self.A.adj(z),
+            jit=jit,
+        )
@@ -13,7 +13,9 @@
 from __future__ import annotations
 
 import operator
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial, wraps
+from typing import Iterator, Optional, Tuple, Union
 
 import numpy as np
 
@@ -22,10 +24,11 @@ from jax.dtypes import result_type
 from jax.interpreters.xla import DeviceArray
 
 import scico.numpy as snp
-from scico.typing import JaxArray
+from scico._callback import host_view, pure_host_callback
+from scico.typing import DType, JaxArray
 
 from ._diag import Identity
-from ._linop import LinearOperator
+from ._linop import LinearOperator, _cache_gram_op
 
 
 def _wrap_add_sub_matrix(func, op):
@@ -246,12 +249,14 @@ class MatrixOperator(LinearOperator):
         return np.array(self.A)
 
     @property
+    @_cache_gram_op
     def gram_op(self):
         """Gram operator of this :class:`.MatrixOperator`.
 
         Return a new :class:`.LinearOperator` `G` such that
         `G(x) = A.adj(A(x)))`."""
-        return MatrixOperator(A=self.A.conj().T @ self.A)
+        input_cols = self.input_shape[1] if len(self.input_shape) == 2 else 0
+        return MatrixOperator(A=self.A.conj().T @ self.A, input_cols=input_cols)
 
     def norm(self, ord=None, axis=None, keepdims=False):  # pylint: disable=W0622
         """Compute the norm of the dense matrix `self.A`.
@@ -259,3 +264,145 @@ class MatrixOperator(LinearOperator):
         Call :func:`scico.numpy.norm` on the dense matrix `self.A`.
         """
         return snp.linalg.norm(self.A, ord=ord, axis=axis, keepdims=keepdims)
+
+
+class OutOfCoreMatrixOperator(LinearOperator):
+    """Linear operator implementing multiplication by a matrix on disk.
+
+    Linear operator implementing multiplication by a dense matrix that is
+    memory-mapped from a file, e.g. a matrix that is too large to be
+    held in memory. The operator, its adjoint, and its Gram operator are
+    applied on the host by streaming blocks of rows of the matrix from
+    the file, with the next block read by a background thread while
+    the current block is being processed. The Gram operator is applied
+    in a single pass over the matrix. Since the operator is applied via
+    host callbacks, it can be used within functions transformed by
+    :func:`jax.jit`, and therefore by solvers such as
+    :func:`scico.solver.cg`, :func:`scico.solver.lstsq`, and
+    :class:`.ADMM` with a :class:`.LinearSubproblemSolver`.
+    """
+
+    def __init__(
+        self,
+        A: Union[str, np.ndarray],
+        shape: Optional[Tuple[int, int]] = None,
+        dtype: Optional[DType] = None,
+        offset: int = 0,
+        input_cols: int = 0,
+        block_rows: Optional[int] = None,
+    ):
+        """
+        Args:
+            A: Either a :class:`numpy.ndarray` (typically a
+                :class:`numpy.memmap`) or the path of a ``.npy`` file or
+                of a raw binary file containing the matrix in row-major
+                order.
+            shape: Shape of the matrix in a raw binary file. Ignored
+                unless `A` is the path of a raw file.
+            dtype: Dtype of the matrix in a raw binary file. Ignored
+                unless `A` is the path of a raw file.
+            offset: Offset in bytes of the matrix in a raw binary file.
+                Ignored unless `A` is the path of a raw file.
+            input_cols: If this parameter is set to the default of 0, the
+                operator takes a vector (one-dimensional array) input. If
+                the input is intended to be a matrix (two-dimensional
+                array), this parameter should specify number of columns
+                in the matrix.
+            block_rows: Number of rows of the matrix in each block. The
+                default is the number of rows that occupy approximately
+                64 MiB.
+        """
+        if isinstance(A, str):
+            if A.endswith(".npy"):
+                A = np.load(A, mmap_mode="r")
+            else:
+                if shape is None or dtype is None:
+                    raise ValueError("Parameters shape and dtype must be specified for a raw file.")
+                A = np.memmap(A, dtype=dtype, mode="r", offset=offset, shape=shape)
+        if not isinstance(A, np.ndarray):
+            raise TypeError(f"Expected np.ndarray or file path, got {type(A)}.")
+        if A.ndim != 2:
+            raise TypeError(f"Expected a two-dimensional array, got array of shape {A.shape}.")
+        self.A: np.ndarray = A  #: Host (typically memory-mapped) array implementing this matrix
+        # dtype of the operator input and output arrays, which differs
+        # from that of the matrix when it is a 64-bit type and JAX 64-bit
+        # mode is disabled
+        self._dtype = jax.dtypes.canonicalize_dtype(A.dtype)
+
+        if block_rows is None:
+            block_rows = max(1, (64 * 2**20) // (A.shape[1] * A.dtype.itemsize))
+        self.block_rows: int = min(block_rows, A.shape[0])
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        if input_cols == 0:
+            input_shape: Tuple[int, ...] = (A.shape[1],)
+            output_shape: Tuple[int, ...] = (A.shape[0],)
+        else:
+            input_shape = (A.shape[1], input_cols)
+            output_shape = (A.shape[0], input_cols)
+
+        def callback(func, shape):
+            return lambda x: pure_host_callback(func, jax.ShapeDtypeStruct(shape, self._dtype), x)
+
+        matvec = callback(self._matvec, output_shape)
+        rmatvec = callback(self._rmatvec, input_shape)
+        gram = callback(self._gram_host, input_shape)
+        eval_fn = jax.custom_vjp(matvec)
+        eval_fn.defvjp(lambda x: (matvec(x), None), lambda _, y: (rmatvec(y.conj()).conj(),))
+        adj_fn = jax.custom_vjp(rmatvec)
+        adj_fn.defvjp(lambda y: (rmatvec(y), None), lambda _, x: (matvec(x.conj()).conj(),))
+        # the Gram operator is self-adjoint
+        gram_fn = jax.custom_vjp(gram)
+        gram_fn.defvjp(lambda x: (gram(x), None), lambda _, z: (gram(z.conj()).conj(),))
+
+        super().__init__(
+            input_shape=input_shape,
+            output_shape=output_shape,
+            eval_fn=eval_fn,
+            adj_fn=adj_fn,
+            gram_fn=gram_fn,
+            input_dtype=self._dtype,
+            output_dtype=self._dtype,
+        )
+
+    def __del__(self):
+        if getattr(self, "_executor", None) is not None:
+            self._executor.shutdown(wait=False)
+
+    def _blocks(self) -> Iterator[Tuple[slice, np.ndarray]]:
+        """Iterate over row blocks of the matrix.
+
+        Each block is read into memory by a background thread while the
+        previous block is being processed.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        M, b = self.A.shape[0], self.block_rows
+        read = lambda start: np.array(self.A[start : start + b])
+        future = self._executor.submit(read, 0)
+        for start in range(0, M, b):
+            block = future.result()
+            if start + b < M:
+                future = self._executor.submit(read, start + b)
+            yield slice(start, start + block.shape[0]), block
+
+    def _matvec(self, x: np.ndarray) -> np.ndarray:
+        x = host_view(x, dtype=self.A.dtype)
+        y = np.empty(self.output_shape, dtype=self.A.dtype)
+        for rows, block in self._blocks():
+            y[rows] = block @ x
+        return y.astype(self._dtype, copy=False)
+
+    def _rmatvec(self, y: np.ndarray) -> np.ndarray:
+        y = host_view(y, dtype=self.A.dtype)
+        x = np.zeros(self.input_shape, dtype=self.A.dtype)
+        for rows, block in self._blocks():
+            x += block.conj().T @ y[rows]
+        return x.astype(self._dtype, copy=False)
+
+    def _gram_host(self, x: np.ndarray) -> np.ndarray:
+        x = host_view(x, dtype=self.A.dtype)
+        z = np.zeros(self.input_shape, dtype=self.A.dtype)
+        for _, block in self._blocks():
+            z += block.conj().T @ (block @ x)
+        return z.astype(self._dtype, copy=False)
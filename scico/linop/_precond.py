@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2022 by SCICO Developers
+# All rights reserved. BSD 3-clause License.
+# This file is part of the SCICO package. Details of the copyright and
+# user license can be found in the 'LICENSE' file distributed with the
+# package.
+
+"""Preconditioners for iterative linear system solvers."""
+
+# Needed to annotate a class method that returns the encapsulating class;
+# see https://www.python.org/dev/peps/pep-0563/
+from __future__ import annotations
+
+from typing import Optional, Tuple, Union
+
+import scico.numpy as snp
+import scico.random
+from scico.numpy import BlockArray
+from scico.numpy.util import is_nested, real_dtype
+from scico.typing import JaxArray, PRNGKey, Shape
+
+from ._circconv import CircularConvolve
+from ._diag import Diagonal
+from ._linop import LinearOperator
+
+
+def _probe_diagonal(
+    A: LinearOperator, num_probes: int, gram: bool, key: Optional[PRNGKey]
+) -> Tuple[Union[JaxArray, BlockArray], Union[JaxArray, BlockArray]]:
+    """Estimate a diagonal and the standard error of the estimate."""
+    op = A.gram if gram else A
+    if not gram and A.input_shape != A.output_shape:
+        raise ValueError(
+            f"Input shape {A.input_shape} and output shape {A.output_shape} of A must be "
+            "equal unless gram is True."
+        )
+    dtype = real_dtype(A.input_dtype)
+    s1 = 0.0
+    s2 = 0.0
+    for _ in range(num_probes):
+        z, key = scico.random.rademacher(A.input_shape, key=key, dtype=dtype)
+        v = z * op(z.astype(A.input_dtype))
+        s1 = s1 + v
+        s2 = s2 + snp.abs(v) ** 2
+    d = s1 / num_probes
+    se = snp.sqrt(snp.maximum(s2 / num_probes - snp.abs(d) ** 2, 0.0) / num_probes)
+    return d, se
+
+
+def estimate_diagonal(
+    A: LinearOperator,
+    num_probes: int = 32,
+    gram: bool = False,
+    key: Optional[PRNGKey] = None,
+) -> Union[JaxArray, BlockArray]:
+    r"""Estimate the diagonal of a :class:`.LinearOperator`.
+
+    Estimate the diagonal of a square :class:`.LinearOperator` :math:`A`
+    by stochastic probing :cite:`bekas-2007-estimator`. For Rademacher
+    random vectors :math:`\mb{z}_k`, the estimate is
+
+    .. math::
+       \mathrm{diag}(A) \approx \frac{1}{K} \sum_{k=1}^K \mb{z}_k
+       \odot A \mb{z}_k \;,
+
+    where :math:`\odot` denotes elementwise multiplication and
+    :math:`K` is the number of probe vectors. The estimate
+    is exact for a diagonal operator, and the error of each entry is
+    determined by the magnitudes of the off-diagonal entries in the
+    corresponding row, and decreases with the number of probe vectors.
+    Only applications of :math:`A` are required, so the estimate may be
+    computed for operators, such as tomographic projector Gram
+    operators, for which the matrix representation is not available.
+
+    Args:
+        A: :class:`.LinearOperator` for which the diagonal is to be
+            estimated. Must have the same input and output shapes
+            unless `gram` is ``True``.
+        num_probes: Number of probe vectors.
+        gram: If ``True``, estimate the diagonal of the Gram operator
+            :math:`A^H A` (see :meth:`.LinearOperator.gram`) instead of
+            that of :math:`A`.
+        key: Jax PRNG key. Defaults to ``None``, in which case a new key
+            is created.
+
+    Returns:
+        Estimate of the diagonal, with shape :code:`A.input_shape`.
+    """
+    return _probe_diagonal(A, num_probes, gram, key)[0]
+
+
+def _regularized_inverse(d: JaxArray, eps: float, floor: Union[JaxArray, float] = 0.0) -> JaxArray:
+    """Compute the inverse of a diagonal with a lower bound.
+
+    The lower bound is the larger of `floor` and `eps` times the
+    maximum magnitude of `d`.
+    """
+    d = snp.real(d)
+    return 1.0 / snp.maximum(d, snp.maximum(floor, eps * snp.max(snp.abs(d))))
+
+
+def jacobi_preconditioner(
+    A: LinearOperator,
+    num_probes: int = 32,
+    gram: bool = False,
+    eps: float = 1e-6,
+    key: Optional[PRNGKey] = None,
+) -> Diagonal:
+    r"""Construct a Jacobi preconditioner for a :class:`.LinearOperator`.
+
+    Construct a preconditioner :math:`M = \mathrm{diag}(A)^{-1}` for a
+    Hermitian positive definite :class:`.LinearOperator` :math:`A`, with
+    the diagonal estimated by :func:`estimate_diagonal`. Since the
+    estimates of small diagonal entries may be dominated by the error
+    of the estimate, and may even be negative, the estimate is bounded
+    below by twice its standard error, computed from the sample
+    variance over the probe vectors. The result is
+    suitable for use as the `M` parameter of :func:`scico.solver.cg`,
+    e.g. via :code:`LinearSubproblemSolver(cg_kwargs={"M": M})` in
+    :class:`.ADMM`, in which case :math:`A` should be the left hand
+    side operator of the ADMM :math:`\mb{x}`-update linear system (see
+    :class:`.LinearSubproblemSolver`).
+
+    Args:
+        A: Hermitian positive definite :class:`.LinearOperator` to be
+            preconditioned.
+        num_probes: Number of probe vectors used to estimate the
+            diagonal. Ignored if `A` is a :class:`.Diagonal`, in which
+            case the diagonal is used directly.
+        gram: If ``True``, precondition the Gram operator :math:`A^H A`
+            instead of :math:`A`.
+        eps: Lower bound, relative to the maximum magnitude of the
+            diagonal, applied to the diagonal before inversion.
+        key: Jax PRNG key. Defaults to ``None``, in which case a new key
+            is created.
+
+    Returns:
+        Preconditioner :class:`.Diagonal` operator.
+    """
+    if isinstance(A, Diagonal) and not is_nested(A.input_shape):
+        d = snp.broadcast_to(A.diagonal, A.input_shape)
+        d = snp.abs(d) ** 2 if gram else d
+        se = snp.zeros(d.shape, dtype=real_dtype(d.dtype))
+    else:
+        d, se = _probe_diagonal(A, num_probes, gram, key)
+    if isinstance(d, BlockArray):
+        dinv = snp.blockarray([_regularized_inverse(di, eps, 2 * sei) for di, sei in zip(d, se)])
+    else:
+        dinv = _regularized_inverse(d, eps, 2 * se)
+    return Diagonal(dinv, input_shape=A.input_shape, input_dtype=A.input_dtype)
+
+
+def block_jacobi_preconditioner(
+    A: LinearOperator,
+    axis: int = 0,
+    num_probes: int = 16,
+    gram: bool = False,
+    eps: float = 1e-6,
+    key: Optional[PRNGKey] = None,
+) -> LinearOperator:
+    r"""Construct a block Jacobi preconditioner for a :class:`.LinearOperator`.
+
+    For a Hermitian positive definite :class:`.LinearOperator`
+    :math:`A` with input array having a (typically small) axis `axis`,
+    e.g. a channel axis, of size :math:`c`, construct a preconditioner
+    consisting of the inverses of the :math:`c \times c` diagonal blocks
+    of :math:`A` coupling the entries along `axis` at each position in
+    the remaining axes. The blocks are estimated by stochastic probing,
+    as in :func:`estimate_diagonal`, with probe vectors that are
+    Rademacher random over the remaining axes and supported on a single
+    index along `axis`, requiring :math:`c` operator applications per
+    probe. The estimate is exact if :math:`A` does not couple different
+    positions in the remaining axes.
+
+    Args:
+        A: Hermitian positive definite :class:`.LinearOperator` to be
+            preconditioned. The input shape may not be a
+            :class:`.BlockArray` shape.
+        axis: Input array axis over which blocks are formed.
+        num_probes: Number of probe vectors.
+        gram: If ``True``, precondition the Gram operator :math:`A^H A`
+            instead of :math:`A`.
+        eps: Regularization parameter, relative to the mean diagonal
+            value of each block, added to the diagonal of the blocks
+            before inversion.
+        key: Jax PRNG key. Defaults to ``None``, in which case a new key
+            is created.
+
+    Returns:
+        Preconditioner :class:`.LinearOperator`.
+    """
+    if is_nested(A.input_shape):
+        raise ValueError("Parameter A may not have a BlockArray input shape.")
+    op = A.gram if gram else A
+    shape: Shape = A.input_shape  # type: ignore
+    axis = axis % len(shape)
+    c = shape[axis]
+    probe_shape = shape[:axis] + (1,) + shape[axis + 1 :]
+    index = snp.arange(c).reshape((c,) + (1,) * (len(shape) - axis - 1))
+
+    # B[..., i, j] is the (i, j) entry of the block at each position
+    B = snp.zeros(shape + (c,), dtype=A.input_dtype)
+    for _ in range(num_probes):
+        z, key = scico.random.rademacher(probe_shape, key=key, dtype=real_dtype(A.input_dtype))
+        for j in range(c):
+            Az = op(snp.where(index == j, z, 0).astype(A.input_dtype))
+            B = B.at[..., j].add(z * Az)
+    B = snp.moveaxis(B / num_probes, axis, -2)
+    B = (B + snp.conj(snp.swapaxes(B, -1, -2))) / 2
+    reg = eps * snp.real(snp.trace(B, axis1=-2, axis2=-1)) / c
+    Binv = snp.linalg.inv(B + reg[..., snp.newaxis, snp.newaxis] * snp.eye(c, dtype=B.dtype))
+
+    def apply(x: JaxArray) -> JaxArray:
+        y = snp.sum(Binv * snp.moveaxis(x, axis, -1)[..., snp.newaxis, :], axis=-1)
+        return snp.moveaxis(y, -1, axis)
+
+    return LinearOperator(
+        input_shape=shape,
+        output_shape=shape,
+        eval_fn=apply,
+        adj_fn=apply,
+        input_dtype=A.input_dtype,
+        output_dtype=A.input_dtype,
+    )
+
+
+def circulant_preconditioner(
+    A: LinearOperator,
+    ndims: Optional[int] = None,
+    center: Optional[Shape] = None,
+    gram: bool = False,
+    eps: float = 1e-6,
+) -> CircularConvolve:
+    r"""Construct a circulant preconditioner for a :class:`.LinearOperator`.
+
+    Construct a preconditioner for a Hermitian positive definite
+    :class:`.LinearOperator` :math:`A` that is approximately shift
+    invariant, e.g. the Gram operator of a tomographic projector
+    :cite:`clinthorne-1993-preconditioning`. A circulant approximation
+    of :math:`A` is obtained from its impulse response via
+    :meth:`.CircularConvolve.from_operator`, and the preconditioner is
+    the inverse of this approximation, computed in the DFT domain.
+
+    Args:
+        A: Hermitian positive definite :class:`.LinearOperator` to be
+            preconditioned.
+        ndims: Number of trailing dimensions over which :math:`A` is
+            approximately shift invariant. Defaults to all dimensions.
+        center: Location of the impulse used to compute the impulse
+            response (see :meth:`.CircularConvolve.from_operator`).
+        gram: If ``True``, precondition the Gram operator :math:`A^H A`
+            instead of :math:`A`.
+        eps: Lower bound, relative to the maximum magnitude of the
+            frequency response, applied to the real part of the
+            frequency response of the circulant approximation before
+            inversion.
+
+    Returns:
+        Preconditioner :class:`.CircularConvolve` operator.
+    """
+    op = A.gram_op if gram else A
+    C = CircularConvolve.from_operator(op, ndims=ndims, center=center)
+    return CircularConvolve(
+        _regularized_inverse(C.h_dft, eps),
+        A.input_shape,  # type: ignore
+        ndims=C.ndims,
+        input_dtype=A.input_dtype,
+        h_is_dft=True,
+    )
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2022 by SCICO Developers
+# All rights reserved. BSD 3-clause License.
+# This file is part of the SCICO package. Details of the copyright and
+# user license can be found in the 'LICENSE' file distributed with the
+# package.
+
+"""Algebraic simplification of linear operator expressions."""
+
+from functools import reduce
+from typing import Any, List, Tuple
+
+import numpy as np
+
+from jax.dtypes import result_type
+
+import scico.numpy as snp
+from scico.numpy.util import is_nested
+
+from ._circconv import CircularConvolve
+from ._diag import Diagonal, Identity
+from ._linop import (
+    ComposedLinearOperator,
+    LinearOperator,
+    ScaledLinearOperator,
+    SumLinearOperator,
+)
+
+# A term of a sum is represented as a scalar multiplier and a list of
+# factors, ordered from left to right, of a composition.
+_Term = Tuple[Any, List[LinearOperator]]
+
+
+def _is_one(scalar: Any) -> bool:
+    """Determine whether `scalar` is a concrete value equal to one."""
+    return np.isscalar(scalar) and scalar == 1
+
+
+def _preserves_dtype(scalar: Any, A: LinearOperator) -> bool:
+    """Determine whether multiplication by `scalar` preserves the dtype
+    of `A`."""
+    return result_type(A.input_dtype, scalar) == A.input_dtype
+
+
+def _is_simple(A: LinearOperator) -> bool:
+    """Determine whether `A` has equal, non-nested, input and output
+    shapes and dtypes."""
+    return (
+        not is_nested(A.input_shape)
+        and A.input_shape == A.output_shape
+        and A.input_dtype == A.output_dtype
+    )
+
+
+def _is_diagonal(A: LinearOperator) -> bool:
+    """Determine whether `A` is a :class:`.Diagonal` that can be merged
+    with other diagonal operators."""
+    return (
+        isinstance(A, Diagonal)
+        and _is_simple(A)
+        and A.diagonal.shape == A.input_shape
+        and A.diagonal.dtype == A.input_dtype
+    )
+
+
+def _is_circconv(A: LinearOperator) -> bool:
+    """Determine whether `A` is a :class:`.CircularConvolve` that can be
+    merged with other convolutions."""
+    return isinstance(A, CircularConvolve) and _is_simple(A) and A.h_dft.shape == A.input_shape
+
+
+def _mergeable(A: LinearOperator, B: LinearOperator) -> bool:
+    """Determine whether `A` and `B` can be merged into a single
+    operator of the same type when summed or composed."""
+    if A.shape != B.shape or A.input_dtype != B.input_dtype:
+        return False
+    if _is_diagonal(A) and _is_diagonal(B):
+        return True
+    return _is_circconv(A) and _is_circconv(B) and A.ndims == B.ndims
+
+
+def _merge_sum(terms: List[Tuple[Any, LinearOperator]]) -> LinearOperator:
+    """Construct a single operator from a weighted sum of mergeable
+    operators."""
+    A = terms[0][1]
+    if isinstance(A, Diagonal):
+        d = reduce(snp.add, [s * B.diagonal for s, B in terms])
+        return Diagonal(d.astype(A.input_dtype), input_shape=A.input_shape)
+    h = reduce(snp.add, [s * B.h_dft for s, B in terms])
+    return CircularConvolve(
+        h, A.input_shape, ndims=A.ndims, input_dtype=A.input_dtype, h_is_dft=True
+    )
+
+
+def _merge_product(A: LinearOperator, B: LinearOperator) -> LinearOperator:
+    """Construct a single operator from the composition of mergeable
+    operators."""
+    if isinstance(A, Diagonal):
+        return Diagonal(A.diagonal * B.diagonal, input_shape=B.input_shape)
+    return CircularConvolve(
+        A.h_dft * B.h_dft, B.input_shape, ndims=B.ndims, input_dtype=B.input_dtype, h_is_dft=True
+    )
+
+
+def _scale(scalar: Any, A: LinearOperator) -> LinearOperator:
+    """Multiply `A` by `scalar`, folding it into the operator when possible."""
+    if _is_one(scalar):
+        return A
+    if (_is_diagonal(A) or _is_circconv(A)) and _preserves_dtype(scalar, A):
+        return _merge_sum([(scalar, A)])
+    return ScaledLinearOperator(scalar, A)
+
+
+def _factorize(A: LinearOperator) -> _Term:
+    """Decompose `A` into a scalar and a list of composed factors."""
+    if isinstance(A, ScaledLinearOperator):
+        scalar, factors = _factorize(A.A)
+        return A.scalar * scalar, factors
+    if isinstance(A, ComposedLinearOperator):
+        scalar_a, factors_a = _factorize(A.A)
+        scalar_b, factors_b = _factorize(A.B)
+        return scalar_a * scalar_b, factors_a + factors_b
+    if isinstance(A, SumLinearOperator):
+        S = _simplify_sum(A)
+        if isinstance(S, (ScaledLinearOperator, ComposedLinearOperator)):
+            return _factorize(S)
+        return 1, [S]
+    return 1, [A]
+
+
+def _compose(factors: List[LinearOperator]) -> List[LinearOperator]:
+    """Simplify a list of composed factors.
+
+    Identity factors are removed, and adjacent diagonal or circular
+    convolution factors are merged.
+    """
+    reduced: List[LinearOperator] = []
+    for A in factors:
+        if isinstance(A, Identity) and len(factors) > 1:
+            continue
+        if reduced and _mergeable(reduced[-1], A):
+            reduced[-1] = _merge_product(reduced[-1], A)
+        else:
+            reduced.append(A)
+    return reduced if reduced else factors[:1]
+
+
+def _build(term: _Term) -> LinearOperator:
+    """Construct the operator represented by a term."""
+    scalar, factors = term
+    # fold the scalar into the first factor that can absorb it
+    for k, A in enumerate(factors):
+        if (_is_diagonal(A) or _is_circconv(A)) and _preserves_dtype(scalar, A):
+            factors = factors[:k] + [_scale(scalar, A)] + factors[k + 1 :]
+            scalar = 1
+            break
+    A = reduce(ComposedLinearOperator, factors)
+    return _scale(scalar, A)
+
+
+def _summands(A: LinearOperator, scalar: Any = 1) -> List[_Term]:
+    """Flatten a sum into a list of terms."""
+    if isinstance(A, SumLinearOperator):
+        return _summands(A.A, scalar) + _summands(A.B, scalar)
+    if isinstance(A, ScaledLinearOperator):
+        return _summands(A.A, scalar * A.scalar)
+    term_scalar, factors = _factorize(A)
+    return [(scalar * term_scalar, _compose(factors))]
+
+
+def _group(terms: List[_Term], side: int) -> List[_Term]:
+    """Factor out a common leftmost (`side` 0) or rightmost (`side` -1)
+    factor shared by multiple terms."""
+    grouped: List[_Term] = []
+    remaining = list(terms)
+    while remaining:
+        scalar, factors = remaining.pop(0)
+        R = factors[side]
+        shared = [(s, f) for s, f in remaining if f[side] is R]
+        if not shared or (len(factors) == 1 and all(len(f) == 1 for s, f in shared)):
+            grouped.append((scalar, factors))
+            continue
+        remaining = [(s, f) for s, f in remaining if f[side] is not R]
+        # the identity on the space adjacent to the shared factor
+        if side == 0:
+            I = Identity(R.input_shape, input_dtype=R.input_dtype)
+            rest = [(s, f[1:] if len(f) > 1 else [I]) for s, f in [(scalar, factors)] + shared]
+        else:
+            I = Identity(R.output_shape, input_dtype=R.output_dtype)
+            rest = [(s, f[:-1] if len(f) > 1 else [I]) for s, f in [(scalar, factors)] + shared]
+        S = _sum(rest)
+        factors = [R, S] if side == 0 else [S, R]
+        grouped.append((1, _compose(factors)))
+    return grouped
+
+
+def _sum(terms: List[_Term]) -> LinearOperator:
+    """Construct a simplified operator from a list of terms of a sum."""
+    terms = _group(_group(terms, -1), 0)
+    merged: List[_Term] = []
+    for scalar, factors in terms:
+        if len(factors) == 1:
+            A = factors[0]
+            for k, (s, f) in enumerate(merged):
+                if len(f) == 1 and (
+                    f[0] is A
+                    or _mergeable(f[0], A)
+                    and _preserves_dtype(s, A)
+                    and _preserves_dtype(scalar, A)
+                ):
+                    if f[0] is A:
+                        merged[k] = (s + scalar, f)
+                    else:
+                        merged[k] = (1, [_merge_sum([(s, f[0]), (scalar, A)])])
+                    break
+            else:
+                merged.append((scalar, factors))
+        else:
+            merged.append((scalar, factors))
+    return reduce(SumLinearOperator, [_build(term) for term in merged])
+
+
+def _simplify_sum(A: SumLinearOperator) -> LinearOperator:
+    """Simplify a sum of operators."""
+    return _sum(_summands(A))
+
+
+def simplify(A: LinearOperator) -> LinearOperator:
+    r"""Simplify a :class:`.LinearOperator` expression.
+
+    Sums, scalar multiples, and compositions of linear operators, e.g.
+    :code:`2.0 * A.H @ A + B`, are represented by
+    :class:`.SumLinearOperator`, :class:`.ScaledLinearOperator`, and
+    :class:`.ComposedLinearOperator` objects, which are evaluated by
+    recursively evaluating their operands. This function constructs an
+    equivalent operator in which the expression is canonicalized so that
+    it can be evaluated more efficiently, by
+
+    - folding scalar multiples into a single scalar, which is absorbed
+      into a :class:`.Diagonal` or :class:`.CircularConvolve` factor
+      when one is present,
+    - removing :class:`.Identity` factors of compositions,
+    - merging compositions and sums of :class:`.Diagonal` operators into
+      a single :class:`.Diagonal`,
+    - merging compositions and sums of :class:`.CircularConvolve`
+      operators into a single :class:`.CircularConvolve`, requiring a
+      single DFT domain multiplication,
+    - factoring out leftmost or rightmost factors that are shared by
+      terms of a sum, so that, e.g. for :code:`A + A.H @ A`, the shared
+      factor :code:`A` is only evaluated once.
+
+    Shared factors are identified as the same :class:`.LinearOperator`
+    object. Operators of other types are not modified. Since the
+    simplification is performed when the expression is constructed, it
+    may be applied within a jitted function, in which case the scalar
+    multipliers may be traced values, without adding any cost to the
+    compiled function.
+
+    Args:
+        A: Linear operator expression to be simplified.
+
+    Returns:
+        Simplified linear operator, with the same shape and dtypes as
+        `A`.
+    """
+    if isinstance(A, SumLinearOperator):
+        return _simplify_sum(A)
+    if isinstance(A, (ScaledLinearOperator, ComposedLinearOperator)):
+        scalar, factors = _factorize(A)
+        return _build((scalar, _compose(factors)))
+    return A
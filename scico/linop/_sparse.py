@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2022 by SCICO Developers
+# All rights reserved. BSD 3-clause License.
+# This file is part of the SCICO package. Details of the copyright and
+# user license can be found in the 'LICENSE' file distributed with the
+# package.
+
+"""Sparse matrix linear operator class."""
+
+# Needed to annotate a class method that returns the encapsulating class;
+# see https://www.python.org/dev/peps/pep-0563/
+from __future__ import annotations
+
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+import jax
+from jax.experimental import sparse
+
+import scico.numpy as snp
+from scico.numpy.util import is_complex_dtype
+from scico.typing import JaxArray, Shape
+from scico.util import npz_memmap
+
+from ._linop import LinearOperator
+
+SparseMatrix = Union[sparse.BCOO, sparse.CSR]
+
+
+@jax.jit
+def _matvec(A: sparse.JAXSparse, x: JaxArray) -> JaxArray:
+    # The matrix is an argument rather than a closure variable so that it
+    # is not embedded as a constant in the compiled function
+    return A @ x
+
+
+def _with_data(A: SparseMatrix, data: JaxArray) -> SparseMatrix:
+    """Construct a sparse matrix with the structure of `A` and entries `data`."""
+    if isinstance(A, sparse.BCOO):
+        return sparse.BCOO((data, A.indices), shape=A.shape)
+    return type(A)((data, A.indices, A.indptr), shape=A.shape)
+
+
+def _conj_transpose(A: SparseMatrix) -> Union[sparse.BCOO, sparse.CSC]:
+    """Compute the conjugate transpose of a sparse matrix.
+
+    The transpose of a CSR matrix is a CSC matrix sharing its arrays.
+    """
+    AT = A.T
+    if is_complex_dtype(A.dtype):
+        AT = _with_data(AT, AT.data.conj())
+    return AT
+
+
+def _row_col(A: SparseMatrix) -> Tuple[JaxArray, JaxArray]:
+    """Compute the row and column indices of the entries of a sparse matrix."""
+    if isinstance(A, sparse.BCOO):
+        return A.indices[:, 0], A.indices[:, 1]
+    rows = snp.repeat(
+        snp.arange(A.shape[0]), snp.diff(A.indptr), total_repeat_length=A.data.shape[0]
+    )
+    return rows, A.indices
+
+
+class SparseMatrixOperator(LinearOperator):
+    r"""Linear operator implementing sparse matrix multiplication.
+
+    Linear operator implementing multiplication by a sparse matrix
+    in the :class:`jax.experimental.sparse.BCOO` or
+    :class:`jax.experimental.sparse.CSR` format, so that the memory and
+    computational cost of applying the operator, its adjoint, and its
+    Gram operator are proportional to the number of non-zero entries of
+    the matrix. In particular, the Gram operator is applied as
+    :math:`A^H (A \mb{x})` without forming :math:`A^H A`, which is
+    typically much less sparse than :math:`A`. The input and output of
+    the operator may be multi-dimensional arrays, in which case the
+    matrix acts on their flattened (row-major) representations.
+    """
+
+    def __init__(
+        self,
+        A: Union[SparseMatrix, "scipy.sparse.spmatrix"],  # type: ignore
+        input_shape: Optional[Shape] = None,
+        output_shape: Optional[Shape] = None,
+    ):
+        """
+        Args:
+            A: Two-dimensional sparse matrix, either a
+                :class:`jax.experimental.sparse.BCOO` or
+                :class:`jax.experimental.sparse.CSR` array, or a
+                :mod:`scipy.sparse` matrix, which is converted to a
+                :class:`~jax.experimental.sparse.CSR` array if it is in
+                CSR format, and to a
+                :class:`~jax.experimental.sparse.BCOO` array otherwise.
+            input_shape: Shape of the input array. Defaults to
+                :code:`(A.shape[1],)`.
+            output_shape: Shape of the output array. Defaults to
+                :code:`(A.shape[0],)`.
+        """
+        if not isinstance(A, sparse.JAXSparse) and hasattr(A, "tocoo"):
+            if A.format == "csr":
+                A = sparse.CSR((A.data, A.indices, A.indptr), shape=A.shape)
+            else:
+                A = sparse.BCOO.from_scipy_sparse(A)
+        if not isinstance(A, (sparse.BCOO, sparse.CSR)):
+            raise TypeError(f"Expected a BCOO, CSR, or scipy.sparse matrix, got {type(A)}.")
+        if A.ndim != 2 or (isinstance(A, sparse.BCOO) and (A.n_batch != 0 or A.n_dense != 0)):
+            raise TypeError(f"Expected a two-dimensional sparse matrix, got shape {A.shape}.")
+        self.A: SparseMatrix = A  #: Sparse matrix implementing this operator
+        self._AH = _conj_transpose(A)
+
+        if input_shape is None:
+            input_shape = (A.shape[1],)
+        if output_shape is None:
+            output_shape = (A.shape[0],)
+        if int(np.prod(input_shape)) != A.shape[1] or int(np.prod(output_shape)) != A.shape[0]:
+            raise ValueError(
+                f"Input shape {input_shape} and output shape {output_shape} are not "
+                f"compatible with a matrix of shape {A.shape}."
+            )
+
+        super().__init__(
+            input_shape=input_shape,
+            output_shape=output_shape,
+            eval_fn=lambda x: _matvec(self.A, x.ravel()).reshape(self.output_shape),
+            adj_fn=lambda y: _matvec(self._AH, y.ravel()).reshape(self.input_shape),
+            input_dtype=A.dtype,
+            output_dtype=A.dtype,
+        )
+
+    @property
+    def nnz(self) -> int:
+        """Number of stored entries of the sparse matrix."""
+        return int(self.A.data.shape[0])
+
+    def to_array(self) -> np.ndarray:
+        """Return a dense :class:`numpy.ndarray` representation of `self.A`."""
+        return np.array(self.A.todense())
+
+    def __mul__(self, other):
+        if np.isscalar(other):
+            return self._from_data(other * self.A.data)
+        return super().__mul__(other)
+
+    def __rmul__(self, other):
+        if np.isscalar(other):
+            return self._from_data(other * self.A.data)
+        return super().__rmul__(other)
+
+    def __truediv__(self, other):
+        if np.isscalar(other):
+            return self._from_data(self.A.data / other)
+        return super().__truediv__(other)
+
+    def __neg__(self):
+        return self._from_data(-self.A.data)
+
+    def _from_data(self, data: JaxArray) -> SparseMatrixOperator:
+        """Construct an operator with the same structure and entries `data`."""
+        return SparseMatrixOperator(
+            _with_data(self.A, data), input_shape=self.input_shape, output_shape=self.output_shape
+        )
+
+    def scale_rows(self, d: JaxArray) -> SparseMatrixOperator:
+        r"""Scale the rows of the sparse matrix.
+
+        Args:
+            d: Array of scaling factors, with shape
+                :code:`self.output_shape` or :code:`(A.shape[0],)`.
+
+        Returns:
+            Sparse matrix operator :math:`D A`, where :math:`D` is the
+            diagonal matrix with diagonal `d`.
+        """
+        rows, _ = _row_col(self.A)
+        return self._from_data(self.A.data * snp.ravel(d)[rows])
+
+    def scale_columns(self, d: JaxArray) -> SparseMatrixOperator:
+        r"""Scale the columns of the sparse matrix.
+
+        Args:
+            d: Array of scaling factors, with shape
+                :code:`self.input_shape` or :code:`(A.shape[1],)`.
+
+        Returns:
+            Sparse matrix operator :math:`A D`, where :math:`D` is the
+            diagonal matrix with diagonal `d`.
+        """
+        _, cols = _row_col(self.A)
+        return self._from_data(self.A.data * snp.ravel(d)[cols])
+
+    @classmethod
+    def vstack(cls, ops: Sequence[SparseMatrixOperator]) -> SparseMatrixOperator:
+        """Vertically stack sparse matrix operators.
+
+        Construct a single sparse matrix operator from operators with
+        the same input shape, with output equal to the concatenation of
+        their flattened outputs. In contrast to a :class:`.VerticalStack`
+        of the operators, the stacked operator is applied by a single
+        sparse matrix multiplication.
+
+        Args:
+            ops: Sparse matrix operators to stack.
+
+        Returns:
+            Stacked sparse matrix operator in BCOO format.
+        """
+        if not all(op.input_shape == ops[0].input_shape for op in ops):
+            raise ValueError("All operators must have the same input shape.")
+        data, rows, cols = [], [], []
+        offset = 0
+        for op in ops:
+            row, col = _row_col(op.A)
+            data.append(op.A.data)
+            rows.append(row + offset)
+            cols.append(col)
+            offset += op.A.shape[0]
+        indices = snp.stack((snp.concatenate(rows), snp.concatenate(cols)), axis=1)
+        A = sparse.BCOO(
+            (snp.concatenate(data), indices.astype(np.int32)),
+            shape=(offset, ops[0].A.shape[1]),
+        )
+        return cls(A, input_shape=ops[0].input_shape)
+
+    def save(self, path: str):
+        """Save the sparse matrix to a file.
+
+        The matrix is saved to an uncompressed ``.npz`` file in the
+        format used by :func:`scipy.sparse.save_npz`, with additional
+        entries recording the input and output shapes of the operator.
+        The file can be memory-mapped when loaded by :meth:`load`, and
+        can also be loaded by :func:`scipy.sparse.load_npz`.
+
+        Args:
+            path: Path of ``.npz`` file.
+        """
+        arrays = {
+            "shape": np.array(self.A.shape),
+            "data": np.asarray(self.A.data),
+            "input_shape": np.array(self.input_shape),
+            "output_shape": np.array(self.output_shape),
+        }
+        if isinstance(self.A, sparse.BCOO):
+            arrays["format"] = np.array(b"coo")
+            arrays["row"] = np.asarray(self.A.indices[:, 0])
+            arrays["col"] = np.asarray(self.A.indices[:, 1])
+        else:
+            arrays["format"] = np.array(b"csr")
+            arrays["indices"] = np.asarray(self.A.indices)
+            arrays["indptr"] = np.asarray(self.A.indptr)
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = False) -> SparseMatrixOperator:
+        """Load a sparse matrix from a file.
+
+        Load a sparse matrix saved by :meth:`save` or by
+        :func:`scipy.sparse.save_npz` in COO or CSR format. Matrices in
+        CSR format are loaded as :class:`~jax.experimental.sparse.CSR`
+        arrays, and those in COO format as
+        :class:`~jax.experimental.sparse.BCOO` arrays.
+
+        Args:
+            path: Path of ``.npz`` file.
+            mmap: If ``True``, memory-map the arrays in the file rather
+                than reading them into host memory before transferring
+                them to the device. The file must be uncompressed.
+
+        Returns:
+            Sparse matrix operator. If the file does not record the
+            input and output shapes, they are one-dimensional.
+        """
+        arrays = npz_memmap(path) if mmap else np.load(path)
+        fmt = arrays["format"].item()
+        fmt = fmt.decode() if isinstance(fmt, bytes) else fmt
+        shape = tuple(int(n) for n in arrays["shape"])
+        data = jax.device_put(arrays["data"])
+        A: SparseMatrix
+        if fmt == "coo":
+            indices = np.stack((arrays["row"], arrays["col"]), axis=1).astype(np.int32)
+            A = sparse.BCOO((data, jax.device_put(indices)), shape=shape)
+        elif fmt == "csr":
+            A = sparse.CSR(
+                (data, jax.device_put(arrays["indices"]), jax.device_put(arrays["indptr"])),
+                shape=shape,
+            )
+        else:
+            raise ValueError(f"Unsupported sparse matrix format {fmt} in file {path}.")
+        kwargs = {}
+        for key in ("input_shape", "output_shape"):
+            if key in arrays:
+                kwargs[key] = tuple(int(n) for n in arrays[key])
+        return cls(A, **kwargs)
+
+    @classmethod
+    def from_operator(
+        cls, A: LinearOperator, batch_size: int = 64, tol: float = 0.0
+    ) -> SparseMatrixOperator:
+        r"""Construct the sparse matrix representation of an operator.
+
+        Construct the matrix representation of a :class:`.LinearOperator`
+        that has a sparse matrix representation, e.g. a tomographic
+        projector, by applying it to the standard basis vectors and
+        retaining the entries of the result with magnitude greater than
+        `tol`. The operator is applied to `batch_size` basis vectors at
+        a time via :func:`jax.vmap`, so that operators wrapping external
+        libraries process each batch in a single host callback. The
+        cost is that of :math:`N / \mathrm{batch\_size}` batched
+        operator applications for an operator with :math:`N` input
+        entries, so that this is intended for operators that are
+        applied many times, such as the forward operator of an
+        iterative reconstruction. The result may be saved for reuse via
+        :meth:`save`.
+
+        Args:
+            A: :class:`.LinearOperator` with a non-nested input shape.
+            batch_size: Number of basis vectors to which `A` is applied
+                in each batch.
+            tol: Entries with magnitude less than or equal to `tol` are
+                discarded.
+
+        Returns:
+            Sparse matrix operator.
+        """
+        N = int(np.prod(A.input_shape))
+        M = int(np.prod(A.output_shape))
+        eye = jax.jit(
+            lambda start: (start + jax.numpy.arange(batch_size))[:, np.newaxis]
+            == jax.numpy.arange(N)[np.newaxis, :]
+        )
+        apply = jax.vmap(lambda e: A(e.reshape(A.input_shape).astype(A.input_dtype)).ravel())
+        data, rows, cols = [], [], []
+        for start in range(0, N, batch_size):
+            E = eye(start)
+            if start + batch_size > N:
+                E = E[: N - start]
+            Y = np.asarray(apply(E))  # column start + k of the matrix is Y[k]
+            k, row = np.nonzero(np.abs(Y) > tol)
+            data.append(Y[k, row])
+            rows.append(row)
+            cols.append(start + k)
+        data_ = np.concatenate(data)
+        indices = np.stack((np.concatenate(rows), np.concatenate(cols)), axis=1).astype(np.int32)
+        order = np.lexsort((indices[:, 1], indices[:, 0]))
+        S = sparse.BCOO(
+            (jax.device_put(data_[order]), jax.device_put(indices[order])),
+            shape=(M, N),
+            indices_sorted=True,
+            unique_indices=True,
+        )
+        return cls(S, input_shape=A.input_shape, output_shape=A.output_shape)  # type: ignore
@@ -133,6 +133,9 @@ class VerticalStack(LinearOperator):
     def _adj(self, y: Union[JaxArray, BlockArray]) -> JaxArray:  # type: ignore
         return sum([op.adj(y_block) for y_block, op in zip(y, self.ops)])
 
+    def _gram(self, x: JaxArray) -> JaxArray:
+        return sum([op.gram(x) for op in self.ops])
+
     def scale_ops(self, scalars: JaxArray):
         """Scale component linear operators.
 
@@ -255,3 +258,9 @@ class DiagonalStack(LinearOperator):
         if self.collapse_input:
             return snp.stack(result)
         return snp.blockarray(result)
+
+    def _gram(self, x: Union[JaxArray, BlockArray]) -> Union[JaxArray, BlockArray]:
+        result = tuple(op.gram(x_n) for op, x_n in zip(self.ops, x))
+        if self.collapse_input:
+            return snp.stack(result)
+        return snp.blockarray(result)
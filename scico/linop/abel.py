@@ -41,6 +41,13 @@ class AbelProjector(LinearOperator):
             img_shape: Shape of the input image.
         """
         self.proj_mat_quad = _pyabel_daun_get_proj_matrix(img_shape)
+        # The Gram operator can be applied as a transform with matrix
+        # Q Q^T when the image quadrants do not overlap, i.e. when the
+        # number of columns is even.
+        if img_shape[1] % 2 == 0:
+            self.gram_mat_quad = self.proj_mat_quad @ self.proj_mat_quad.T
+        else:
+            self.gram_mat_quad = None
 
         super().__init__(
             input_shape=img_shape,
@@ -61,6 +68,13 @@ class AbelProjector(LinearOperator):
             self.input_dtype
         )
 
+    def _gram(self, x: JaxArray) -> JaxArray:
+        if self.gram_mat_quad is None:
+            return super()._gram(x)
+        return _pyabel_transform(x, direction="forward", proj_mat_quad=self.gram_mat_quad).astype(
+            self.input_dtype
+        )
+
     def inverse(self, y: JaxArray) -> JaxArray:
         """Perform inverse Abel transform.
 
@@ -18,12 +18,15 @@ not available.
 """
 
 
-from typing import List, Optional
+import os
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty, SimpleQueue
+from typing import Dict, List, Optional
 
 import numpy as np
 
 import jax
-import jax.experimental.host_callback as hcb
 
 try:
     import astra
@@ -36,9 +39,73 @@ except ModuleNotFoundError as e:
         raise e
 
 
+from scico._callback import host_view, pure_host_callback
 from scico.typing import JaxArray, Shape
 
 from ._linop import LinearOperator
+from ._sparse import SparseMatrixOperator
+
+
+class _AstraWorkspace:
+    """ASTRA projector, data objects, and algorithms for a single thread.
+
+    ASTRA data objects and algorithms may not be shared between
+    threads, so each thread processing slices uses its own workspace.
+    The objects are created once and reused across calls.
+    """
+
+    def __init__(self, proj_geom: dict, vol_geom: dict, gpu: bool):
+        self.proj_id = astra.create_projector("cuda" if gpu else "line", proj_geom, vol_geom)
+        self.sino_id = astra.data2d.create("-sino", proj_geom)
+        self.vol_id = astra.data2d.create("-vol", vol_geom)
+        suffix = "_CUDA" if gpu else ""
+        self.fp_id = self._algorithm("FP" + suffix, self.proj_id, "VolumeDataId")
+        self.bp_id = self._algorithm("BP" + suffix, self.proj_id, "ReconstructionDataId")
+        # FBP always uses the CPU implementation due to memory issues with the GPU one
+        self.fbp_proj_id = (
+            astra.create_projector("line", proj_geom, vol_geom) if gpu else self.proj_id
+        )
+        self.fbp_ids: Dict[str, int] = {}
+
+    def _algorithm(
+        self, name: str, proj_id: int, vol_key: str, option: Optional[dict] = None
+    ) -> int:
+        cfg = astra.astra_dict(name)
+        cfg["ProjectorId"] = proj_id
+        cfg["ProjectionDataId"] = self.sino_id
+        cfg[vol_key] = self.vol_id
+        if option is not None:
+            cfg["option"] = option
+        return astra.algorithm.create(cfg)
+
+    def _run(self, alg_id: int, src_id: int, src: np.ndarray, dst_id: int) -> np.ndarray:
+        astra.data2d.store(src_id, src)
+        astra.data2d.store(dst_id, 0.0)
+        astra.algorithm.run(alg_id)
+        return astra.data2d.get(dst_id)
+
+    def proj(self, x: np.ndarray) -> np.ndarray:
+        return self._run(self.fp_id, self.vol_id, x, self.sino_id)
+
+    def bproj(self, y: np.ndarray) -> np.ndarray:
+        return self._run(self.bp_id, self.sino_id, y, self.vol_id)
+
+    def fbp(self, y: np.ndarray, filter_type: str) -> np.ndarray:
+        if filter_type not in self.fbp_ids:
+            self.fbp_ids[filter_type] = self._algorithm(
+                "FBP",
+                self.fbp_proj_id,
+                "ReconstructionDataId",
+                option={"FilterType": filter_type},
+            )
+        return self._run(self.fbp_ids[filter_type], self.sino_id, y, self.vol_id)
+
+    def delete(self):
+        astra.algorithm.delete([self.fp_id, self.bp_id] + list(self.fbp_ids.values()))
+        astra.data2d.delete([self.sino_id, self.vol_id])
+        astra.projector.delete(self.proj_id)
+        if self.fbp_proj_id != self.proj_id:
+            astra.projector.delete(self.fbp_proj_id)
 
 
 class TomographicProjector(LinearOperator):
@@ -47,6 +114,11 @@ class TomographicProjector(LinearOperator):
     Perform tomographic projection of an image at specified angles,
     using the
     `ASTRA toolbox <https://github.com/astra-toolbox/astra-toolbox>`_.
+    The input may have a leading slice axis, in which case each slice is
+    projected independently, and the slices are distributed over a pool
+    of threads, each using its own ASTRA projector. The ASTRA projectors
+    and data objects are created when first used and reused in
+    subsequent calls.
     """
 
     def __init__(
@@ -57,10 +129,12 @@ class TomographicProjector(LinearOperator):
         angles: np.ndarray,
         volume_geometry: Optional[List[float]] = None,
         device: str = "auto",
+        num_threads: Optional[int] = None,
     ):
         """
         Args:
-            input_shape: Shape of the input array.
+            input_shape: Shape of the input array, either (rows, cols)
+                or (slices, rows, cols).
             volume_geometry: Defines the shape and size of the
                 discretized reconstruction volume. Must either ``None``,
                 or of the form (min_x, max_x, min_y, max_y). If ``None``,
@@ -81,6 +155,9 @@ class TomographicProjector(LinearOperator):
             device: Specifies device for projection operation.
                 One of ["auto", "gpu", "cpu"]. If "auto", a GPU is used
                 if available. Otherwise, the CPU is used.
+            num_threads: Number of threads over which the slices of a 3D
+                input are distributed. Defaults to the number of CPUs
+                for CPU projection, and to 1 for GPU projection.
         """
 
         # Set up all the ASTRA config
@@ -91,12 +168,15 @@ class TomographicProjector(LinearOperator):
         self.proj_geom: dict = astra.create_proj_geom(
             "parallel", detector_spacing, det_count, angles
         )
-        self.proj_id: int
         self.input_shape: tuple = input_shape
+        if len(input_shape) not in (2, 3):
+            raise ValueError(
+                f"Only 2D and 3D (slices, rows, cols) inputs are supported; got {input_shape}."
+            )
 
         if volume_geometry is not None:
             if len(volume_geometry) == 4:
-                self.vol_geom: dict = astra.create_vol_geom(*input_shape, *volume_geometry)
+                self.vol_geom: dict = astra.create_vol_geom(*input_shape[-2:], *volume_geometry)
             else:
                 raise AssertionError(
                     "Volume_geometry must be the shape of the volume as a tuple of len 4 "
@@ -104,16 +184,24 @@ class TomographicProjector(LinearOperator):
                     "for details."
                 )
         else:
-            self.vol_geom = astra.create_vol_geom(*input_shape)
+            self.vol_geom = astra.create_vol_geom(*input_shape[-2:])
 
         dev0 = jax.devices()[0]
         if dev0.platform == "cpu" or device == "cpu":
-            self.proj_id = astra.create_projector("line", self.proj_geom, self.vol_geom)
+            self._gpu = False
         elif dev0.platform == "gpu" and device in ["gpu", "auto"]:
-            self.proj_id = astra.create_projector("cuda", self.proj_geom, self.vol_geom)
+            self._gpu = True
         else:
             raise ValueError(f"Invalid device specified; got {device}.")
 
+        if num_threads is None:
+            num_threads = 1 if self._gpu else (os.cpu_count() or 1)
+        num_slices = input_shape[0] if len(input_shape) == 3 else 1
+        self.num_threads: int = max(1, min(num_threads, num_slices))
+        self._workspaces: SimpleQueue = SimpleQueue()
+        self._all_workspaces: List[_AstraWorkspace] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+
         # Wrap our non-jax function to indicate we will supply fwd/rev mode functions
         self._eval = jax.custom_vjp(self._proj)
         self._eval.defvjp(lambda x: (self._proj(x), None), lambda _, y: (self._bproj(y),))  # type: ignore
@@ -122,37 +210,59 @@ class TomographicProjector(LinearOperator):
 
         super().__init__(
             input_shape=self.input_shape,
-            output_shape=(len(angles), det_count),
+            output_shape=self.input_shape[:-2] + (len(angles), det_count),
             input_dtype=np.float32,
             output_dtype=np.float32,
             adj_fn=self._adj,
             jit=False,
         )
 
+    def __del__(self):
+        if getattr(self, "_executor", None) is not None:
+            self._executor.shutdown()
+        for ws in getattr(self, "_all_workspaces", []):
+            ws.delete()
+
+    def _with_workspace(self, method: str, x: np.ndarray, *args) -> np.ndarray:
+        # Apply a workspace method, using an idle workspace if available
+        try:
+            ws = self._workspaces.get_nowait()
+        except Empty:
+            ws = _AstraWorkspace(self.proj_geom, self.vol_geom, self._gpu)
+            self._all_workspaces.append(ws)
+        try:
+            return getattr(ws, method)(x, *args)
+        finally:
+            self._workspaces.put(ws)
+
+    def _apply(self, method: str, x: np.ndarray, *args) -> np.ndarray:
+        # Apply a workspace method to each slice of x
+        x = host_view(x, dtype=np.float32)
+        if x.ndim == 2:
+            return self._with_workspace(method, x, *args)
+        if self.num_threads == 1:
+            return np.stack([self._with_workspace(method, xs, *args) for xs in x])
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.num_threads)
+        return np.stack(
+            list(self._executor.map(lambda xs: self._with_workspace(method, xs, *args), x))
+        )
+
     def _proj(self, x: JaxArray) -> JaxArray:
         # Applies the forward projector and generates a sinogram
-
-        def f(x):
-            if x.flags.writeable == False:
-                x.flags.writeable = True
-            proj_id, result = astra.create_sino(x, self.proj_id)
-            astra.data2d.delete(proj_id)
-            return result
-
-        return hcb.call(
-            f, x, result_shape=jax.ShapeDtypeStruct(self.output_shape, self.output_dtype)
+        return pure_host_callback(
+            lambda x: self._apply("proj", x),
+            jax.ShapeDtypeStruct(self.output_shape, self.output_dtype),
+            x,
         )
 
     def _bproj(self, y: JaxArray) -> JaxArray:
         # applies backprojector
-        def f(y):
-            if y.flags.writeable == False:
-                y.flags.writeable = True
-            proj_id, result = astra.create_backprojection(y, self.proj_id)
-            astra.data2d.delete(proj_id)
-            return result
-
-        return hcb.call(f, y, result_shape=jax.ShapeDtypeStruct(self.input_shape, self.input_dtype))
+        return pure_host_callback(
+            lambda y: self._apply("bproj", y),
+            jax.ShapeDtypeStruct(self.input_shape, self.input_dtype),
+            y,
+        )
 
     def fbp(self, sino: JaxArray, filter_type: str = "Ram-Lak") -> JaxArray:
         """Perform tomographic reconstruction using the filtered back
@@ -163,36 +273,49 @@ class TomographicProjector(LinearOperator):
             filter_type: Which filter to use, see `cfg.FilterType` in
                `<https://www.astra-toolbox.com/docs/algs/FBP_CUDA.html>`_.
         """
+        return pure_host_callback(
+            lambda sino: self._apply("fbp", sino, filter_type),
+            jax.ShapeDtypeStruct(self.input_shape, self.input_dtype),
+            sino,
+        )
 
-        # Just use the CPU FBP alg for now; hitting memory issues with GPU one.
-        def f(sino):
-            if sino.flags.writeable == False:
-                sino.flags.writeable = True
-            proj_id = astra.create_projector("line", self.proj_geom, self.vol_geom)
-            sino_id = astra.data2d.create("-sino", self.proj_geom, sino)
-
-            # create memory for result
-            rec_id = astra.data2d.create("-vol", self.vol_geom)
-
-            # start to populate config
-            cfg = astra.astra_dict("FBP")
-            cfg["ReconstructionDataId"] = rec_id
-            cfg["ProjectorId"] = proj_id
-            cfg["ProjectionDataId"] = sino_id
-            cfg["option"] = {"FilterType": filter_type}
-
-            # initialize algorithm; run
-            alg_id = astra.algorithm.create(cfg)
-            astra.algorithm.run(alg_id)
-
-            # get the result
-            out = astra.data2d.get(rec_id)
-
-            # cleanup FBP-specific arra
-            astra.algorithm.delete(alg_id)
-            astra.data2d.delete(rec_id)
-            return out
-
-        return hcb.call(
-            f, sino, result_shape=jax.ShapeDtypeStruct(self.input_shape, self.input_dtype)
+    def system_matrix(self) -> SparseMatrixOperator:
+        """Construct the sparse system matrix of the projector.
+
+        Construct a :class:`.SparseMatrixOperator` representing this
+        projector, using the system matrix computed by ASTRA for its
+        CPU "line" projector. The result can be applied without host
+        callbacks, and is therefore compatible with all JAX
+        transformations. It may be saved for reuse via
+        :meth:`.SparseMatrixOperator.save`. Only supported for 2D
+        inputs.
+
+        When the projector is applied on a GPU, ASTRA uses its "cuda"
+        projector, which is a different discretization of the Radon
+        transform, so that the system matrix only approximates the
+        projector. A warning is issued in this case.
+
+        Returns:
+            Sparse matrix operator with the same input and output shapes
+            as this projector.
+        """
+        if len(self.input_shape) != 2:
+            raise ValueError(
+                f"System matrix is only supported for 2D inputs; got {self.input_shape}."
+            )
+        if self._gpu:
+            warnings.warn(
+                "The system matrix is computed for the ASTRA CPU projector, which differs "
+                "from the GPU projector used when applying this TomographicProjector.",
+                stacklevel=2,
+            )
+        proj_id = astra.create_projector("line", self.proj_geom, self.vol_geom)
+        matrix_id = astra.projector.matrix(proj_id)
+        try:
+            W = astra.matrix.get(matrix_id)
+        finally:
+            astra.matrix.delete(matrix_id)
+            astra.projector.delete(proj_id)
+        return SparseMatrixOperator(
+            W.astype(np.float32), input_shape=self.input_shape, output_shape=self.output_shape
         )
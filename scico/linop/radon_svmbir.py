@@ -18,9 +18,9 @@ from typing import Optional, Tuple, Union
 import numpy as np
 
 import jax
-import jax.experimental.host_callback
 
 import scico.numpy as snp
+from scico._callback import host_view, pure_host_callback
 from scico.loss import Loss, SquaredL2Loss
 from scico.typing import Array, JaxArray, Shape
 
@@ -45,6 +45,10 @@ class TomographicProjector(LinearOperator):
     is initialized with a :class:`TomographicProjector` with this option
     enabled.
 
+    The projector may be applied to a stack of inputs via
+    :func:`jax.vmap`, in which case the projections are computed in
+    parallel on the host.
+
     A brief description of the supported scanner geometries can be found
     in the `svmbir documentation <https://svmbir.readthedocs.io/en/latest/overview.html>`_.
     Parallel beam geometry and two different fan beam geometries are supported.
@@ -120,6 +124,8 @@ class TomographicProjector(LinearOperator):
                 Only used when geometry is "fan-flat" or "fan-curved".
         """
         self.angles = angles
+        # host copy of the angles, converted once for use in every projection
+        self._angles = host_view(angles)
         self.num_channels = num_channels
         self.center_offset = center_offset
 
@@ -194,30 +200,28 @@ class TomographicProjector(LinearOperator):
         magnification: Optional[float] = None,
         delta_channel: Optional[float] = None,
         delta_pixel: Optional[float] = None,
-    ) -> JaxArray:
-        return jax.device_put(
-            svmbir.project(
-                np.array(x),
-                np.array(angles),
-                num_channels,
-                verbose=0,
-                center_offset=center_offset,
-                roi_radius=roi_radius,
-                geometry=geometry,
-                dist_source_detector=dist_source_detector,
-                magnification=magnification,
-                delta_channel=delta_channel,
-                delta_pixel=delta_pixel,
-            )
+    ) -> np.ndarray:
+        return svmbir.project(
+            host_view(x),
+            host_view(angles),
+            num_channels,
+            verbose=0,
+            center_offset=center_offset,
+            roi_radius=roi_radius,
+            geometry=geometry,
+            dist_source_detector=dist_source_detector,
+            magnification=magnification,
+            delta_channel=delta_channel,
+            delta_pixel=delta_pixel,
         )
 
     def _proj_hcb(self, x):
         x = x.reshape(self.svmbir_input_shape)
         # host callback wrapper for _proj
-        y = jax.experimental.host_callback.call(
+        y = pure_host_callback(
             lambda x: self._proj(
                 x,
-                self.angles,
+                self._angles,
                 self.num_channels,
                 center_offset=self.center_offset,
                 roi_radius=self.roi_radius,
@@ -227,8 +231,8 @@ class TomographicProjector(LinearOperator):
                 delta_channel=self.delta_channel,
                 delta_pixel=self.delta_pixel,
             ),
+            jax.ShapeDtypeStruct(self.svmbir_output_shape, self.output_dtype),
             x,
-            result_shape=jax.ShapeDtypeStruct(self.svmbir_output_shape, self.output_dtype),
         )
         return y.reshape(self.output_shape)
 
@@ -245,31 +249,29 @@ class TomographicProjector(LinearOperator):
         magnification: Optional[float] = None,
         delta_channel: Optional[float] = None,
         delta_pixel: Optional[float] = None,
-    ):
-        return jax.device_put(
-            svmbir.backproject(
-                np.array(y),
-                np.array(angles),
-                num_rows=num_rows,
-                num_cols=num_cols,
-                verbose=0,
-                center_offset=center_offset,
-                roi_radius=roi_radius,
-                geometry=geometry,
-                dist_source_detector=dist_source_detector,
-                magnification=magnification,
-                delta_channel=delta_channel,
-                delta_pixel=delta_pixel,
-            )
+    ) -> np.ndarray:
+        return svmbir.backproject(
+            host_view(y),
+            host_view(angles),
+            num_rows=num_rows,
+            num_cols=num_cols,
+            verbose=0,
+            center_offset=center_offset,
+            roi_radius=roi_radius,
+            geometry=geometry,
+            dist_source_detector=dist_source_detector,
+            magnification=magnification,
+            delta_channel=delta_channel,
+            delta_pixel=delta_pixel,
         )
 
     def _bproj_hcb(self, y):
         y = y.reshape(self.svmbir_output_shape)
         # host callback wrapper for _bproj
-        x = jax.experimental.host_callback.call(
+        x = pure_host_callback(
             lambda y: self._bproj(
                 y,
-                self.angles,
+                self._angles,
                 self.svmbir_input_shape[1],
                 self.svmbir_input_shape[2],
                 center_offset=self.center_offset,
@@ -280,8 +282,8 @@ class TomographicProjector(LinearOperator):
                 delta_channel=self.delta_channel,
                 delta_pixel=self.delta_pixel,
             ),
+            jax.ShapeDtypeStruct(self.svmbir_input_shape, self.input_dtype),
             y,
-            result_shape=jax.ShapeDtypeStruct(self.svmbir_input_shape, self.input_dtype),
         )
         return x.reshape(self.input_shape)
 
@@ -382,16 +384,16 @@ class SVMBIRExtendedLoss(Loss):
         weights = self.W.diagonal.reshape(self.A.svmbir_output_shape)
         sigma_p = snp.sqrt(lam)
         if "v0" in kwargs and kwargs["v0"] is not None:
-            v0: Union[float, Array] = np.reshape(np.array(kwargs["v0"]), self.A.svmbir_input_shape)
+            v0: Union[float, Array] = host_view(kwargs["v0"]).reshape(self.A.svmbir_input_shape)
         else:
             v0 = 0.0
 
         # change: stop, mask-rad, init
         result = svmbir.recon(
-            np.array(y),
-            np.array(self.A.angles),
-            weights=np.array(weights),
-            prox_image=np.array(v),
+            host_view(y),
+            self.A._angles,
+            weights=host_view(weights),
+            prox_image=host_view(v),
             num_rows=self.A.svmbir_input_shape[1],
             num_cols=self.A.svmbir_input_shape[2],
             center_offset=self.A.center_offset,
@@ -11,7 +11,7 @@
 import warnings
 from copy import copy
 from functools import wraps
-from typing import Callable, Optional, Union
+from typing import Callable, Optional, Tuple, Union
 
 import jax
 
@@ -20,7 +20,7 @@ from scico import functional, linop, operator
 from scico.numpy import BlockArray
 from scico.numpy.util import ensure_on_device, no_nan_divide
 from scico.scipy.special import gammaln  # type: ignore
-from scico.solver import cg
+from scico.solver import ToleranceSchedule, cg
 from scico.typing import JaxArray
 
 
@@ -143,6 +143,42 @@ class Loss(functional.Functional):
         self.scale = new_scale
 
 
+def _prox_cg(
+    A: linop.LinearOperator,
+    W: linop.Diagonal,
+    M: Optional[Callable],
+    v: Union[JaxArray, BlockArray],
+    lam: float,
+    𝛼: float,
+    y: Union[JaxArray, BlockArray],
+    x0: Union[JaxArray, BlockArray],
+    cg_kwargs: dict,
+    jit: bool = True,
+) -> Tuple[Union[JaxArray, BlockArray], dict]:
+    r"""Compute the :class:`SquaredL2Loss` proximal operator via CG.
+
+    Solve :math:`(I + 2 \lambda \alpha A^H W A) \mb{x} = \mb{v} +
+    2 \lambda \alpha A^H W \mb{y}` using :func:`scico.solver.cg`.
+    """
+    # lhs = (I + λ 2𝛼 A^T W A)
+    lhs = linop.LinearOperator(
+        input_shape=A.input_shape,
+        output_shape=A.input_shape,
+        eval_fn=lambda x: x + 2 * lam * 𝛼 * A.adj(W(A(x))),  # type: ignore
+        adj_fn=lambda x: x + 2 * lam * 𝛼 * A.adj(W(A(x))),  # type: ignore
+        input_dtype=A.input_dtype,
+    )
+    rhs = v + 2 * lam * 𝛼 * A.adj(W(y))  # type: ignore
+    return cg(lhs, rhs, x0, M=M, jit=jit, **cg_kwargs)  # type: ignore
+
+
+# The operators A and W, and preconditioner M, are static arguments, so
+# that the solve is compiled once for each distinct set of these objects,
+# rather than once per call, as would be the case if the CG operator
+# constructed by _prox_cg were a static argument of scico.solver.cg.
+_prox_cg_jit = jax.jit(_prox_cg, static_argnums=(0, 1, 2))
+
+
 class SquaredL2Loss(Loss):
     r"""Weighted squared :math:`\ell_2` loss.
 
@@ -175,6 +211,19 @@ class SquaredL2Loss(Loss):
             scale: Scaling parameter.
             W: Weighting diagonal operator. Must be non-negative.
                 If ``None``, defaults to :class:`.Identity`.
+            prox_kwargs: Dictionary of arguments for the
+                :func:`scico.solver.cg` solver used to compute the
+                proximal operator when :math:`A` is not a
+                :class:`.Diagonal` operator. Default values are
+                `"maxiter": 100` and `"tol": 1e-5`. The `"tol"` entry
+                may be a :class:`scico.solver.ToleranceSchedule`, in
+                which case the tolerance is determined by the number of
+                preceding :meth:`prox` calls and, if required by the
+                schedule, by the relative change in the point at which
+                the proximal operator is evaluated. The number of CG
+                iterations, final relative residual, and tolerance of
+                the most recent solve are recorded in attribute
+                :code:`prox_info`.
         """
         y = ensure_on_device(y)
 
@@ -196,6 +245,10 @@ class SquaredL2Loss(Loss):
         if prox_kwargs:
             default_prox_kwargs.update(prox_kwargs)
         self.prox_kwargs = default_prox_kwargs
+        self.prox_info: Optional[dict] = None
+        self.prox_count = 0
+        self._prox_v: Optional[Union[JaxArray, BlockArray]] = None
+        self._prox_jit = True
 
         if isinstance(self.A, linop.LinearOperator):
             self.has_prox = True
@@ -226,20 +279,45 @@ class SquaredL2Loss(Loss):
         #
         #   (I + λ 2𝛼 A^T W A) x = v + λ 2𝛼 A^T W y
         #
-        W = self.W
-        A = self.A
-        𝛼 = self.scale
-        y = self.y
         if "x0" in kwargs and kwargs["x0"] is not None:
             x0 = kwargs["x0"]
         else:
             x0 = snp.zeros_like(v)
-        hessian = self.hessian  # = (2𝛼 A^T W A)
-        lhs = linop.Identity(v.shape) + lam * hessian
-        rhs = v + 2 * lam * 𝛼 * A.adj(W(y))
-        x, _ = cg(lhs, rhs, x0, **self.prox_kwargs)  # type: ignore
+        tol = self.prox_kwargs["tol"]
+        if isinstance(tol, ToleranceSchedule):
+            tol = self._prox_scheduled_tol(v, tol)
+        cg_kwargs = {**self.prox_kwargs, "tol": tol}
+        M = cg_kwargs.pop("M", None)
+        args = (v, lam, self.scale, self.y, x0, cg_kwargs)
+        x = None
+        if self._prox_jit:
+            try:
+                x, info = _prox_cg_jit(self.A, self.W, M, *args)
+            except (jax.errors.ConcretizationTypeError, jax.errors.TracerArrayConversionError):
+                # A or W cannot be traced; avoid further attempts
+                self._prox_jit = False
+        if x is None:
+            x, info = _prox_cg(self.A, self.W, M, *args, jit=False)
+        if jax.core.trace_state_clean():
+            self.prox_info = {**info, "tol": tol}
         return x
 
+    def _prox_scheduled_tol(
+        self, v: Union[JaxArray, BlockArray], schedule: ToleranceSchedule
+    ) -> float:
+        """Compute the CG tolerance for the proximal operator from a schedule."""
+        if not jax.core.trace_state_clean():
+            raise ValueError("Tolerance schedules are not supported when prox is traced.")
+        residual = None
+        if schedule.uses_residual:
+            if self._prox_v is not None:
+                vnorm = max(float(snp.linalg.norm(v)), snp.finfo(snp.float32).tiny)
+                residual = float(snp.linalg.norm(v - self._prox_v)) / vnorm
+            self._prox_v = v
+        tol = schedule(self.prox_count, residual)
+        self.prox_count += 1
+        return tol
+
     @property
     def hessian(self) -> linop.LinearOperator:
         r"""Compute the Hessian of linear operator `A`.
@@ -251,6 +329,8 @@ class SquaredL2Loss(Loss):
         A = self.A
         W = self.W
         if isinstance(A, linop.LinearOperator):
+            if isinstance(W, linop.Identity):
+                return linop.ScaledLinearOperator(2 * self.scale, A.gram_op)
             return linop.LinearOperator(
                 input_shape=A.input_shape,
                 output_shape=A.input_shape,
@@ -12,11 +12,21 @@ import sys
 # isort: off
 from .admm import ADMM
 from ._ladmm import LinearizedADMM
-from .pgm import PGM, AcceleratedPGM
+from .pgm import PGM, AcceleratedPGM, SubsetPGM, SVRG
 from ._primaldual import PDHG
+from ._anderson import AndersonAcceleration
 
 
-__all__ = ["ADMM", "LinearizedADMM", "PGM", "AcceleratedPGM", "PDHG"]
+__all__ = [
+    "ADMM",
+    "LinearizedADMM",
+    "PGM",
+    "AcceleratedPGM",
+    "SubsetPGM",
+    "SVRG",
+    "PDHG",
+    "AndersonAcceleration",
+]
 
 # Imported items in __all__ appear to originate in top-level linop module
 for name in __all__:
@@ -11,19 +11,38 @@
 # see https://www.python.org/dev/peps/pep-0563/
 from __future__ import annotations
 
+from functools import partial
 from typing import Callable, List, Optional, Tuple, Union
 
+import numpy as np
+
+import jax
+
 import scico.numpy as snp
+from scico.diagnostics import IterationStats
 from scico.functional import Functional
 from scico.linop import LinearOperator
+from scico.loss import Loss
 from scico.numpy import BlockArray
 from scico.numpy.linalg import norm
 from scico.numpy.util import ensure_on_device
 from scico.typing import JaxArray
 from scico.util import Timer
 
-from ._admmaux import GenericSubproblemSolver, LinearSubproblemSolver, SubproblemSolver
-from ._common import itstat_func_and_object
+from ._admmaux import (
+    GenericSubproblemSolver,
+    LinearSubproblemSolver,
+    PenaltyUpdate,
+    SubproblemSolver,
+)
+from ._common import (
+    ProfilePhase,
+    check_convergence,
+    itstat_func_and_object,
+    load_checkpoint,
+    save_checkpoint,
+    set_convergence_params,
+)
 
 
 class ADMM:
@@ -63,6 +82,16 @@ class ADMM:
        \mb{z}^{(k+1)}_i  \; .
        \end{aligned}
 
+    The phases of each iteration are annotated as JAX profiler named
+    scopes with labels "x_update", "prox_g0", "prox_g1", ...,
+    "dual_update", and "penalty_update", and the iteration statistics
+    and convergence test phases of :meth:`solve` with labels
+    "itstat_eval", "itstat_insert", and "convergence_test". If
+    profiling is enabled, the time spent in each phase is accumulated
+    in :attr:`timer` under the corresponding label, e.g.
+    :code:`timer.elapsed("x_update")`, and a summary table can be
+    obtained via :code:`print(timer)`.
+
 
     Attributes:
         f (:class:`.Functional`): Functional :math:`f` (usually a
@@ -73,7 +102,13 @@ class ADMM:
         C_list (list of :class:`.LinearOperator`): List of :math:`C_i`
             operators.
         itnum (int): Iteration counter.
-        maxiter (int): Number of ADMM outer-loop iterations.
+        maxiter (int): Maximum number of ADMM outer-loop iterations.
+        eps_abs (float): Absolute tolerance for convergence test.
+        eps_rel (float): Relative tolerance for convergence test.
+        check_period (int): Number of iterations between convergence
+            tests.
+        profile (bool): Flag indicating whether per-phase timings are
+            recorded.
         timer (:class:`.Timer`): Iteration timer.
         rho_list (list of scalars): List of :math:`\rho_i` penalty
             parameters. Must be same length as :code:`C_list` and
@@ -84,6 +119,8 @@ class ADMM:
         x (array-like): Solution.
         subproblem_solver (:class:`.SubproblemSolver`): Solver for
             :math:`\mb{x}`-update step.
+        rho_update (:class:`.PenaltyUpdate`): Penalty parameter update
+            policy, or ``None`` if the penalty parameters are fixed.
         z_list (list of array-like): List of auxiliary variables
             :math:`\mb{z}_i` at current iteration.
         z_list_old (list of array-like): List of auxiliary variables
@@ -101,6 +138,11 @@ class ADMM:
         maxiter: int = 100,
         subproblem_solver: Optional[SubproblemSolver] = None,
         itstat_options: Optional[dict] = None,
+        eps_abs: float = 0.0,
+        eps_rel: float = 0.0,
+        check_period: int = 1,
+        rho_update: Optional[PenaltyUpdate] = None,
+        profile: bool = False,
     ):
         r"""Initialize an :class:`ADMM` object.
 
@@ -114,7 +156,8 @@ class ADMM:
             alpha: Relaxation parameter. No relaxation for default 1.0.
             x0: Initial value for :math:`\mb{x}`. If ``None``, defaults
                 to an array of zeros.
-            maxiter: Number of ADMM outer-loop iterations. Default: 100.
+            maxiter: Maximum number of ADMM outer-loop iterations.
+                Default: 100.
             subproblem_solver: Solver for :math:`\mb{x}`-update step.
                 Defaults to ``None``, which implies use of an instance of
                 :class:`GenericSubproblemSolver`.
@@ -128,6 +171,22 @@ class ADMM:
                 ``None``, default values are used for the dict entries,
                 otherwise the default dict is updated with the dict
                 specified by this parameter.
+            eps_abs: Absolute tolerance for the convergence test (see
+                :meth:`converged`). The test is disabled if both
+                `eps_abs` and `eps_rel` are zero, in which case
+                `maxiter` iterations are always performed.
+            eps_rel: Relative tolerance for the convergence test (see
+                :meth:`converged`).
+            check_period: Number of iterations between convergence
+                tests. Since each test requires a device-to-host
+                transfer, a value greater than one reduces
+                synchronization overhead.
+            rho_update: Penalty parameter update policy (see
+                :class:`.PenaltyUpdate`). Defaults to ``None``, which
+                implies that the penalty parameters are held fixed.
+            profile: If ``True``, record the time spent in each phase of
+                the iterations performed by :meth:`solve` (see
+                :class:`ADMM`).
         """
         N = len(g_list)
         if len(C_list) != N:
@@ -138,10 +197,12 @@ class ADMM:
         self.f: Functional = f
         self.g_list: List[Functional] = g_list
         self.C_list: List[LinearOperator] = C_list
-        self.rho_list: List[float] = rho_list
+        self.rho_list: List[float] = list(rho_list)
         self.alpha: float = alpha
         self.itnum: int = 0
         self.maxiter: int = maxiter
+        set_convergence_params(self, eps_abs, eps_rel, check_period)
+        self.profile: bool = profile
         self.timer: Timer = Timer()
         if subproblem_solver is None:
             subproblem_solver = GenericSubproblemSolver()
@@ -156,6 +217,10 @@ class ADMM:
         self.z_list, self.z_list_old = self.z_init(self.x)
         self.u_list = self.u_init(self.x)
 
+        self.rho_update: Optional[PenaltyUpdate] = rho_update
+        if self.rho_update is not None:
+            self.rho_update.internal_init(self)
+
         self._itstat_init(itstat_options)
 
     def _itstat_init(self, itstat_options: Optional[dict] = None):
@@ -201,6 +266,16 @@ class ADMM:
             itstat_attrib.extend(
                 ["subproblem_solver.info['num_iter']", "subproblem_solver.info['rel_res']"]
             )
+            if self.subproblem_solver.tol_schedule is not None:
+                itstat_fields.update({"CG Tol": "%9.3e"})
+                itstat_attrib.append("subproblem_solver.tol")
+
+        # attributes that can be evaluated on device within solve_compiled; this
+        # is only possible when the default itstat fields are in use
+        if itstat_options and ("fields" in itstat_options or "itstat_func" in itstat_options):
+            self._itstat_device_attrib: Optional[List[str]] = None
+        else:
+            self._itstat_device_attrib = itstat_attrib[2:]
 
         self.itstat_insert_func, self.itstat_object = itstat_func_and_object(
             itstat_fields, itstat_attrib, itstat_options
@@ -285,6 +360,79 @@ class ADMM:
             out += norm(Ci.adj(zi - ziold)) ** 2
         return snp.sqrt(out)
 
+    def converged(self) -> bool:
+        r"""Test for convergence based on the primal and dual residuals.
+
+        Test for convergence using the criteria in Sec. 3.3.1 of
+        :cite:`boyd-2010-distributed`, i.e. the primal residual
+        :math:`\mb{r}` and dual residual :math:`\mb{s}`,
+
+        .. math::
+            \mb{r} = \left( \begin{array}{c} C_1 \mb{x} - \mb{z}_1 \\
+            C_2 \mb{x} - \mb{z}_2 \\ \vdots \end{array} \right)
+            \qquad \mb{s} = \sum_{i=1}^N \rho_i C_i^H (\mb{z}^{(k)}_i
+            - \mb{z}^{(k-1)}_i) \;,
+
+        must satisfy
+
+        .. math::
+            \begin{aligned}
+            \norm{\mb{r}}_2 &\leq \sqrt{p} \, \epsilon_{\text{abs}} +
+            \epsilon_{\text{rel}} \max \left\{ \norm{(C_1 \mb{x}, C_2
+            \mb{x}, \ldots)}_2, \norm{(\mb{z}_1, \mb{z}_2, \ldots)}_2
+            \right\} \\
+            \norm{\mb{s}}_2 &\leq \sqrt{n} \, \epsilon_{\text{abs}} +
+            \epsilon_{\text{rel}} \norm{\sum_{i=1}^N \rho_i C_i^H
+            \mb{u}_i}_2 \;,
+            \end{aligned}
+
+        where :math:`p` is the total size of the :math:`\mb{z}_i` and
+        :math:`n` is the size of :math:`\mb{x}`.
+
+        Returns:
+            ``True`` if the convergence criteria are satisfied,
+            ``False`` otherwise.
+        """
+        r2 = Cx2 = z2 = 0.0
+        s = Cu = 0.0
+        p = 0
+        for rhoi, Ci, zi, ziold, ui in zip(
+            self.rho_list, self.C_list, self.z_list, self.z_list_old, self.u_list
+        ):
+            Cix = Ci(self.x)
+            r2 += norm(Cix - zi) ** 2
+            Cx2 += norm(Cix) ** 2
+            z2 += norm(zi) ** 2
+            s = s + rhoi * Ci.adj(zi - ziold)
+            Cu = Cu + rhoi * Ci.adj(ui)
+            p += Ci.output_size
+        n = self.C_list[0].input_size
+        eps_pri = snp.sqrt(p) * self.eps_abs + self.eps_rel * snp.sqrt(snp.maximum(Cx2, z2))
+        eps_dual = snp.sqrt(n) * self.eps_abs + self.eps_rel * norm(Cu)
+        return snp.logical_and(snp.sqrt(r2) <= eps_pri, norm(s) <= eps_dual)
+
+    def set_rho(self, rho_list: List[float]):
+        r"""Set the penalty parameters.
+
+        Set the penalty parameters :math:`\rho_i`, rescaling the scaled
+        Lagrange multipliers :math:`\mb{u}_i` so that the corresponding
+        unscaled multipliers :math:`\rho_i \mb{u}_i` are unchanged, and
+        update the subproblem solver for the new parameters.
+
+        Args:
+            rho_list: List of :math:`\rho_i` penalty parameters. Must be
+                same length as :code:`C_list`.
+        """
+        if len(rho_list) != len(self.rho_list):
+            raise ValueError(
+                f"len(rho_list)={len(rho_list)} not equal to len(C_list)={len(self.C_list)}."
+            )
+        self.u_list = [
+            (rho_old / rho) * ui for rho_old, rho, ui in zip(self.rho_list, rho_list, self.u_list)
+        ]
+        self.rho_list = list(rho_list)
+        self.subproblem_solver.update_rho()
+
     def z_init(
         self, x0: Union[JaxArray, BlockArray]
     ) -> Tuple[List[Union[JaxArray, BlockArray]], List[Union[JaxArray, BlockArray]]]:
@@ -350,49 +498,405 @@ class ADMM:
         .. math::
             \mb{u}_i^{(k+1)} =  \mb{u}_i^{(k)} + C_i \mb{x}^{(k+1)} -
             \mb{z}^{(k+1)}_i \;.
+
+        If a penalty parameter update policy has been specified, the
+        penalty parameters are then updated.
         """
 
-        self.x = self.subproblem_solver.solve(self.x)
+        with ProfilePhase(self, "x_update") as phase:
+            self.x = phase.sync(self.subproblem_solver.solve(self.x))
 
         self.z_list_old = self.z_list.copy()
 
         for i, (rhoi, gi, Ci, zi, ui) in enumerate(
             zip(self.rho_list, self.g_list, self.C_list, self.z_list, self.u_list)
         ):
-            if self.alpha == 1.0:
-                Cix = Ci(self.x)
-            else:
-                Cix = self.alpha * Ci(self.x) + (1.0 - self.alpha) * zi
-            zi = gi.prox(Cix + ui, 1 / rhoi, v0=zi)
-            ui = ui + Cix - zi
+            with ProfilePhase(self, f"prox_g{i}") as phase:
+                if self.alpha == 1.0:
+                    Cix = Ci(self.x)
+                else:
+                    Cix = self.alpha * Ci(self.x) + (1.0 - self.alpha) * zi
+                zi = phase.sync(gi.prox(Cix + ui, 1 / rhoi, v0=zi))
+            with ProfilePhase(self, "dual_update") as phase:
+                ui = phase.sync(ui + Cix - zi)
             self.z_list[i] = zi
             self.u_list[i] = ui
 
+        if self.rho_update is not None:
+            with ProfilePhase(self, "penalty_update") as phase:
+                self.rho_update.update()
+                phase.sync(self.u_list)
+
+    def _checkpoint_state(self, itnum: Optional[int] = None) -> dict:
+        """Construct a dict of the solver state for checkpointing.
+
+        Args:
+            itnum: Iteration number to record. If ``None``, use
+                :code:`self.itnum`.
+
+        Returns:
+            Dict of solver state components.
+        """
+        return {
+            "itnum": self.itnum if itnum is None else itnum,
+            "x": self.x,
+            "z_list": self.z_list,
+            "z_list_old": self.z_list_old,
+            "u_list": self.u_list,
+            "rho_list": self.rho_list,
+        }
+
+    def _set_checkpoint_state(self, state: dict):
+        """Set the solver state from a dict restored from a checkpoint.
+
+        Args:
+            state: Dict of solver state components.
+        """
+        self.itnum = state["itnum"]
+        self.x = state["x"]
+        self.z_list = state["z_list"]
+        self.z_list_old = state["z_list_old"]
+        self.u_list = state["u_list"]
+        self.rho_list = state["rho_list"]
+        self.subproblem_solver.update_rho()
+        if self.rho_update is not None:
+            self.rho_update.internal_init(self)
+
+    def save_state(self, path: str):
+        """Save the solver state to a checkpoint file.
+
+        Save the current solver state, iteration statistics history,
+        and timer totals to an uncompressed ``.npz`` file from which
+        they can be restored by :meth:`load_state`.
+
+        Args:
+            path: Path of checkpoint file.
+        """
+        save_checkpoint(path, self, self._checkpoint_state())
+
+    def load_state(self, path: str):
+        """Restore the solver state from a checkpoint file.
+
+        Restore the solver state, iteration statistics history, and
+        timer totals saved by :meth:`save_state`. The solver is
+        required to have been initialized with the same functionals and
+        operators as the solver from which the state was saved. State
+        arrays are memory-mapped from the file rather than being read
+        into memory before transfer to the device. A subsequent call to
+        :meth:`solve` continues from the restored iteration number.
+
+        Args:
+            path: Path of checkpoint file.
+        """
+        self._set_checkpoint_state(load_checkpoint(path, self))
+
     def solve(
         self,
         callback: Optional[Callable[[ADMM], None]] = None,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_period: Optional[int] = None,
     ) -> Union[JaxArray, BlockArray]:
         """Run the ADMM algorithm.
 
-        Run the ADMM algorithm for a total of `self.maxiter` iterations.
+        Run the ADMM algorithm for a total of `self.maxiter` iterations,
+        or until the convergence test (see :meth:`converged`), if
+        enabled, is satisfied.
 
         Args:
             callback: An optional callback function, taking an a single
                argument of type :class:`ADMM`, that is called at the end
                of every iteration.
+            checkpoint_path: Path of checkpoint file (see
+               :meth:`save_state`) to which the solver state is saved at
+               the end of the solve and, if `checkpoint_period` is not
+               ``None``, every `checkpoint_period` iterations.
+            checkpoint_period: Number of iterations between checkpoints.
+               If ``None``, a checkpoint is only saved at the end of the
+               solve.
 
         Returns:
             Computed solution.
         """
+        if checkpoint_period and checkpoint_path is None:
+            raise ValueError("Parameter checkpoint_path must be specified with checkpoint_period.")
         self.timer.start()
         for self.itnum in range(self.itnum, self.itnum + self.maxiter):
             self.step()
-            self.itstat_object.insert(self.itstat_insert_func(self))
+            with ProfilePhase(self, "itstat_eval") as phase:
+                itstat = phase.sync(self.itstat_insert_func(self))
+            with ProfilePhase(self, "itstat_insert"):
+                self.itstat_object.insert(itstat)
             if callback:
                 self.timer.stop()
                 callback(self)
                 self.timer.start()
+            if checkpoint_period and (self.itnum + 1) % checkpoint_period == 0:
+                self.timer.stop()
+                save_checkpoint(checkpoint_path, self, self._checkpoint_state(self.itnum + 1))
+                self.timer.start()
+            with ProfilePhase(self, "convergence_test"):
+                converged = check_convergence(self)
+            if converged:
+                break
         self.timer.stop()
         self.itnum += 1
         self.itstat_object.end()
+        if checkpoint_path is not None:
+            self.save_state(checkpoint_path)
+        return self.x
+
+    def _get_state(self) -> Tuple:
+        """Get the ADMM iteration state as a pytree.
+
+        Returns:
+            Tuple :code:`(x, z_list, z_list_old, u_list)`.
+        """
+        return (self.x, list(self.z_list), list(self.z_list_old), list(self.u_list))
+
+    def _set_state(self, state: Tuple):
+        """Set the ADMM iteration state from a pytree.
+
+        Args:
+            state: Tuple :code:`(x, z_list, z_list_old, u_list)`, as
+               returned by :meth:`_get_state`.
+        """
+        x, z_list, z_list_old, u_list = state
+        self.x = x
+        self.z_list = list(z_list)
+        self.z_list_old = list(z_list_old)
+        self.u_list = list(u_list)
+
+    def _compiled_itstat_func(self, method: str) -> Callable:
+        """Check support for compiled iterations and construct stats function.
+
+        Check that the solver configuration allows the ADMM iterations
+        to be traced by :func:`jax.jit`, and construct a function
+        returning an array of the default iteration statistics that
+        can be evaluated on device.
+
+        Args:
+            method: Name of calling method, for use in error messages.
+
+        Returns:
+            Iteration statistics function.
+
+        Raises:
+            ValueError: If the solver configuration does not support
+               compiled iterations.
+        """
+        if isinstance(self.subproblem_solver, GenericSubproblemSolver):
+            raise ValueError(
+                f"Method {method} requires a subproblem solver that supports jit; "
+                f"got {type(self.subproblem_solver)}."
+            )
+        if getattr(self.subproblem_solver, "recycle", 0):
+            raise ValueError(f"Method {method} does not support Krylov subspace recycling.")
+        if getattr(self.subproblem_solver, "tol_schedule", None) is not None:
+            raise ValueError(f"Method {method} does not support CG tolerance schedules.")
+        if self._itstat_device_attrib is None:
+            raise ValueError(f"Method {method} does not support custom itstat_options.")
+        if self.rho_update is not None:
+            raise ValueError(f"Method {method} does not support penalty parameter updates.")
+
+        # dynamically create device itstat function; see itstat_func_and_object
+        scope: dict = {"snp": snp}
+        exec(
+            "def itstat_device_func(obj): return snp.array(["
+            + ", ".join(["obj." + attr for attr in self._itstat_device_attrib])
+            + "])",
+            scope,
+        )
+        return scope["itstat_device_func"]
+
+    def solve_compiled(self) -> Union[JaxArray, BlockArray]:
+        r"""Run the ADMM algorithm within a single compiled loop.
+
+        Run the ADMM algorithm for a total of `self.maxiter` iterations
+        (or until the convergence test is satisfied), as for
+        :meth:`solve`, but with the full iteration state
+        (:code:`x`, :code:`z_list`, :code:`z_list_old`, :code:`u_list`,
+        and the iteration number) carried through a single
+        :func:`jax.lax.while_loop`, avoiding Python dispatch overhead
+        and host synchronization at each iteration. This requires that
+        the :math:`\mb{x}`-update and all of the :math:`g_i` proximal
+        operators can be traced by :func:`jax.jit`.
+
+        Iteration statistics are accumulated in a preallocated device
+        array that is transferred to the host, and inserted into
+        :code:`self.itstat_object`, once the loop has completed. Since
+        per-iteration timing is not available within a compiled loop,
+        the "Time" field is linearly interpolated over the total run
+        time. Custom iteration statistics (specified via the
+        `itstat_options` parameter of :meth:`__init__`) and penalty
+        parameter update policies are not supported.
+
+        Returns:
+            Computed solution.
+        """
+        itstat_device_func = self._compiled_itstat_func("solve_compiled")
+        has_info = hasattr(self.subproblem_solver, "info")
+        solver_info = getattr(self.subproblem_solver, "info", None)
+
+        def body(carry):
+            k, state, stats = carry
+            self._set_state(state)
+            self.step()
+            stats = stats.at[k].set(itstat_device_func(self).astype(stats.dtype))
+            return k + 1, self._get_state(), stats
+
+        def cond(carry):
+            k, state, _ = carry
+            if self.eps_abs > 0.0 or self.eps_rel > 0.0:
+                self._set_state(state)
+                test = (k == 0) | ((itnum0 + k) % self.check_period != 0)
+                return (k < self.maxiter) & (test | ~self.converged())
+            return k < self.maxiter
+
+        stats = snp.zeros((self.maxiter, len(self._itstat_device_attrib)))
+        state = self._get_state()
+        itnum0 = self.itnum
+        t0 = self.timer.elapsed()
+        self.timer.start()
+        try:
+            numiter, state, stats = jax.lax.while_loop(cond, body, (0, state, stats))
+        finally:
+            # remove tracers left in object attributes by the traced loop body
+            self._set_state(state)
+            if has_info:
+                self.subproblem_solver.info = solver_info  # type: ignore
+        numiter = int(numiter)  # blocks until the loop has completed
+        self.timer.stop()
+        tn = self.timer.elapsed()
+
+        stats = np.array(stats)
+        for k in range(numiter):
+            self.itstat_object.insert(
+                (itnum0 + k, t0 + (tn - t0) * (k + 1) / numiter) + tuple(stats[k])
+            )
+        self.itnum = itnum0 + numiter
+        self.itstat_object.end()
         return self.x
+
+    def solve_batch(
+        self, y: JaxArray, x0: Optional[Union[JaxArray, BlockArray]] = None
+    ) -> Union[JaxArray, BlockArray]:
+        r"""Solve a batch of problems differing only in the loss data.
+
+        Solve a batch of independent problems, all sharing the same
+        :math:`f`, :math:`g_i`, :math:`C_i`, and :math:`\rho_i`, except
+        for the data :code:`f.y`, which is replaced by successive
+        slices along the leading axis of `y`. A single ADMM iteration is
+        vectorized over all problems via :func:`jax.vmap` and the
+        iterations are run within a single :func:`jax.lax.while_loop`,
+        so that the same restrictions as for :meth:`solve_compiled`
+        apply.
+
+        If the convergence test (see :meth:`converged`) is enabled, it
+        is applied to each problem independently. Problems that have
+        converged are frozen at their final iterate, and the loop
+        terminates when all problems have converged or `self.maxiter`
+        iterations have been performed. Iteration statistics for each
+        problem are recorded in a separate
+        :class:`.diagnostics.IterationStats` object in the list
+        :code:`self.itstat_batch`. The state of this object, including
+        :code:`self.x` and :code:`self.itnum`, is not modified.
+
+        Args:
+            y: Batch of data arrays, with the leading axis indexing the
+                batch and the remaining axes having the same shape as
+                :code:`f.y`.
+            x0: Batch of initial values for :math:`\mb{x}`, with the
+                leading axis (or the leading axis of each block)
+                indexing the batch. If ``None``, the current value of
+                :code:`self.x` is used as the initial value for all
+                problems.
+
+        Returns:
+            Batch of computed solutions.
+        """
+        itstat_device_func = self._compiled_itstat_func("solve_batch")
+        if not isinstance(self.f, Loss):
+            raise ValueError(f"Method solve_batch requires f to be a Loss; got {type(self.f)}.")
+        y = ensure_on_device(y)
+        if y.shape[1:] != self.f.y.shape:
+            raise ValueError(
+                f"Shape of y ({y.shape}) must be a batch of arrays with shape {self.f.y.shape}."
+            )
+        nbatch = y.shape[0]
+        if x0 is None:
+            x0 = jax.tree_util.tree_map(
+                lambda leaf: snp.broadcast_to(leaf, (nbatch,) + leaf.shape), self.x
+            )
+        x0 = ensure_on_device(x0)
+        if any(leaf.shape[0] != nbatch for leaf in jax.tree_util.tree_leaves(x0)):
+            raise ValueError(f"Leading axis of x0 must have size {nbatch}.")
+
+        convergence_test = self.eps_abs > 0.0 or self.eps_rel > 0.0
+        f_y = self.f.y
+        state0 = self._get_state()
+        itnum0 = self.itnum
+        has_info = hasattr(self.subproblem_solver, "info")
+        solver_info = getattr(self.subproblem_solver, "info", None)
+
+        def step(state, yi):
+            self.f.y = yi
+            self._set_state(state)
+            self.step()
+            stat = itstat_device_func(self)
+            conv = self.converged() if convergence_test else snp.array(False)
+            return self._get_state(), stat, conv
+
+        def freeze(active, new, old):
+            active = active.reshape(active.shape + (1,) * (new.ndim - 1))
+            return snp.where(active, new, old)
+
+        def body(carry):
+            k, state, stats, count, active = carry
+            new_state, stat, conv = jax.vmap(step)(state, y)
+            state = jax.tree_util.tree_map(partial(freeze, active), new_state, state)
+            stats = stats.at[k].set(snp.where(active[:, None], stat.astype(stats.dtype), snp.nan))
+            count = count + active
+            if convergence_test:
+                due = (itnum0 + k + 1) % self.check_period == 0
+                active = active & ~(conv & due)
+            return k + 1, state, stats, count, active
+
+        def cond(carry):
+            k, _, _, _, active = carry
+            return (k < self.maxiter) & snp.any(active)
+
+        def init(x):
+            z_list, z_list_old = self.z_init(x)
+            return x, z_list, z_list_old, self.u_init(x)
+
+        timer = Timer()
+        timer.start()
+        try:
+            state = jax.vmap(init)(x0)
+            stats = snp.zeros((self.maxiter, nbatch, len(self._itstat_device_attrib)))
+            count = snp.zeros((nbatch,), dtype=snp.int32)
+            active = snp.ones((nbatch,), dtype=bool)
+            numiter, state, stats, count, _ = jax.lax.while_loop(
+                cond, body, (0, state, stats, count, active)
+            )
+        finally:
+            # remove tracers left in object attributes by the traced loop body
+            self.f.y = f_y
+            self._set_state(state0)
+            if has_info:
+                self.subproblem_solver.info = solver_info  # type: ignore
+        numiter = int(numiter)  # blocks until the loop has completed
+        timer.stop()
+        tn = timer.elapsed()
+
+        stats = np.array(stats[:numiter])
+        count = np.array(count)
+        fields = dict(zip(self.itstat_object.fieldname, self.itstat_object.fieldformat))
+        self.itstat_batch: List[IterationStats] = []
+        for b in range(nbatch):
+            itstat = IterationStats(fields)
+            for k in range(count[b]):
+                itstat.insert((itnum0 + k, tn * (k + 1) / numiter) + tuple(stats[k, b]))
+            self.itstat_batch.append(itstat)
+
+        return state[0]
@@ -12,20 +12,32 @@
 from __future__ import annotations
 
 from functools import reduce
-from typing import Any, Optional, Union
+from typing import Any, List, Optional, Tuple, Union
+
+import numpy as np
 
 import jax
+from jax.scipy.linalg import cho_factor, cho_solve
 from jax.scipy.sparse.linalg import cg as jax_cg
 
 import scico.numpy as snp
 import scico.optimize.admm as soa
-from scico.linop import CircularConvolve, Identity, LinearOperator
+from scico.linop import (
+    CircularConvolve,
+    Diagonal,
+    Identity,
+    LinearOperator,
+    MatrixOperator,
+    ScaledLinearOperator,
+    SumLinearOperator,
+    simplify,
+)
 from scico.loss import SquaredL2Loss
 from scico.numpy import BlockArray
 from scico.numpy.linalg import norm
-from scico.numpy.util import ensure_on_device, is_real_dtype
+from scico.numpy.util import ensure_on_device, is_real_dtype, real_dtype
 from scico.solver import cg as scico_cg
-from scico.solver import minimize
+from scico.solver import ToleranceSchedule, minimize, recycled_cg
 from scico.typing import JaxArray
 
 
@@ -59,6 +71,13 @@ class SubproblemSolver:
         """
         self.admm = admm
 
+    def update_rho(self):
+        """Hook for updating the solver when the penalty parameters change.
+
+        Called by :meth:`.ADMM.set_rho` after :code:`admm.rho_list` has
+        been modified. The base class does not require any update.
+        """
+
 
 class GenericSubproblemSolver(SubproblemSolver):
     """Solver for generic problem without special structure.
@@ -150,28 +169,71 @@ class LinearSubproblemSolver(SubproblemSolver):
             :func:`jax.scipy.sparse.linalg.cg`) lhs (type): Function
             implementing the linear operator needed for the
             :math:`\mb{x}` update step.
+        lhs_op (:class:`.LinearOperator`): Left hand side operator of
+            the linear equation to be solved.
+        recycle (int): Dimension of recycled Krylov subspace basis, or
+            zero if recycling is disabled.
+        basis (tuple): Recycled Krylov subspace basis (see
+            :func:`scico.solver.recycled_cg`), or ``None`` if no basis
+            is available.
+        tol_schedule (:class:`.ToleranceSchedule`): CG tolerance
+            schedule, or ``None`` if a fixed tolerance is used.
+        tol (float): CG tolerance used for the most recent solve.
     """
 
-    def __init__(self, cg_kwargs: Optional[dict[str, Any]] = None, cg_function: str = "scico"):
-        """Initialize a :class:`LinearSubproblemSolver` object.
+    def __init__(
+        self,
+        cg_kwargs: Optional[dict[str, Any]] = None,
+        cg_function: str = "scico",
+        recycle: int = 0,
+        tol_schedule: Optional[ToleranceSchedule] = None,
+    ):
+        r"""Initialize a :class:`LinearSubproblemSolver` object.
 
         Args:
             cg_kwargs: Dictionary of arguments for CG solver. See
                 documentation for :func:`scico.solver.cg` or
                 :func:`jax.scipy.sparse.linalg.cg`,
-                including how to specify a preconditioner.
+                including how to specify a preconditioner. Suitable
+                preconditioners may be constructed via
+                :func:`scico.linop.jacobi_preconditioner`,
+                :func:`scico.linop.block_jacobi_preconditioner`, or
+                :func:`scico.linop.circulant_preconditioner`.
                 Default values are the same as those of
                 :func:`scico.solver.cg`, except for
                 `"tol": 1e-4` and `"maxiter": 100`.
             cg_function: String indicating which CG implementation to
                 use. One of "jax" or "scico"; default "scico". If
                 "scico", uses :func:`scico.solver.cg`. If "jax", uses
-                :func:`jax.scipy.sparse.linalg.cg`. The "jax" option is
-                slower on small-scale problems or problems involving
-                external functions, but can be differentiated through.
-                The "scico" option is faster on small-scale problems, but
-                slower on large-scale problems where the forward
-                operator is written entirely in jax.
+                :func:`jax.scipy.sparse.linalg.cg`. Both options perform
+                the CG iterations on device and can be used within
+                :meth:`.ADMM.solve_compiled`. The "jax" option can be
+                differentiated through, while the "scico" option
+                supports :class:`.BlockArray` preconditioners and
+                reports the number of iterations and the final
+                relative residual in :code:`info`.
+            recycle: If non-zero, solve the linear systems via the
+                deflated CG solver :func:`scico.solver.recycled_cg`,
+                with a basis of dimension `recycle` that is recycled
+                across ADMM iterations and updated with each solve.
+                Since consecutive ADMM iterations solve linear systems
+                with the same left hand side operator and slowly
+                varying right hand sides, this can substantially
+                reduce the total number of CG iterations for
+                ill-conditioned problems. The basis is discarded when
+                the penalty parameters are modified. Requires
+                `cg_function` to be "scico".
+            tol_schedule: If not ``None``, a schedule (see
+                :class:`scico.solver.ToleranceSchedule`) specifying the
+                CG relative residual tolerance at each ADMM iteration,
+                overriding the `"tol"` entry of `cg_kwargs`. This
+                allows the linear systems to be solved inexactly in
+                early iterations, when an accurate solution is not
+                required. The outer residual measure passed to the
+                schedule is the larger of the primal and dual residual
+                norms (see :meth:`.ADMM.norm_primal_residual` and
+                :meth:`.ADMM.norm_dual_residual`) relative to the norm
+                of :math:`(\mb{z}_1, \mb{z}_2, \ldots)`.
         """
 
         default_cg_kwargs = {"tol": 1e-4, "maxiter": 100}
@@ -187,6 +249,12 @@ class LinearSubproblemSolver(SubproblemSolver):
             raise ValueError(
                 f"Parameter cg_function must be one of 'jax', 'scico'; got {cg_function}."
             )
+        if recycle and cg_function != "scico":
+            raise ValueError("Parameter recycle requires cg_function 'scico'.")
+        self.recycle = recycle
+        self.basis: Optional[Tuple[JaxArray, JaxArray]] = None
+        self.tol_schedule = tol_schedule
+        self.tol = self.cg_kwargs["tol"]
         self.info = None
 
     def internal_init(self, admm: soa.ADMM):
@@ -204,17 +272,52 @@ class LinearSubproblemSolver(SubproblemSolver):
 
         super().internal_init(admm)
 
-        # Set lhs_op =  \sum_i rho_i * Ci.H @ CircularConvolve
-        # Use reduce as the initialization of this sum is messy otherwise
-        lhs_op = reduce(
-            lambda a, b: a + b, [rhoi * Ci.gram_op for rhoi, Ci in zip(admm.rho_list, admm.C_list)]
-        )
-        if admm.f is not None:
-            # hessian = A.T @ W @ A; W may be identity
-            lhs_op = lhs_op + admm.f.hessian
+        # Construct a jitted function computing
+        #   \sum_i rho_i * Ci.H @ Ci @ x + A.H @ W @ A @ x
+        # with the rho_i as arguments so that changes in the penalty
+        # parameters do not require a re-jit
+        gram_list = [Ci.gram_op for Ci in admm.C_list]
+        # hessian = A.T @ W @ A; W may be identity
+        hessian = admm.f.hessian if admm.f is not None else None
+
+        def lhs_eval(rho, x):
+            # the operator expression is simplified when traced, e.g.
+            # merging diagonal or circulant terms into a single operator
+            terms = [ScaledLinearOperator(rho[i], Gi) for i, Gi in enumerate(gram_list)]
+            if hessian is not None:
+                terms.append(hessian)
+            return simplify(reduce(SumLinearOperator, terms))(x)
+
+        self._lhs_eval = jax.jit(lhs_eval)
+        self._update_lhs_op()
+
+    def update_rho(self):
+        """Update the left hand side operator for new penalty parameters.
+
+        Update :code:`lhs_op` for the current values in
+        :code:`admm.rho_list`. Since the penalty parameters are traced,
+        rather than static, arguments of the underlying jitted function
+        and of the compiled CG iterations, no recompilation is required.
+        Any recycled Krylov subspace basis is discarded.
+        """
+        self._update_lhs_op()
+        self.basis = None
 
-        lhs_op.jit()
-        self.lhs_op = lhs_op
+    def _update_lhs_op(self):
+        """Construct :code:`lhs_op` for the current penalty parameters."""
+        C0 = self.admm.C_list[0]
+        # the penalty parameters are bound as array arguments of a
+        # jax.tree_util.Partial so that they are traced by the CG solver
+        rho = snp.array(list(self.admm.rho_list), dtype=real_dtype(C0.input_dtype))
+        self._lhs_fn = jax.tree_util.Partial(self._lhs_eval, rho)
+        self.lhs_op = LinearOperator(
+            input_shape=C0.input_shape,
+            output_shape=C0.input_shape,
+            eval_fn=self._lhs_fn,
+            adj_fn=self._lhs_fn,
+            input_dtype=C0.input_dtype,
+            output_dtype=C0.input_dtype,
+        )
 
     def compute_rhs(self) -> Union[JaxArray, BlockArray]:
         r"""Compute the right hand side of the linear equation to be solved.
@@ -254,9 +357,29 @@ class LinearSubproblemSolver(SubproblemSolver):
         """
         x0 = ensure_on_device(x0)
         rhs = self.compute_rhs()
-        x, self.info = self.cg(self.lhs_op, rhs, x0, **self.cg_kwargs)  # type: ignore
+        cg_kwargs = self.cg_kwargs
+        if self.tol_schedule is not None:
+            self.tol = self._scheduled_tol()
+            cg_kwargs = {**cg_kwargs, "tol": self.tol}
+        if self.recycle:
+            x, self.basis, self.info = recycled_cg(
+                self._lhs_fn, rhs, x0, self.basis, nvec=self.recycle, **cg_kwargs
+            )
+        else:
+            x, self.info = self.cg(self._lhs_fn, rhs, x0, **cg_kwargs)  # type: ignore
         return x
 
+    def _scheduled_tol(self) -> float:
+        """Compute the CG tolerance for the current ADMM iteration."""
+        assert self.tol_schedule is not None
+        residual = None
+        if self.tol_schedule.uses_residual:
+            admm = self.admm
+            znorm = float(snp.sqrt(sum([norm(zi) ** 2 for zi in admm.z_list])))
+            rnorm = max(float(admm.norm_primal_residual()), float(admm.norm_dual_residual()))
+            residual = rnorm / max(znorm, np.finfo(np.float32).tiny)
+        return self.tol_schedule(self.admm.itnum, residual)
+
 
 class CircularConvolveSolver(LinearSubproblemSolver):
     r"""Solver for linear operators diagonalized in the DFT domain.
@@ -272,8 +395,8 @@ class CircularConvolveSolver(LinearSubproblemSolver):
     Attributes:
         admm (:class:`.ADMM`): ADMM solver object to which the solver is
             attached.
-        lhs_f (array): Left hand side, in the DFT domain, of the linear
-            equation to be solved.
+        A_lhs (:class:`.CircularConvolve`): Left hand side operator of
+            the linear equation to be solved.
     """
 
     def __init__(self):
@@ -296,15 +419,46 @@ class CircularConvolveSolver(LinearSubproblemSolver):
 
         self.real_result = is_real_dtype(admm.C_list[0].input_dtype)
 
-        lhs_op_list = [
-            rho * CircularConvolve.from_operator(C.gram_op)
-            for rho, C in zip(admm.rho_list, admm.C_list)
-        ]
-        A_lhs = reduce(lambda a, b: a + b, lhs_op_list)
+        # Cache the DFT domain diagonals of each term of the left hand
+        # side so that it can be cheaply recombined when the penalty
+        # parameters change
+        gram_cc_list = [CircularConvolve.from_operator(C.gram_op) for C in admm.C_list]
+        self._ndims = gram_cc_list[0].ndims
+        self._gram_dft_list = [G.h_dft for G in gram_cc_list]
         if self.admm.f is not None:
-            A_lhs += 2.0 * admm.f.scale * CircularConvolve.from_operator(admm.f.A.gram_op)
+            self._hessian_dft = (
+                2.0 * admm.f.scale * CircularConvolve.from_operator(admm.f.A.gram_op).h_dft
+            )
+        else:
+            self._hessian_dft = None
+        self._update_A_lhs()
 
-        self.A_lhs = A_lhs
+    def update_rho(self):
+        """Update the left hand side for new penalty parameters.
+
+        Update :code:`A_lhs` for the current values in
+        :code:`admm.rho_list` by recombining the cached DFT domain
+        diagonals of each term.
+        """
+        super().update_rho()
+        self._update_A_lhs()
+
+    def _update_A_lhs(self):
+        """Construct :code:`A_lhs` from the cached DFT domain diagonals."""
+        h_dft = reduce(
+            lambda a, b: a + b,
+            [rhoi * Gi for rhoi, Gi in zip(self.admm.rho_list, self._gram_dft_list)],
+        )
+        if self._hessian_dft is not None:
+            h_dft = h_dft + self._hessian_dft
+        C0 = self.admm.C_list[0]
+        self.A_lhs = CircularConvolve(
+            h=h_dft,
+            input_shape=C0.input_shape,
+            ndims=self._ndims,
+            input_dtype=C0.input_dtype,
+            h_is_dft=True,
+        )
 
     def solve(self, x0: Union[JaxArray, BlockArray]) -> Union[JaxArray, BlockArray]:
         """Solve the ADMM step.
@@ -324,3 +478,666 @@ class CircularConvolveSolver(LinearSubproblemSolver):
             x = x.real
 
         return x
+
+
+def _dft_domain_columns(
+    op: LinearOperator, ndims: int
+) -> Tuple[List[JaxArray], List[JaxArray], Tuple[int, ...]]:
+    """Compute the DFT domain representation of a block circulant operator.
+
+    The operator input (and output) is assumed to consist of channel
+    axes followed by `ndims` trailing spatial axes, with respect to
+    which the operator is circulant for each pair of input and output
+    channels. The response to an impulse at the spatial origin of each
+    input channel is computed, and transformed to the DFT domain.
+
+    Args:
+        op: Block circulant operator.
+        ndims: Number of trailing spatial axes.
+
+    Returns:
+        Tuple consisting of a list, indexed by input channel, of
+        arrays of the indices of the output channels with non-zero
+        response, a list of arrays of the corresponding DFT domain
+        responses, with output channel index on the final axis, and
+        the spatial shape.
+    """
+    in_shape = op.input_shape
+    out_shape = op.output_shape
+    spatial = in_shape[-ndims:]  # type: ignore
+    if out_shape[-ndims:] != spatial:  # type: ignore
+        raise ValueError(
+            f"Trailing {ndims} axes of operator output shape {out_shape} must be the same "
+            f"as those of the input shape {in_shape}."
+        )
+    num_in = int(np.prod(in_shape[:-ndims]))  # type: ignore
+    num_out = int(np.prod(out_shape[:-ndims]))  # type: ignore
+    axes = tuple(range(-ndims, 0))
+    index_list = []
+    column_list = []
+    for j in range(num_in):
+        impulse = snp.zeros((num_in,) + spatial, dtype=op.input_dtype)
+        impulse = impulse.at[(j,) + (0,) * ndims].set(1.0).reshape(in_shape)
+        col = snp.fft.fftn(op(impulse), axes=axes).reshape((num_out,) + spatial)
+        nonzero = np.flatnonzero(np.array(snp.any(col != 0, axis=axes)))
+        index_list.append(nonzero)
+        column_list.append(snp.moveaxis(col[nonzero], 0, -1))
+    return index_list, column_list, spatial
+
+
+class BlockCircularConvolveSolver(LinearSubproblemSolver):
+    r"""Solver for linear operators block diagonalized in the DFT domain.
+
+    Generalization of :class:`.CircularConvolveSolver` to operators
+    acting on inputs with leading channel axes and `ndims` trailing
+    spatial axes, that are circulant with respect to the spatial axes
+    for each pair of input and output channels, but which may combine
+    channels, e.g. by summing over them. This includes the
+    convolutional dictionary operator :math:`D \mb{x} = \sum_m
+    \mb{d}_m \ast \mb{x}_m` of convolutional sparse coding, which can be
+    constructed as a :class:`.Sum` composed with a
+    :class:`.CircularConvolve`. The operator :code:`f.A` of a
+    :class:`.SquaredL2Loss` :code:`f` without weighting, and each of
+    the :code:`C_i`, must be of this form, and must have output spatial
+    axes of the same shape as the input spatial axes.
+
+    In the DFT domain, the :math:`\mb{x}`-update linear system (see
+    :class:`.LinearSubproblemSolver`) decouples into an independent
+    system for each frequency :math:`\mb{k}`, with matrix
+
+    .. math::
+
+       \hat{G}(\mb{k}) = \hat{D}(\mb{k}) + \hat{U}(\mb{k})
+       \hat{U}(\mb{k})^H \;,
+
+    where :math:`\hat{D}(\mb{k})` is a diagonal matrix representing
+    the contributions of operators that do not couple input channels
+    (e.g. :class:`.Identity` or :class:`.FiniteDifference`), and the
+    columns of :math:`\hat{U}(\mb{k})` are the conjugated DFT domain
+    rows of the remaining operators. If the number :math:`r` of such
+    rows is smaller than the number of input channels :math:`M`, as in
+    convolutional sparse coding, for which :math:`r = 1`, these
+    systems are solved via the Woodbury identity (the Sherman-Morrison
+    formula when :math:`r = 1`) :cite:`wohlberg-2016-efficient`, which
+    only requires the inversion of an :math:`r \times r` matrix at each
+    frequency. Otherwise the full :math:`M \times M` matrices are
+    (pseudo-)inverted at each frequency. The cost of an :math:`\mb{x}`-update
+    is therefore :math:`\mathcal{O}(M r N \log N)` for spatial size
+    :math:`N`, rather than that of the many applications of the Gram
+    operator required by CG.
+
+    The DFT domain representations of the operators are computed at
+    initialization from their impulse responses, requiring one
+    application of each operator per input channel, and are cached so
+    that the penalty parameters may be modified cheaply.
+
+    Attributes:
+        admm (:class:`.ADMM`): ADMM solver object to which the solver is
+            attached.
+        ndims (int): Number of trailing spatial axes.
+        woodbury (bool): Flag indicating whether the Woodbury identity
+            is used.
+    """
+
+    def __init__(self, ndims: int):
+        """Initialize a :class:`BlockCircularConvolveSolver` object.
+
+        Args:
+            ndims: Number of trailing spatial axes of the input array,
+                with respect to which the operators are circulant. The
+                remaining leading axes are channel axes.
+        """
+        self.ndims = ndims
+
+    def internal_init(self, admm: soa.ADMM):
+        if admm.f is not None:
+            if not isinstance(admm.f, SquaredL2Loss):
+                raise ValueError(
+                    "BlockCircularConvolveSolver requires f to be a scico.loss.SquaredL2Loss; "
+                    f"got {type(admm.f)}."
+                )
+            if not isinstance(admm.f.W, Identity):
+                raise ValueError("BlockCircularConvolveSolver does not support weighting W.")
+            if not isinstance(admm.f.A, LinearOperator):
+                raise ValueError(
+                    "BlockCircularConvolveSolver requires f.A to be a "
+                    f"scico.linop.LinearOperator; got {type(admm.f.A)}."
+                )
+
+        super().internal_init(admm)
+
+        C0 = admm.C_list[0]
+        self.real_result = is_real_dtype(C0.input_dtype)
+        self._num_in = int(np.prod(C0.input_shape[: -self.ndims]))  # type: ignore
+        # DFT domain representations of each term, in the same order as
+        # admm.rho_list followed by f.A if f is not None; terms that do
+        # not couple input channels are represented by the diagonal of
+        # their Gram matrix, and the others by their rows
+        self._diag_terms = []
+        self._row_terms = []
+        ops = list(admm.C_list) + ([admm.f.A] if admm.f is not None else [])
+        for n, op in enumerate(ops):
+            index_list, column_list, self._spatial = _dft_domain_columns(op, self.ndims)
+            count = np.zeros((int(np.prod(op.output_shape[: -self.ndims])),), dtype=int)
+            for index in index_list:
+                count[index] += 1
+            if np.all(count <= 1):
+                gram_diag = snp.stack(
+                    [snp.sum(snp.abs(col) ** 2, axis=-1) for col in column_list], axis=-1
+                )
+                self._diag_terms.append((n, gram_diag))
+            else:
+                rows = snp.zeros(
+                    self._spatial + (count.size, self._num_in), dtype=column_list[0].dtype
+                )
+                for j, (index, col) in enumerate(zip(index_list, column_list)):
+                    rows = rows.at[..., index, j].set(col)
+                self._row_terms.append((n, rows[..., np.flatnonzero(count), :]))
+        self._update_lhs()
+
+    def update_rho(self):
+        """Update the left hand side for new penalty parameters.
+
+        Update the DFT domain representation of the left hand side for
+        the current values in :code:`admm.rho_list`, using the cached
+        DFT domain representations of each term.
+        """
+        super().update_rho()
+        self._update_lhs()
+
+    def _term_weight(self, n: int) -> float:
+        """Weight of term `n` in the left hand side of the linear system."""
+        if n < len(self.admm.rho_list):
+            return self.admm.rho_list[n]
+        return 2.0 * self.admm.f.scale  # type: ignore
+
+    def _update_lhs(self):
+        """Construct the DFT domain left hand side for the current penalty parameters."""
+        M = self._num_in
+        D = 0.0
+        for n, gram_diag in self._diag_terms:
+            D = D + self._term_weight(n) * gram_diag
+        if self._row_terms:
+            U = snp.concatenate(
+                [
+                    snp.sqrt(self._term_weight(n)) * snp.conj(snp.swapaxes(rows, -1, -2))
+                    for n, rows in self._row_terms
+                ],
+                axis=-1,
+            )
+            r = U.shape[-1]
+            if not self._diag_terms:
+                D = snp.zeros(U.shape[:-1], dtype=snp.abs(U).dtype)
+        else:
+            U = None
+            r = 0
+        self._D = D
+        self.woodbury = r < M and bool(snp.all(D > 0))
+        if U is None:
+            self._Ginv = None
+        elif self.woodbury:
+            # K = I + U^H D^{-1} U for each frequency
+            DinvU = U / D[..., snp.newaxis]
+            K = snp.matmul(snp.conj(snp.swapaxes(U, -1, -2)), DinvU) + snp.eye(r, dtype=U.dtype)
+            self._U = U
+            self._DinvU = DinvU
+            self._Ginv = snp.linalg.inv(K)
+        else:
+            G = snp.matmul(U, snp.conj(snp.swapaxes(U, -1, -2)))
+            G = G + D[..., snp.newaxis] * snp.eye(M, dtype=G.dtype)
+            # pseudo-inverse since G may be singular at some frequencies,
+            # e.g. at zero frequency when all C_i are finite differences
+            self._Ginv = snp.linalg.pinv(G, hermitian=True)
+
+    def solve(self, x0: Union[JaxArray, BlockArray]) -> Union[JaxArray, BlockArray]:
+        """Solve the ADMM step.
+
+        Args:
+            x0: Initial value (unused, but accepted for consistency
+                with other subproblem solvers).
+
+        Returns:
+            Computed solution.
+        """
+        C0 = self.admm.C_list[0]
+        axes = tuple(range(-self.ndims, 0))
+        rhs = self.compute_rhs()
+        b = snp.fft.fftn(rhs, axes=axes).reshape((self._num_in,) + self._spatial)
+        b = snp.moveaxis(b, 0, -1)
+        if self._Ginv is None:
+            x = b / self._D
+        elif self.woodbury:
+            # x = D^{-1} b - D^{-1} U K^{-1} U^H D^{-1} b
+            Dinvb = b / self._D
+            t = snp.sum(snp.conj(self._U) * Dinvb[..., snp.newaxis], axis=-2)
+            t = snp.sum(self._Ginv * t[..., snp.newaxis, :], axis=-1)
+            x = Dinvb - snp.sum(self._DinvU * t[..., snp.newaxis, :], axis=-1)
+        else:
+            x = snp.sum(self._Ginv * b[..., snp.newaxis, :], axis=-1)
+        x = snp.moveaxis(x, -1, 0).reshape(C0.input_shape)
+        x = snp.fft.ifftn(x, axes=axes)
+        if self.real_result:
+            x = x.real
+        return x
+
+
+class FactorizedSubproblemSolver(LinearSubproblemSolver):
+    r"""Solver for dense matrix problems via cached matrix factorization.
+
+    Specialization of :class:`.LinearSubproblemSolver` for the case
+    where :code:`f` is an instance of :class:`.SquaredL2Loss`, the
+    forward operator :code:`f.A` is an instance of
+    :class:`.MatrixOperator`, and the :code:`C_i` are all instances of
+    :class:`.Identity` or :class:`.Diagonal`, so that the linear system
+    to be solved has the form
+
+    ..  math::
+
+        \left(B^H B + D\right) \mb{x}^{(k+1)} = \mb{r} \;,
+
+    where :math:`B = (2 \alpha W)^{1/2} A`, with :math:`\alpha` the
+    :class:`.SquaredL2Loss` scaling parameter, and :math:`D = \sum_i
+    \rho_i C_i^H C_i` is diagonal. Rather than solving this system
+    iteratively, a Cholesky factorization is computed and each
+    :math:`\mb{x}`-update requires only two triangular solves. If
+    :math:`A` is an :math:`M \times N` matrix with :math:`M \geq N`,
+    the :math:`N \times N` matrix :math:`B^H B + D` is factorized.
+    Otherwise the Woodbury identity
+
+    ..  math::
+
+        \left(B^H B + D\right)^{-1} = D^{-1} - D^{-1} B^H \left(I +
+        B D^{-1} B^H\right)^{-1} B D^{-1}
+
+    is used, so that only the smaller :math:`M \times M` matrix
+    :math:`I + B D^{-1} B^H` is factorized.
+
+    When all of the :code:`C_i` are :class:`.Identity`, :math:`D` is a
+    scalar multiple of the identity, and an eigendecomposition of the
+    smaller of :math:`B^H B` and :math:`B B^H` is computed instead of a
+    Cholesky factorization. Since a change of penalty parameters only
+    shifts or scales its eigenvalues, no further factorization is
+    required. Otherwise, the product :math:`B^H B` is cached, but each
+    change of penalty parameters requires a new Cholesky factorization,
+    with a cost that is cubic in the size of the factorized matrix.
+
+    Attributes:
+        admm (:class:`.ADMM`): ADMM solver object to which the solver is
+            attached.
+        woodbury (bool): Flag indicating whether the Woodbury identity
+            is used.
+        factor (tuple): Cholesky factorization of the matrix being
+            factorized, as returned by
+            :func:`jax.scipy.linalg.cho_factor`, or ``None`` if an
+            eigendecomposition is used.
+    """
+
+    def __init__(self):
+        """Initialize a :class:`FactorizedSubproblemSolver` object."""
+        super().__init__()
+
+    def internal_init(self, admm: soa.ADMM):
+        if not isinstance(admm.f, SquaredL2Loss):
+            raise ValueError(
+                "FactorizedSubproblemSolver requires f to be a scico.loss.SquaredL2Loss; "
+                f"got {type(admm.f)}."
+            )
+        if not isinstance(admm.f.A, MatrixOperator):
+            raise ValueError(
+                "FactorizedSubproblemSolver requires f.A to be a scico.linop.MatrixOperator; "
+                f"got {type(admm.f.A)}."
+            )
+        vector_input = len(admm.f.A.input_shape) == 1
+        for C in admm.C_list:
+            if not isinstance(C, Diagonal) or (not isinstance(C, Identity) and not vector_input):
+                raise ValueError(
+                    "FactorizedSubproblemSolver requires the C_i to be scico.linop.Identity "
+                    "or, for one-dimensional input, scico.linop.Diagonal; "
+                    f"got {type(C)}."
+                )
+        if not isinstance(admm.f.W, Identity) and not vector_input:
+            raise ValueError(
+                "FactorizedSubproblemSolver does not support weighting W for "
+                "two-dimensional input."
+            )
+
+        # the CG solver state constructed by LinearSubproblemSolver is not
+        # required, so only the base class initialization is performed
+        SubproblemSolver.internal_init(self, admm)
+
+        A = admm.f.A.A
+        if isinstance(admm.f.W, Identity):
+            self._B = snp.sqrt(2.0 * admm.f.scale) * A
+        else:
+            w = snp.broadcast_to(2.0 * admm.f.scale * admm.f.W.diagonal, (A.shape[0],))
+            self._B = snp.sqrt(w)[:, snp.newaxis] * A
+        self.woodbury = A.shape[0] < A.shape[1]
+        # the C_i^H C_i terms are a scalar multiple of the identity when all
+        # of the C_i are Identity, and diagonal otherwise
+        self._scalar_D = all(isinstance(C, Identity) for C in admm.C_list)
+        if self._scalar_D:
+            G = self._B @ self._B.conj().T if self.woodbury else self._B.conj().T @ self._B
+            self._eigval, self._eigvec = snp.linalg.eigh(G)
+        elif not self.woodbury:
+            self._BHB = self._B.conj().T @ self._B
+        self.factor = None
+        self._update_factor()
+
+    def update_rho(self):
+        """Update the factorization for new penalty parameters.
+
+        Update the solver for the current values in
+        :code:`admm.rho_list`. When all of the :code:`C_i` are
+        :class:`.Identity`, this only requires an update of the scalar
+        :math:`D`, and otherwise a new Cholesky factorization is
+        computed.
+        """
+        self._update_factor()
+
+    def _update_factor(self):
+        """Compute the factorization for the current penalty parameters."""
+        n = self._B.shape[1]
+        if self._scalar_D:
+            self._D = sum(self.admm.rho_list)
+            return
+        self._D = reduce(
+            lambda a, b: a + b,
+            [
+                rhoi * snp.broadcast_to(snp.abs(Ci.diagonal) ** 2, (n,))
+                for rhoi, Ci in zip(self.admm.rho_list, self.admm.C_list)
+            ],
+        )
+        if self.woodbury:
+            m = self._B.shape[0]
+            K = (self._B / self._D) @ self._B.conj().T + snp.eye(m, dtype=self._B.dtype)
+        else:
+            K = self._BHB + self._D * snp.eye(n, dtype=self._BHB.dtype)
+        self.factor = cho_factor(K, lower=True)
+
+    def _solve_factored(self, v: JaxArray) -> JaxArray:
+        """Solve a linear system with the factorized matrix.
+
+        Args:
+            v: Right hand side of the linear system.
+
+        Returns:
+            Solution of the linear system.
+        """
+        if self.factor is not None:
+            return cho_solve(self.factor, v)
+        if self.woodbury:
+            # the factorized matrix is I + B B^H / D
+            scale = self._D / (self._D + self._eigval)
+        else:
+            # the factorized matrix is B^H B + D I
+            scale = 1.0 / (self._eigval + self._D)
+        scale = scale.reshape((-1,) + (1,) * (v.ndim - 1))
+        return self._eigvec @ (scale * (self._eigvec.conj().T @ v))
+
+    def solve(self, x0: Union[JaxArray, BlockArray]) -> Union[JaxArray, BlockArray]:
+        """Solve the ADMM step.
+
+        Args:
+            x0: Initial value (unused, but accepted for consistency
+                with other subproblem solvers).
+
+        Returns:
+            Computed solution.
+        """
+        rhs = self.compute_rhs()
+        if self.woodbury:
+            Dinv_rhs = rhs / self._D
+            x = Dinv_rhs - self._B.conj().T @ self._solve_factored(self._B @ Dinv_rhs) / self._D
+        else:
+            x = self._solve_factored(rhs)
+        return x
+
+
+class PenaltyUpdate:
+    r"""Base class for ADMM penalty parameter update policies.
+
+    The convergence rate of ADMM can be very sensitive to the choice of
+    the penalty parameters :math:`\rho_i`. This class is a base class
+    for policies that adapt these parameters during the iterations. The
+    base class does not modify the penalty parameters.
+
+    When the penalty parameters are modified, the scaled Lagrange
+    multipliers :math:`\mb{u}_i` are rescaled and the subproblem solver
+    is updated via :meth:`.ADMM.set_rho`.
+
+    Attributes:
+        admm (:class:`.ADMM`): ADMM solver object to which the policy
+            is attached.
+        period (int): Number of iterations between penalty parameter
+            updates.
+        maxiter (int): Iteration number after which the penalty
+            parameters are held fixed, or ``None`` if they may be
+            updated at any iteration.
+    """
+
+    def __init__(self, period: int = 1, maxiter: Optional[int] = None):
+        """Initialize a :class:`PenaltyUpdate` object.
+
+        Args:
+            period: Number of iterations between penalty parameter
+                updates.
+            maxiter: Iteration number after which the penalty parameters
+                are held fixed, ensuring that the standard ADMM
+                convergence guarantees apply. If ``None``, the penalty
+                parameters may be updated at any iteration.
+        """
+        self.period = period
+        self.maxiter = maxiter
+
+    def internal_init(self, admm: soa.ADMM):
+        """Second stage initializer to be called by :meth:`.ADMM.__init__`.
+
+        Args:
+            admm: Reference to :class:`.ADMM` object to which the
+               :class:`.PenaltyUpdate` object is to be attached.
+        """
+        self.admm = admm
+
+    def update(self):
+        """Update the penalty parameters if an update is due.
+
+        Called by :meth:`.ADMM.step` at the end of each iteration. If
+        an update is due at the current iteration, the penalty
+        parameters computed by :meth:`compute_rho` are applied via
+        :meth:`.ADMM.set_rho` if they differ from the current values.
+        """
+        if self.maxiter is not None and self.admm.itnum >= self.maxiter:
+            return
+        if (self.admm.itnum + 1) % self.period != 0:
+            return
+        rho_list = self.compute_rho()
+        if any(rho != rho_old for rho, rho_old in zip(rho_list, self.admm.rho_list)):
+            self.admm.set_rho(rho_list)
+
+    def compute_rho(self) -> List[float]:
+        """Hook for computing new penalty parameters in derived classes.
+
+        The base class does not compute any update.
+
+        Returns:
+            List of penalty parameters.
+        """
+        return list(self.admm.rho_list)
+
+
+class ResidualBalancingPenalty(PenaltyUpdate):
+    r"""Penalty parameter update by residual balancing.
+
+    Penalty parameter update policy that attempts to keep the primal
+    and dual residuals within a factor :math:`\mu` of each other
+    :cite:`boyd-2010-distributed` (Sec. 3.4.1)
+    :cite:`wohlberg-2017-admm`. Each penalty parameter :math:`\rho_i`
+    is updated independently according to
+
+    .. math::
+       \rho_i \leftarrow \begin{cases} \tau \rho_i & \text{ if }
+       \norm{\mb{r}_i}_2 > \mu \norm{\mb{s}_i}_2 \\ \rho_i / \tau &
+       \text{ if } \norm{\mb{s}_i}_2 > \mu \norm{\mb{r}_i}_2 \\ \rho_i &
+       \text{ otherwise} \end{cases} \;,
+
+    where :math:`\mb{r}_i = C_i \mb{x} - \mb{z}_i` and :math:`\mb{s}_i
+    = \rho_i C_i^H (\mb{z}_i^{(k)} - \mb{z}_i^{(k-1)})` are the primal
+    and dual residuals for term :math:`i`.
+    """
+
+    def __init__(
+        self,
+        mu: float = 10.0,
+        tau: float = 2.0,
+        period: int = 1,
+        maxiter: Optional[int] = None,
+    ):
+        r"""Initialize a :class:`ResidualBalancingPenalty` object.
+
+        Args:
+            mu: Residual ratio :math:`\mu` above which the penalty
+                parameter is modified.
+            tau: Multiplicative factor :math:`\tau` by which the
+                penalty parameter is modified.
+            period: Number of iterations between penalty parameter
+                updates.
+            maxiter: Iteration number after which the penalty parameters
+                are held fixed. If ``None``, the penalty parameters may
+                be updated at any iteration.
+        """
+        super().__init__(period=period, maxiter=maxiter)
+        self.mu = mu
+        self.tau = tau
+
+    def compute_rho(self) -> List[float]:
+        """Compute new penalty parameters.
+
+        Returns:
+            List of penalty parameters.
+        """
+        admm = self.admm
+        rho_list = []
+        for rhoi, Ci, zi, ziold in zip(admm.rho_list, admm.C_list, admm.z_list, admm.z_list_old):
+            r = float(norm(Ci(admm.x) - zi))
+            s = float(rhoi * norm(Ci.adj(zi - ziold)))
+            if r > self.mu * s:
+                rhoi = rhoi * self.tau
+            elif s > self.mu * r:
+                rhoi = rhoi / self.tau
+            rho_list.append(rhoi)
+        return rho_list
+
+
+def _inner(a: Union[JaxArray, BlockArray], b: Union[JaxArray, BlockArray]) -> float:
+    """Real part of the inner product of two arrays."""
+    return float(snp.sum(snp.real(snp.conj(a) * b)))
+
+
+def _spectral_stepsize(dlambda, dF) -> Tuple[float, float]:
+    """Compute a safeguarded spectral step size and correlation.
+
+    Args:
+        dlambda: Change in dual variable.
+        dF: Change in gradient of corresponding dual function component.
+
+    Returns:
+        Tuple of hybrid spectral step size and correlation coefficient.
+        The correlation coefficient is zero if the step size cannot be
+        computed.
+    """
+    ll = _inner(dlambda, dlambda)
+    ff = _inner(dF, dF)
+    fl = _inner(dF, dlambda)
+    if ll <= 0.0 or ff <= 0.0 or fl <= 0.0:
+        return 0.0, 0.0
+    sd = ll / fl  # steepest descent step size
+    mg = fl / ff  # minimum gradient step size
+    step = mg if 2.0 * mg > sd else sd - mg / 2.0
+    return step, fl / (np.sqrt(ff) * np.sqrt(ll))
+
+
+class SpectralPenalty(PenaltyUpdate):
+    r"""Penalty parameter update by spectral step size selection.
+
+    Penalty parameter update policy based on Barzilai-Borwein spectral
+    step size estimates of the curvature of the dual functions
+    :cite:`xu-2017-adaptive`. For each term :math:`i`, at the current
+    iteration :math:`k` and the iteration :math:`k_0` of the previous
+    update, hybrid spectral step sizes :math:`\hat{\alpha}_i` and
+    :math:`\hat{\beta}_i` are computed from the changes
+    :math:`(\Delta \hat{\lambda}_i, -C_i \Delta \mb{x})` and
+    :math:`(\Delta \lambda_i, \Delta \mb{z}_i)`, where
+    :math:`\lambda_i = \rho_i \mb{u}_i` is the unscaled Lagrange
+    multiplier and :math:`\hat{\lambda}_i` is the intermediate
+    multiplier computed with :math:`\mb{z}_i^{(k-1)}`. The penalty
+    parameter is set to :math:`\sqrt{\hat{\alpha}_i \hat{\beta}_i}`,
+    :math:`\hat{\alpha}_i`, or :math:`\hat{\beta}_i` depending on which
+    of the step size estimates have correlation coefficient exceeding
+    :math:`\epsilon_{\text{cor}}`, and is left unchanged if neither
+    does.
+    """
+
+    def __init__(
+        self,
+        eps_cor: float = 0.2,
+        period: int = 2,
+        maxiter: Optional[int] = None,
+    ):
+        r"""Initialize a :class:`SpectralPenalty` object.
+
+        Args:
+            eps_cor: Correlation threshold :math:`\epsilon_{\text{cor}}`
+                for accepting spectral step size estimates.
+            period: Number of iterations between penalty parameter
+                updates.
+            maxiter: Iteration number after which the penalty parameters
+                are held fixed. If ``None``, the penalty parameters may
+                be updated at any iteration.
+        """
+        super().__init__(period=period, maxiter=maxiter)
+        self.eps_cor = eps_cor
+        self.prev: Optional[Tuple] = None
+
+    def internal_init(self, admm: soa.ADMM):
+        super().internal_init(admm)
+        self.prev = None
+
+    def compute_rho(self) -> List[float]:
+        """Compute new penalty parameters.
+
+        Returns:
+            List of penalty parameters.
+        """
+        admm = self.admm
+        lmbda_list = [rhoi * ui for rhoi, ui in zip(admm.rho_list, admm.u_list)]
+        lmbda_hat_list = [
+            rhoi * (ui + zi - ziold)
+            for rhoi, ui, zi, ziold in zip(admm.rho_list, admm.u_list, admm.z_list, admm.z_list_old)
+        ]
+        prev = self.prev
+        self.prev = (admm.x, list(admm.z_list), lmbda_list, lmbda_hat_list)
+        if prev is None:
+            return list(admm.rho_list)
+
+        x0, z0_list, lmbda0_list, lmbda_hat0_list = prev
+        rho_list = []
+        for rhoi, Ci, zi, z0i, lmbdai, lmbda0i, lmbda_hati, lmbda_hat0i in zip(
+            admm.rho_list,
+            admm.C_list,
+            admm.z_list,
+            z0_list,
+            lmbda_list,
+            lmbda0_list,
+            lmbda_hat_list,
+            lmbda_hat0_list,
+        ):
+            alpha, alpha_cor = _spectral_stepsize(lmbda_hati - lmbda_hat0i, -Ci(admm.x - x0))
+            beta, beta_cor = _spectral_stepsize(lmbdai - lmbda0i, zi - z0i)
+            if alpha_cor > self.eps_cor and beta_cor > self.eps_cor:
+                rhoi = float(np.sqrt(alpha * beta))
+            elif alpha_cor > self.eps_cor:
+                rhoi = alpha
+            elif beta_cor > self.eps_cor:
+                rhoi = beta
+            rho_list.append(rhoi)
+        return rho_list
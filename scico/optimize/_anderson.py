@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2022 by SCICO Developers
+# All rights reserved. BSD 3-clause License.
+# This file is part of the SCICO package. Details of the copyright and
+# user license can be found in the 'LICENSE' file distributed with the
+# package.
+
+"""Anderson acceleration of fixed-point optimizers."""
+
+# Needed to annotate a class method that returns the encapsulating class;
+# see https://www.python.org/dev/peps/pep-0563/
+from __future__ import annotations
+
+from typing import Any, Callable, Optional, Sequence, Tuple
+
+import jax
+from jax.flatten_util import ravel_pytree
+
+import scico.numpy as snp
+from scico.typing import JaxArray
+
+from ._admm import ADMM
+from ._common import (
+    ProfilePhase,
+    check_convergence,
+    load_checkpoint,
+    save_checkpoint,
+)
+from ._ladmm import LinearizedADMM
+from ._pgm import PGM, AcceleratedPGM
+from ._primaldual import PDHG
+
+
+class AndersonAcceleration:
+    r"""Type-II Anderson acceleration of fixed-point optimizers.
+
+    Many of the optimizers in :mod:`scico.optimize` are fixed-point
+    iterations :math:`\mb{s}^{(k+1)} = T(\mb{s}^{(k)})` over a state
+    :math:`\mb{s}`, e.g. :math:`(\mb{z}_1, \mb{z}_2, \ldots, \mb{u}_1,
+    \mb{u}_2, \ldots)` for :class:`.ADMM`. Type-II Anderson acceleration
+    :cite:`walker-2011-anderson` :cite:`fu-2020-anderson` replaces the
+    plain fixed-point update by an extrapolation based on the most
+    recent :math:`m` iterates. Denoting the fixed-point residual by
+    :math:`\mb{g}^{(k)} = T(\mb{s}^{(k)}) - \mb{s}^{(k)}`, and the
+    matrices of differences of successive states and residuals by
+    :math:`S` and :math:`G` respectively, the update is
+
+    .. math::
+       \begin{aligned}
+       \gamma &= \argmin_{\gamma} \; \norm{\mb{g}^{(k)} - G
+       \gamma}_2^2 + \lambda \norm{\gamma}_2^2 \\
+       \mb{s}^{(k+1)} &= T(\mb{s}^{(k)}) - (S + G) \gamma \;,
+       \end{aligned}
+
+    where :math:`\lambda` is a small regularization parameter. As a
+    safeguard, if the norm of the fixed-point residual at an
+    extrapolated state exceeds that at the preceding state by more than
+    a factor `safeguard`, the extrapolated step is rejected, the state
+    is reverted to the plain fixed-point update of the last accepted
+    state, and the history is cleared.
+
+    The history is held in a fixed-size device ring buffer and all of
+    the acceleration computations are performed on device without host
+    synchronization.
+
+    The optimizer object is not modified other than by the iterations
+    performed by the :meth:`step` and :meth:`solve` methods of this
+    object, which should be used in place of the corresponding methods
+    of the optimizer. The acceleration history is included in
+    checkpoints saved by :meth:`save_state`. Optimizer methods such as
+    :meth:`.ADMM.solve_compiled` perform unaccelerated iterations.
+
+    If profiling is enabled for the optimizer, the time spent computing
+    the extrapolation is recorded in the optimizer timer under the
+    label "anderson_update".
+
+    Attributes:
+        solver (object): Optimizer object to which acceleration is
+            applied.
+        m (int): History length.
+        attrib (sequence of str): Names of optimizer attributes that
+            constitute the fixed-point state.
+        safeguard (float): Safeguard residual ratio.
+        reg (float): Relative regularization parameter.
+        num_reject (int): Number of rejected extrapolation steps.
+    """
+
+    default_attrib = {
+        ADMM: ("z_list", "u_list"),
+        LinearizedADMM: ("x", "z", "u"),
+        PDHG: ("x", "z"),
+        PGM: ("x",),
+    }
+
+    # names of the attributes constituting the acceleration state
+    _aa_attrib = (
+        "_dS",
+        "_dG",
+        "_index",
+        "_count",
+        "_s_prev",
+        "_g_prev",
+        "_gnorm_prev",
+        "_have_prev",
+        "_extrapolated",
+        "num_reject",
+    )
+
+    def __init__(
+        self,
+        solver: Any,
+        m: int = 5,
+        attrib: Optional[Sequence[str]] = None,
+        safeguard: float = 1.0,
+        reg: float = 1e-8,
+    ):
+        """Initialize an :class:`AndersonAcceleration` object.
+
+        Args:
+            solver: Optimizer object (e.g. :class:`.ADMM`,
+                :class:`.LinearizedADMM`, :class:`.PDHG`, or
+                :class:`.PGM`) to which acceleration is applied.
+            m: History length.
+            attrib: Names of optimizer attributes that constitute the
+                fixed-point state. If ``None``, a default appropriate for
+                the type of `solver` is used.
+            safeguard: Safeguard residual ratio. An extrapolated step is
+                rejected if the fixed-point residual norm at the
+                extrapolated state is greater than `safeguard` times
+                the fixed-point residual norm at the preceding state.
+            reg: Regularization parameter :math:`\\lambda`, relative to
+                the squared Frobenius norm of :math:`G`, for the least
+                squares problem.
+        """
+        if attrib is None:
+            if isinstance(solver, AcceleratedPGM):
+                raise TypeError("AndersonAcceleration does not support AcceleratedPGM.")
+            for cls, cls_attrib in self.default_attrib.items():
+                if isinstance(solver, cls):
+                    attrib = cls_attrib
+                    break
+            else:
+                raise TypeError(
+                    f"Parameter attrib must be specified for solver of type {type(solver)}."
+                )
+        self.solver = solver
+        self.m = m
+        self.attrib = tuple(attrib)
+        self.safeguard = safeguard
+        self.reg = reg
+
+        s, self._unravel = ravel_pytree(self._get_state())
+        n = s.size
+        # ring buffers of state and residual differences
+        self._dS = snp.zeros((m, n), dtype=s.dtype)
+        self._dG = snp.zeros((m, n), dtype=s.dtype)
+        self._index = snp.array(0)
+        self._count = snp.array(0)
+        self._s_prev = snp.zeros((n,), dtype=s.dtype)
+        self._g_prev = snp.zeros((n,), dtype=s.dtype)
+        self._gnorm_prev = snp.array(snp.inf, dtype=snp.abs(s).dtype)
+        self._have_prev = snp.array(False)
+        self._extrapolated = snp.array(False)
+        self.num_reject = snp.array(0)
+        self._update = jax.jit(self._update_fn)
+
+    def _get_state(self) -> Tuple:
+        """Get the fixed-point state of the optimizer."""
+        return tuple(getattr(self.solver, name) for name in self.attrib)
+
+    def _set_state(self, state: Tuple):
+        """Set the fixed-point state of the optimizer."""
+        for name, value in zip(self.attrib, state):
+            setattr(self.solver, name, value)
+
+    def _get_aa_state(self) -> Tuple:
+        """Get the acceleration state."""
+        return tuple(getattr(self, name) for name in self._aa_attrib)
+
+    def _set_aa_state(self, aa_state: Tuple):
+        """Set the acceleration state."""
+        for name, value in zip(self._aa_attrib, aa_state):
+            setattr(self, name, value)
+
+    def _update_fn(self, s: JaxArray, f: JaxArray, aa_state: Tuple) -> Tuple[JaxArray, Tuple]:
+        """Compute the accelerated update.
+
+        Args:
+            s: Flattened state at which the fixed-point map was
+                evaluated.
+            f: Flattened result of the fixed-point map.
+            aa_state: Tuple of acceleration state arrays.
+
+        Returns:
+            Tuple of flattened updated state and updated acceleration
+            state.
+        """
+        (dS, dG, index, count, s_prev, g_prev, gnorm_prev, have_prev, extrapolated, nrej) = aa_state
+        g = f - s
+        gnorm = snp.linalg.norm(g)
+        reject = extrapolated & (gnorm > self.safeguard * gnorm_prev)
+
+        # insert differences into ring buffer unless history is cleared
+        insert = have_prev & ~reject
+        dS = snp.where(insert, dS.at[index].set(s - s_prev), snp.where(reject, 0.0, dS))
+        dG = snp.where(insert, dG.at[index].set(g - g_prev), snp.where(reject, 0.0, dG))
+        index = snp.where(insert, (index + 1) % self.m, snp.where(reject, 0, index))
+        count = snp.where(insert, snp.minimum(count + 1, self.m), snp.where(reject, 0, count))
+
+        # regularized least squares for extrapolation coefficients;
+        # unfilled buffer entries are zero and have zero coefficients
+        GG = snp.conj(dG) @ dG.T
+        lmbda = self.reg * snp.real(snp.trace(GG)) + snp.finfo(gnorm.dtype).tiny
+        gamma = snp.linalg.solve(GG + lmbda * snp.eye(self.m, dtype=GG.dtype), snp.conj(dG) @ g)
+        s_aa = f - (dS + dG).T @ gamma
+
+        # on rejection, revert to the plain fixed-point update of the
+        # last accepted state
+        extrapolated = (count > 0) & ~reject
+        s_next = snp.where(reject, s_prev + g_prev, snp.where(extrapolated, s_aa, f))
+        s_prev = snp.where(reject, s_prev, s)
+        g_prev = snp.where(reject, g_prev, g)
+        gnorm_prev = snp.where(reject, gnorm_prev, gnorm)
+        have_prev = ~reject
+        aa_state = (
+            dS,
+            dG,
+            index,
+            count,
+            s_prev,
+            g_prev,
+            gnorm_prev,
+            have_prev,
+            extrapolated,
+            nrej + reject,
+        )
+        return s_next, aa_state
+
+    def step(self):
+        """Perform a single accelerated iteration of the optimizer."""
+        s, _ = ravel_pytree(self._get_state())
+        self.solver.step()
+        f, _ = ravel_pytree(self._get_state())
+        with ProfilePhase(self.solver, "anderson_update") as phase:
+            s_next, aa_state = phase.sync(self._update(s, f, self._get_aa_state()))
+        self._set_aa_state(aa_state)
+        self._set_state(self._unravel(s_next))
+
+    def _checkpoint_state(self, itnum: Optional[int] = None) -> dict:
+        """Construct a dict of the optimizer and acceleration state.
+
+        Args:
+            itnum: Iteration number to record. If ``None``, use the
+                optimizer :code:`itnum` attribute.
+
+        Returns:
+            Dict of state components.
+        """
+        state = self.solver._checkpoint_state(itnum)
+        state["anderson"] = dict(zip(self._aa_attrib, self._get_aa_state()))
+        return state
+
+    def save_state(self, path: str):
+        """Save the optimizer and acceleration state to a checkpoint file.
+
+        The checkpoint file is as saved by the :code:`save_state` method
+        of the optimizer, with the addition of the acceleration history.
+
+        Args:
+            path: Path of checkpoint file.
+        """
+        save_checkpoint(path, self.solver, self._checkpoint_state())
+
+    def load_state(self, path: str):
+        """Restore the optimizer and acceleration state from a checkpoint file.
+
+        Restore the state saved by :meth:`save_state`. If the checkpoint
+        was saved by the :code:`save_state` method of the optimizer, the
+        optimizer state is restored and the acceleration history is
+        cleared.
+
+        Args:
+            path: Path of checkpoint file.
+        """
+        state = load_checkpoint(path, self.solver)
+        self.solver._set_checkpoint_state(state)
+        if "anderson" in state:
+            self._set_aa_state(tuple(state["anderson"][name] for name in self._aa_attrib))
+        else:
+            self._index = snp.zeros_like(self._index)
+            self._count = snp.zeros_like(self._count)
+            self._dS = snp.zeros_like(self._dS)
+            self._dG = snp.zeros_like(self._dG)
+            self._have_prev = snp.array(False)
+            self._extrapolated = snp.array(False)
+
+    def solve(
+        self,
+        callback: Optional[Callable[[Any], None]] = None,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_period: Optional[int] = None,
+    ) -> Any:
+        """Run the accelerated optimizer.
+
+        Run accelerated iterations of the optimizer for a total of
+        `maxiter` iterations of the optimizer, or until its convergence
+        test, if enabled, is satisfied. Iteration statistics are
+        recorded in the optimizer :code:`itstat_object`, as for the
+        optimizer :code:`solve` method.
+
+        Args:
+            callback: An optional callback function, taking a single
+               argument, the optimizer object, that is called at the
+               end of every iteration.
+            checkpoint_path: Path of checkpoint file (see
+               :meth:`save_state`) to which the state is saved at the
+               end of the solve and, if `checkpoint_period` is not
+               ``None``, every `checkpoint_period` iterations.
+            checkpoint_period: Number of iterations between checkpoints.
+               If ``None``, a checkpoint is only saved at the end of the
+               solve.
+
+        Returns:
+            Computed solution.
+        """
+        solver = self.solver
+        if checkpoint_period and checkpoint_path is None:
+            raise ValueError("Parameter checkpoint_path must be specified with checkpoint_period.")
+        solver.timer.start()
+        for solver.itnum in range(solver.itnum, solver.itnum + solver.maxiter):
+            self.step()
+            with ProfilePhase(solver, "itstat_eval") as phase:
+                itstat = phase.sync(solver.itstat_insert_func(solver))
+            with ProfilePhase(solver, "itstat_insert"):
+                solver.itstat_object.insert(itstat)
+            if callback:
+                solver.timer.stop()
+                callback(solver)
+                solver.timer.start()
+            if checkpoint_period and (solver.itnum + 1) % checkpoint_period == 0:
+                solver.timer.stop()
+                save_checkpoint(checkpoint_path, solver, self._checkpoint_state(solver.itnum + 1))
+                solver.timer.start()
+            with ProfilePhase(solver, "convergence_test"):
+                converged = check_convergence(solver)
+            if converged:
+                break
+        solver.timer.stop()
+        solver.itnum += 1
+        solver.itstat_object.end()
+        if checkpoint_path is not None:
+            self.save_state(checkpoint_path)
+        return solver.x
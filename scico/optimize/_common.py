@@ -8,9 +8,18 @@
 """Functions common to multiple optimizer modules."""
 
 
-from typing import Callable, Dict, List, Optional, Tuple, Union
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
+import numpy as np
+
+import jax
+
+import scico.numpy as snp
 from scico.diagnostics import IterationStats
+from scico.numpy import BlockArray
+from scico.util import npz_memmap
 
 
 def itstat_func_and_object(
@@ -60,3 +69,256 @@ def itstat_func_and_object(
     itstat_object = IterationStats(**default_itstat_options)  # type: ignore
 
     return itstat_insert_func, itstat_object
+
+
+def set_convergence_params(solver: Any, eps_abs: float, eps_rel: float, check_period: int):
+    """Set and validate the convergence test parameters of a solver.
+
+    Args:
+        solver: Solver object.
+        eps_abs: Absolute tolerance for the convergence test.
+        eps_rel: Relative tolerance for the convergence test.
+        check_period: Number of iterations between convergence tests.
+    """
+    if check_period < 1:
+        raise ValueError(f"Parameter check_period must be positive; got {check_period}.")
+    solver.eps_abs = eps_abs
+    solver.eps_rel = eps_rel
+    solver.check_period = check_period
+
+
+def check_convergence(solver: Any) -> bool:
+    """Determine whether a solver convergence test is due and satisfied.
+
+    Args:
+        solver: Solver object with :code:`eps_abs`, :code:`eps_rel`,
+            :code:`check_period`, and :code:`itnum` attributes and a
+            :code:`converged` method.
+
+    Returns:
+        ``True`` if the convergence test is enabled, is due at the
+        current iteration, and is satisfied, ``False`` otherwise.
+    """
+    return (
+        (solver.eps_abs > 0.0 or solver.eps_rel > 0.0)
+        and (solver.itnum + 1) % solver.check_period == 0
+        and bool(solver.converged())
+    )
+
+
+class ProfilePhase:
+    """Context manager for profiling a phase of a solver iteration.
+
+    The phase is annotated as a JAX profiler named scope with the
+    specified label. If the :code:`profile` attribute of the solver is
+    ``True``, the phase is also annotated as a profiler trace event and
+    its duration is accumulated in the solver :class:`.Timer` under the
+    same label. Since JAX dispatch is asynchronous, results computed
+    within the phase should be passed through :meth:`sync`, which
+    blocks until they are ready, so that their computation time is
+    attributed to the correct phase. Timing is disabled when the phase
+    is executed while being traced, e.g. within :func:`jax.jit`.
+
+    For example
+
+    >>> with ProfilePhase(solver, "x_update") as phase:  # doctest: +SKIP
+    ...     solver.x = phase.sync(solver.subproblem_solver.solve(solver.x))
+    """
+
+    def __init__(self, solver: Any, label: str):
+        """
+        Args:
+            solver: Solver object with :code:`timer` and :code:`profile`
+                attributes.
+            label: Phase label.
+        """
+        self.solver = solver
+        self.label = label
+        self.active = False
+        self._scope = jax.named_scope(label)
+        self._annotation: Optional[jax.profiler.TraceAnnotation] = None
+
+    def __enter__(self):
+        """Enter the named scope and, if profiling, start the timer."""
+        self._scope.__enter__()
+        self.active = getattr(self.solver, "profile", False) and jax.core.trace_state_clean()
+        if self.active:
+            self._annotation = jax.profiler.TraceAnnotation(self.label)
+            self._annotation.__enter__()
+            self.solver.timer.start(self.label)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop the timer, if profiling, and exit the named scope."""
+        if self.active:
+            self.solver.timer.stop(self.label)
+            self._annotation.__exit__(exc_type, exc_value, traceback)  # type: ignore
+            self._annotation = None
+        self._scope.__exit__(exc_type, exc_value, traceback)
+        return False
+
+    def sync(self, value: Any) -> Any:
+        """Block, if profiling, until a computed value is ready.
+
+        Args:
+            value: Array or pytree of arrays computed within the phase.
+
+        Returns:
+            The `value` parameter, unmodified.
+        """
+        if self.active:
+            for leaf in jax.tree_util.tree_leaves(value):
+                if hasattr(leaf, "block_until_ready"):
+                    leaf.block_until_ready()
+        return value
+
+
+def _encode_state(value: Any, key: str, arrays: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    """Encode a solver state component for saving to a checkpoint.
+
+    Args:
+        value: State component, which may be an array, a
+            :class:`.BlockArray`, a list or tuple of state components, a
+            dict of state components, a scalar, or ``None``.
+        key: Key identifying the state component.
+        arrays: Dict into which the arrays in the state component are
+            inserted.
+
+    Returns:
+        A JSON-serializable description of the state component.
+    """
+    if value is None:
+        return {"type": "none"}
+    if isinstance(value, BlockArray):
+        return {
+            "type": "blockarray",
+            "blocks": [_encode_state(blk, f"{key}.{n}", arrays) for n, blk in enumerate(value)],
+        }
+    if isinstance(value, (list, tuple)):
+        return {
+            "type": "list",
+            "items": [_encode_state(item, f"{key}.{n}", arrays) for n, item in enumerate(value)],
+        }
+    if isinstance(value, dict):
+        return {
+            "type": "dict",
+            "items": {k: _encode_state(v, f"{key}.{k}", arrays) for k, v in value.items()},
+        }
+    if isinstance(value, (bool, int, float)):
+        return {"type": "scalar", "value": value}
+    arrays[key] = np.asarray(value)
+    return {"type": "array", "key": key}
+
+
+def _decode_state(desc: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> Any:
+    """Decode a solver state component loaded from a checkpoint.
+
+    Args:
+        desc: Description of the state component constructed by
+            :func:`_encode_state`.
+        arrays: Dict of (possibly memory-mapped) arrays.
+
+    Returns:
+        Decoded state component, with arrays transferred to the device.
+    """
+    if desc["type"] == "none":
+        return None
+    if desc["type"] == "blockarray":
+        return snp.blockarray([_decode_state(blk, arrays) for blk in desc["blocks"]])
+    if desc["type"] == "list":
+        return [_decode_state(item, arrays) for item in desc["items"]]
+    if desc["type"] == "dict":
+        return {k: _decode_state(v, arrays) for k, v in desc["items"].items()}
+    if desc["type"] == "scalar":
+        return desc["value"]
+    return jax.device_put(arrays[desc["key"]])
+
+
+def save_checkpoint(path: str, solver: Any, state: Dict[str, Any]):
+    """Save optimizer state to a checkpoint file.
+
+    Save optimizer state, together with the optimizer iteration
+    statistics history and timer totals, to an uncompressed ``.npz``
+    file. The file is first written to a temporary file which is then
+    renamed, so that an existing checkpoint is not corrupted if writing
+    is interrupted.
+
+    Args:
+        path: Path of checkpoint file.
+        solver: Optimizer object, which is required to have
+            :code:`itstat_object` and :code:`timer` attributes.
+        state: Dict of optimizer state components.
+    """
+    arrays: Dict[str, np.ndarray] = {}
+    itstat = solver.itstat_object
+    meta = {
+        "solver": type(solver).__name__,
+        "state": _encode_state(state, "state", arrays),
+        "timer": {lbl: solver.timer.elapsed(lbl) for lbl in solver.timer.td},
+        "itstat_fields": itstat.fieldname,
+        "itstat_columns": {},
+    }
+    # each iteration statistics field is stored as a separate array so
+    # that its type (e.g. integer, complex, or string) is preserved;
+    # fields that have no corresponding non-object array type are stored
+    # in the JSON metadata
+    for k in range(len(itstat.fieldname)):
+        column = np.asarray([it[k] for it in itstat.iterations])
+        if column.dtype.hasobject:
+            meta["itstat_columns"][str(k)] = [it[k] for it in itstat.iterations]
+        else:
+            arrays[f"itstat.{k}"] = column
+    arrays["meta"] = np.array(json.dumps(meta))
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path: str, solver: Any) -> Dict[str, Any]:
+    """Load optimizer state from a checkpoint file.
+
+    Load optimizer state saved by :func:`save_checkpoint`. State
+    arrays are memory-mapped and transferred directly to the device.
+    The iteration statistics history and timer totals of `solver` are
+    restored.
+
+    Args:
+        path: Path of checkpoint file.
+        solver: Optimizer object, which is required to have
+            :code:`itstat_object` and :code:`timer` attributes.
+
+    Returns:
+        Dict of optimizer state components.
+
+    Raises:
+        ValueError: If the checkpoint was saved by a different type of
+           optimizer or with different iteration statistics fields.
+    """
+    arrays = npz_memmap(path)
+    meta = json.loads(str(arrays["meta"]))
+    if meta["solver"] != type(solver).__name__:
+        raise ValueError(
+            f"Checkpoint file {path} was saved by a {meta['solver']} object; "
+            f"cannot load into a {type(solver).__name__} object."
+        )
+    itstat = solver.itstat_object
+    if meta["itstat_fields"] != itstat.fieldname:
+        raise ValueError(
+            f"Checkpoint file {path} has iteration statistics fields "
+            f"{meta['itstat_fields']}; expected {itstat.fieldname}."
+        )
+    state = _decode_state(meta["state"], arrays)
+
+    for lbl, td in meta["timer"].items():
+        solver.timer.td[lbl] = td
+        solver.timer.t0[lbl] = None
+    columns = [
+        meta["itstat_columns"][str(k)]
+        if str(k) in meta["itstat_columns"]
+        else np.asarray(arrays[f"itstat.{k}"]).tolist()
+        for k in range(len(itstat.fieldname))
+    ]
+    itstat.iterations = [itstat.IterTuple(*row) for row in zip(*columns)]
+
+    return state
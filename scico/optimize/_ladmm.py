@@ -22,7 +22,14 @@ from scico.numpy.util import ensure_on_device
 from scico.typing import JaxArray
 from scico.util import Timer
 
-from ._common import itstat_func_and_object
+from ._common import (
+    ProfilePhase,
+    check_convergence,
+    itstat_func_and_object,
+    load_checkpoint,
+    save_checkpoint,
+    set_convergence_params,
+)
 
 
 class LinearizedADMM:
@@ -67,6 +74,13 @@ class LinearizedADMM:
     .. math::
        0 < \mu < \nu \| C \|_2^{-2} \;.
 
+    The phases of each iteration are annotated as JAX profiler named
+    scopes with labels "x_update", "prox_g", and "dual_update", and the
+    iteration statistics and convergence test phases of :meth:`solve`
+    with labels "itstat_eval", "itstat_insert", and "convergence_test".
+    If profiling is enabled, the time spent in each phase is
+    accumulated in :attr:`timer` under the corresponding label.
+
 
     Attributes:
         f (:class:`.Functional`): Functional :math:`f` (usually a
@@ -74,7 +88,14 @@ class LinearizedADMM:
         g (:class:`.Functional`): Functional :math:`g`.
         C (:class:`.LinearOperator`): :math:`C` operator.
         itnum (int): Iteration counter.
-        maxiter (int): Number of linearized ADMM outer-loop iterations.
+        maxiter (int): Maximum number of linearized ADMM outer-loop
+            iterations.
+        eps_abs (float): Absolute tolerance for convergence test.
+        eps_rel (float): Relative tolerance for convergence test.
+        check_period (int): Number of iterations between convergence
+            tests.
+        profile (bool): Flag indicating whether per-phase timings are
+            recorded.
         timer (:class:`.Timer`): Iteration timer.
         mu (scalar): First algorithm parameter.
         nu (scalar): Second algorithm parameter.
@@ -97,6 +118,10 @@ class LinearizedADMM:
         x0: Optional[Union[JaxArray, BlockArray]] = None,
         maxiter: int = 100,
         itstat_options: Optional[dict] = None,
+        eps_abs: float = 0.0,
+        eps_rel: float = 0.0,
+        check_period: int = 1,
+        profile: bool = False,
     ):
         r"""Initialize a :class:`LinearizedADMM` object.
 
@@ -108,8 +133,8 @@ class LinearizedADMM:
             nu: Second algorithm parameter.
             x0: Starting point for :math:`\mb{x}`. If ``None``, defaults
                 to an array of zeros.
-            maxiter: Number of linearized ADMM outer-loop iterations.
-                Default: 100.
+            maxiter: Maximum number of linearized ADMM outer-loop
+                iterations. Default: 100.
             itstat_options: A dict of named parameters to be passed to
                 the :class:`.diagnostics.IterationStats` initializer. The
                 dict may also include an additional key "itstat_func"
@@ -120,6 +145,19 @@ class LinearizedADMM:
                 object. If ``None``, default values are used for the dict
                 entries, otherwise the default dict is updated with the
                 dict specified by this parameter.
+            eps_abs: Absolute tolerance for the convergence test (see
+                :meth:`converged`). The test is disabled if both
+                `eps_abs` and `eps_rel` are zero, in which case
+                `maxiter` iterations are always performed.
+            eps_rel: Relative tolerance for the convergence test (see
+                :meth:`converged`).
+            check_period: Number of iterations between convergence
+                tests. Since each test requires a device-to-host
+                transfer, a value greater than one reduces
+                synchronization overhead.
+            profile: If ``True``, record the time spent in each phase of
+                the iterations performed by :meth:`solve` (see
+                :class:`LinearizedADMM`).
         """
         self.f: Functional = f
         self.g: Functional = g
@@ -128,6 +166,8 @@ class LinearizedADMM:
         self.nu: float = nu
         self.itnum: int = 0
         self.maxiter: int = maxiter
+        set_convergence_params(self, eps_abs, eps_rel, check_period)
+        self.profile: bool = profile
         self.timer: Timer = Timer()
 
         if x0 is None:
@@ -243,6 +283,42 @@ class LinearizedADMM:
         """
         return norm(self.C.adj(self.z - self.z_old))
 
+    def converged(self) -> bool:
+        r"""Test for convergence based on the primal and dual residuals.
+
+        Test for convergence using the criteria in Sec. 3.3.1 of
+        :cite:`boyd-2010-distributed`, with penalty parameter
+        :math:`\rho = 1 / \nu`, i.e.
+
+        .. math::
+            \begin{aligned}
+            \norm{C \mb{x} - \mb{z}}_2 &\leq \sqrt{p} \,
+            \epsilon_{\text{abs}} + \epsilon_{\text{rel}} \max \left\{
+            \norm{C \mb{x}}_2, \norm{\mb{z}}_2 \right\} \\
+            \nu^{-1} \norm{C^H (\mb{z}^{(k)} - \mb{z}^{(k-1)})}_2 &\leq
+            \sqrt{n} \, \epsilon_{\text{abs}} + \epsilon_{\text{rel}}
+            \nu^{-1} \norm{C^H \mb{u}}_2 \;,
+            \end{aligned}
+
+        where :math:`p` and :math:`n` are the sizes of :math:`\mb{z}`
+        and :math:`\mb{x}` respectively.
+
+        Returns:
+            ``True`` if the convergence criteria are satisfied,
+            ``False`` otherwise.
+        """
+        Cx = self.C(self.x)
+        eps_pri = snp.sqrt(self.C.output_size) * self.eps_abs + self.eps_rel * snp.maximum(
+            norm(Cx), norm(self.z)
+        )
+        eps_dual = (
+            snp.sqrt(self.C.input_size) * self.eps_abs
+            + self.eps_rel * norm(self.C.adj(self.u)) / self.nu
+        )
+        return snp.logical_and(
+            norm(Cx - self.z) <= eps_pri, self.norm_dual_residual() / self.nu <= eps_dual
+        )
+
     def z_init(
         self, x0: Union[JaxArray, BlockArray]
     ) -> Tuple[Union[JaxArray, BlockArray], Union[JaxArray, BlockArray]]:
@@ -301,40 +377,132 @@ class LinearizedADMM:
             \mb{u}^{(k+1)} =  \mb{u}^{(k)} + C \mb{x}^{(k+1)} -
             \mb{z}^{(k+1)} \;.
         """
-        proxarg = self.x - (self.mu / self.nu) * self.C.conj().T(self.C(self.x) - self.z + self.u)
-        self.x = self.f.prox(proxarg, self.mu, v0=self.x)
+        with ProfilePhase(self, "x_update") as phase:
+            proxarg = self.x - (self.mu / self.nu) * self.C.conj().T(
+                self.C(self.x) - self.z + self.u
+            )
+            self.x = phase.sync(self.f.prox(proxarg, self.mu, v0=self.x))
 
         self.z_old = self.z
-        Cx = self.C(self.x)
-        self.z = self.g.prox(Cx + self.u, self.nu, v0=self.z)
-        self.u = self.u + Cx - self.z
+        with ProfilePhase(self, "prox_g") as phase:
+            Cx = self.C(self.x)
+            self.z = phase.sync(self.g.prox(Cx + self.u, self.nu, v0=self.z))
+        with ProfilePhase(self, "dual_update") as phase:
+            self.u = phase.sync(self.u + Cx - self.z)
+
+    def _checkpoint_state(self, itnum: Optional[int] = None) -> dict:
+        """Construct a dict of the solver state for checkpointing.
+
+        Args:
+            itnum: Iteration number to record. If ``None``, use
+                :code:`self.itnum`.
+
+        Returns:
+            Dict of solver state components.
+        """
+        return {
+            "itnum": self.itnum if itnum is None else itnum,
+            "x": self.x,
+            "z": self.z,
+            "z_old": self.z_old,
+            "u": self.u,
+            "mu": self.mu,
+            "nu": self.nu,
+        }
+
+    def _set_checkpoint_state(self, state: dict):
+        """Set the solver state from a dict restored from a checkpoint.
+
+        Args:
+            state: Dict of solver state components.
+        """
+        self.itnum = state["itnum"]
+        self.x = state["x"]
+        self.z = state["z"]
+        self.z_old = state["z_old"]
+        self.u = state["u"]
+        self.mu = state["mu"]
+        self.nu = state["nu"]
+
+    def save_state(self, path: str):
+        """Save the solver state to a checkpoint file.
+
+        Save the current solver state, iteration statistics history,
+        and timer totals to an uncompressed ``.npz`` file from which
+        they can be restored by :meth:`load_state`.
+
+        Args:
+            path: Path of checkpoint file.
+        """
+        save_checkpoint(path, self, self._checkpoint_state())
+
+    def load_state(self, path: str):
+        """Restore the solver state from a checkpoint file.
+
+        Restore the solver state, iteration statistics history, and
+        timer totals saved by :meth:`save_state`. The solver is
+        required to have been initialized with the same functionals and
+        operators as the solver from which the state was saved. State
+        arrays are memory-mapped from the file rather than being read
+        into memory before transfer to the device. A subsequent call to
+        :meth:`solve` continues from the restored iteration number.
+
+        Args:
+            path: Path of checkpoint file.
+        """
+        self._set_checkpoint_state(load_checkpoint(path, self))
 
     def solve(
         self,
         callback: Optional[Callable[[LinearizedADMM], None]] = None,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_period: Optional[int] = None,
     ) -> Union[JaxArray, BlockArray]:
         r"""Initialize and run the linearized ADMM algorithm.
 
         Initialize and run the linearized ADMM algorithm for a total of
-        `self.maxiter` iterations.
+        `self.maxiter` iterations, or until the convergence test (see
+        :meth:`converged`), if enabled, is satisfied.
 
         Args:
             callback: An optional callback function, taking an a single
               argument of type :class:`LinearizedADMM`, that is called
               at the end of every iteration.
+            checkpoint_path: Path of checkpoint file (see
+               :meth:`save_state`) to which the solver state is saved at
+               the end of the solve and, if `checkpoint_period` is not
+               ``None``, every `checkpoint_period` iterations.
+            checkpoint_period: Number of iterations between checkpoints.
+               If ``None``, a checkpoint is only saved at the end of the
+               solve.
 
         Returns:
             Computed solution.
         """
+        if checkpoint_period and checkpoint_path is None:
+            raise ValueError("Parameter checkpoint_path must be specified with checkpoint_period.")
         self.timer.start()
         for self.itnum in range(self.itnum, self.itnum + self.maxiter):
             self.step()
-            self.itstat_object.insert(self.itstat_insert_func(self))
+            with ProfilePhase(self, "itstat_eval") as phase:
+                itstat = phase.sync(self.itstat_insert_func(self))
+            with ProfilePhase(self, "itstat_insert"):
+                self.itstat_object.insert(itstat)
             if callback:
                 self.timer.stop()
                 callback(self)
                 self.timer.start()
+            if checkpoint_period and (self.itnum + 1) % checkpoint_period == 0:
+                self.timer.stop()
+                save_checkpoint(checkpoint_path, self, self._checkpoint_state(self.itnum + 1))
+                self.timer.start()
+            with ProfilePhase(self, "convergence_test"):
+                converged = check_convergence(self)
+            if converged:
+                break
         self.timer.stop()
         self.itnum += 1
         self.itstat_object.end()
+        if checkpoint_path is not None:
+            self.save_state(checkpoint_path)
         return self.x
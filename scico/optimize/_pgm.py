@@ -11,19 +11,31 @@
 # see https://www.python.org/dev/peps/pep-0563/
 from __future__ import annotations
 
-from typing import Callable, Optional, Union
+import operator as op
+from functools import partial, reduce
+from typing import Callable, List, Optional, Sequence, Union
+
+import numpy as np
 
 import jax
+import jax.numpy as jnp
 
 import scico.numpy as snp
 from scico.functional import Functional
 from scico.loss import Loss
 from scico.numpy import BlockArray
-from scico.numpy.util import ensure_on_device
+from scico.numpy.util import ensure_on_device, shape_to_size
 from scico.typing import JaxArray
 from scico.util import Timer
 
-from ._common import itstat_func_and_object
+from ._common import (
+    ProfilePhase,
+    check_convergence,
+    itstat_func_and_object,
+    load_checkpoint,
+    save_checkpoint,
+    set_convergence_params,
+)
 from ._pgmaux import (
     AdaptiveBBStepSize,
     BBStepSize,
@@ -41,6 +53,14 @@ class PGM:
     Uses helper :class:`StepSize` to provide an estimate of the Lipschitz
     constant :math:`L` of :math:`f`. The step size :math:`\alpha` is the
     reciprocal of :math:`L`, i.e.: :math:`\alpha = 1 / L`.
+
+    The phases of each iteration are annotated as JAX profiler named
+    scopes with labels "step_size" and "x_update" (and "extrapolation"
+    for :class:`AcceleratedPGM`), and the iteration statistics and
+    convergence test phases of :meth:`solve` with labels "itstat_eval",
+    "itstat_insert", and "convergence_test". If profiling is enabled,
+    the time spent in each phase is accumulated in the solver
+    :code:`timer` attribute under the corresponding label.
     """
 
     def __init__(
@@ -52,6 +72,10 @@ class PGM:
         step_size: Optional[PGMStepSize] = None,
         maxiter: int = 100,
         itstat_options: Optional[dict] = None,
+        eps_abs: float = 0.0,
+        eps_rel: float = 0.0,
+        check_period: int = 1,
+        profile: bool = False,
     ):
         r"""
 
@@ -74,6 +98,19 @@ class PGM:
                 ``None``, default values are used for the dict entries,
                 otherwise the default dict is updated with the dict
                 specified by this parameter.
+            eps_abs: Absolute tolerance for the convergence test (see
+                :meth:`converged`). The test is disabled if both
+                `eps_abs` and `eps_rel` are zero, in which case
+                `maxiter` iterations are always performed.
+            eps_rel: Relative tolerance for the convergence test (see
+                :meth:`converged`).
+            check_period: Number of iterations between convergence
+                tests. Since each test requires a device-to-host
+                transfer, a value greater than one reduces
+                synchronization overhead.
+            profile: If ``True``, record the time spent in each phase of
+                the iterations performed by :meth:`solve` (see
+                :class:`PGM`).
         """
 
         #: Functional or Loss to minimize; must have grad method defined.
@@ -92,6 +129,8 @@ class PGM:
         self.L: float = L0  # reciprocal of step size (estimate of Lipschitz constant of f)
         self.itnum: int = 0
         self.maxiter: int = maxiter  # maximum number of iterations to perform
+        set_convergence_params(self, eps_abs, eps_rel, check_period)
+        self.profile: bool = profile
         self.timer: Timer = Timer()
         self.fixed_point_residual = snp.inf
 
@@ -168,41 +207,154 @@ class PGM:
         """
         return self.fixed_point_residual
 
+    def converged(self) -> bool:
+        r"""Test for convergence based on the fixed point residual.
+
+        Test for convergence by requiring that the fixed point residual
+        (see :meth:`norm_residual`) satisfy
+
+        .. math::
+            r \leq \sqrt{n} \, \epsilon_{\text{abs}} +
+            \epsilon_{\text{rel}} \norm{\mb{x}^{(k)}}_2 \;,
+
+        where :math:`r` is the fixed point residual and :math:`n` is the
+        size of :math:`\mb{x}`.
+
+        Returns:
+            ``True`` if the convergence criterion is satisfied,
+            ``False`` otherwise.
+        """
+        n = shape_to_size(self.x.shape)
+        eps = snp.sqrt(n) * self.eps_abs + self.eps_rel * snp.linalg.norm(self.x)
+        return self.norm_residual() <= eps
+
     def step(self):
         """Take a single PGM step."""
         # Update reciprocal of step size using current solution.
-        self.L = self.step_size.update(self.x)
-        x = self.x_step(self.x, self.L)
-        self.fixed_point_residual = snp.linalg.norm(self.x - x)
-        self.x = x
+        with ProfilePhase(self, "step_size") as phase:
+            self.L = phase.sync(self.step_size.update(self.x))
+        with ProfilePhase(self, "x_update") as phase:
+            x = self.x_step(self.x, self.L)
+            self.fixed_point_residual = phase.sync(snp.linalg.norm(self.x - x))
+            self.x = x
+
+    def _checkpoint_state(self, itnum: Optional[int] = None) -> dict:
+        """Construct a dict of the solver state for checkpointing.
+
+        Args:
+            itnum: Iteration number to record. If ``None``, use
+                :code:`self.itnum`.
+
+        Returns:
+            Dict of solver state components.
+        """
+        return {
+            "itnum": self.itnum if itnum is None else itnum,
+            "x": self.x,
+            "L": self.L,
+            "fixed_point_residual": self.fixed_point_residual,
+            "step_size": {
+                name: value
+                for name, value in vars(self.step_size).items()
+                if value is None
+                or isinstance(value, (bool, int, float, np.ndarray, jnp.ndarray, BlockArray))
+            },
+        }
+
+    def _set_checkpoint_state(self, state: dict):
+        """Set the solver state from a dict restored from a checkpoint.
+
+        Args:
+            state: Dict of solver state components.
+        """
+        self.itnum = state["itnum"]
+        self.x = state["x"]
+        self.L = state["L"]
+        self.fixed_point_residual = state["fixed_point_residual"]
+        for name, value in state["step_size"].items():
+            setattr(self.step_size, name, value)
+
+    def save_state(self, path: str):
+        """Save the solver state to a checkpoint file.
+
+        Save the current solver state, iteration statistics history,
+        and timer totals to an uncompressed ``.npz`` file from which
+        they can be restored by :meth:`load_state`.
+
+        Args:
+            path: Path of checkpoint file.
+        """
+        save_checkpoint(path, self, self._checkpoint_state())
+
+    def load_state(self, path: str):
+        """Restore the solver state from a checkpoint file.
+
+        Restore the solver state, iteration statistics history, and
+        timer totals saved by :meth:`save_state`. The solver is
+        required to have been initialized with the same functionals and
+        operators as the solver from which the state was saved. State
+        arrays are memory-mapped from the file rather than being read
+        into memory before transfer to the device. A subsequent call to
+        :meth:`solve` continues from the restored iteration number.
+
+        Args:
+            path: Path of checkpoint file.
+        """
+        self._set_checkpoint_state(load_checkpoint(path, self))
 
     def solve(
         self,
         callback: Optional[Callable[[PGM], None]] = None,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_period: Optional[int] = None,
     ) -> Union[JaxArray, BlockArray]:
         """Run the PGM algorithm.
 
-        Run the PGM algorithm for a total of `self.maxiter` iterations.
+        Run the PGM algorithm for a total of `self.maxiter` iterations,
+        or until the convergence test (see :meth:`converged`), if
+        enabled, is satisfied.
 
         Args:
             callback: An optional callback function, taking an a single
                argument of type :class:`PGM`, that is called at the end
                of every iteration.
+            checkpoint_path: Path of checkpoint file (see
+               :meth:`save_state`) to which the solver state is saved at
+               the end of the solve and, if `checkpoint_period` is not
+               ``None``, every `checkpoint_period` iterations.
+            checkpoint_period: Number of iterations between checkpoints.
+               If ``None``, a checkpoint is only saved at the end of the
+               solve.
 
         Returns:
             Computed solution.
         """
+        if checkpoint_period and checkpoint_path is None:
+            raise ValueError("Parameter checkpoint_path must be specified with checkpoint_period.")
         self.timer.start()
         for self.itnum in range(self.itnum, self.itnum + self.maxiter):
             self.step()
-            self.itstat_object.insert(self.itstat_insert_func(self))
+            with ProfilePhase(self, "itstat_eval") as phase:
+                itstat = phase.sync(self.itstat_insert_func(self))
+            with ProfilePhase(self, "itstat_insert"):
+                self.itstat_object.insert(itstat)
             if callback:
                 self.timer.stop()
                 callback(self)
                 self.timer.start()
+            if checkpoint_period and (self.itnum + 1) % checkpoint_period == 0:
+                self.timer.stop()
+                save_checkpoint(checkpoint_path, self, self._checkpoint_state(self.itnum + 1))
+                self.timer.start()
+            with ProfilePhase(self, "convergence_test"):
+                converged = check_convergence(self)
+            if converged:
+                break
         self.timer.stop()
         self.itnum += 1
         self.itstat_object.end()
+        if checkpoint_path is not None:
+            self.save_state(checkpoint_path)
         return self.x
 
 
@@ -228,6 +380,10 @@ class AcceleratedPGM(PGM):
         step_size: Optional[PGMStepSize] = None,
         maxiter: int = 100,
         itstat_options: Optional[dict] = None,
+        eps_abs: float = 0.0,
+        eps_rel: float = 0.0,
+        check_period: int = 1,
+        profile: bool = False,
     ):
         r"""
 
@@ -250,6 +406,14 @@ class AcceleratedPGM(PGM):
                 default values are used for the dict entries, otherwise
                 the default dict is updated with the dict specified by
                 this parameter.
+            eps_abs: Absolute tolerance for the convergence test (see
+                :meth:`PGM.converged`).
+            eps_rel: Relative tolerance for the convergence test (see
+                :meth:`PGM.converged`).
+            check_period: Number of iterations between convergence
+                tests.
+            profile: If ``True``, record the time spent in each phase of
+                the iterations performed by :meth:`PGM.solve`.
         """
         x0 = ensure_on_device(x0)
         super().__init__(
@@ -260,28 +424,257 @@ class AcceleratedPGM(PGM):
             step_size=step_size,
             maxiter=maxiter,
             itstat_options=itstat_options,
+            eps_abs=eps_abs,
+            eps_rel=eps_rel,
+            check_period=check_period,
+            profile=profile,
         )
 
         self.v = x0
         self.t = 1.0
 
+    def _checkpoint_state(self, itnum: Optional[int] = None) -> dict:
+        state = super()._checkpoint_state(itnum)
+        state.update({"v": self.v, "t": self.t})
+        return state
+
+    def _set_checkpoint_state(self, state: dict):
+        super()._set_checkpoint_state(state)
+        self.v = state["v"]
+        self.t = state["t"]
+
     def step(self):
         """Take a single AcceleratedPGM step."""
         x_old = self.x
         # Update reciprocal of step size using current extrapolation.
-        if isinstance(self.step_size, (AdaptiveBBStepSize, BBStepSize)):
-            self.L = self.step_size.update(self.x)
-        else:
-            self.L = self.step_size.update(self.v)
+        with ProfilePhase(self, "step_size") as phase:
+            if isinstance(self.step_size, (AdaptiveBBStepSize, BBStepSize)):
+                self.L = phase.sync(self.step_size.update(self.x))
+            else:
+                self.L = phase.sync(self.step_size.update(self.v))
         if isinstance(self.step_size, RobustLineSearchStepSize):
             # Robust line search step size uses a different extrapolation sequence.
             # Update in solution is computed while updating the reciprocal of step size.
             self.x = self.step_size.Z
             self.fixed_point_residual = snp.linalg.norm(self.x - x_old)
         else:
-            self.x = self.x_step(self.v, self.L)
+            with ProfilePhase(self, "x_update") as phase:
+                self.x = self.x_step(self.v, self.L)
+                self.fixed_point_residual = phase.sync(snp.linalg.norm(self.x - self.v))
+            with ProfilePhase(self, "extrapolation") as phase:
+                t_old = self.t
+                self.t = 0.5 * (1 + snp.sqrt(1 + 4 * t_old**2))
+                self.v = phase.sync(self.x + ((t_old - 1) / self.t) * (self.x - x_old))
+
+
+class SubsetPGM(PGM):
+    r"""Ordered subsets Proximal Gradient Method.
+
+    Minimize a function of the form :math:`\sum_{k=1}^K f_k(\mb{x}) +
+    g(\mb{x})`, where the :math:`f_k` are instances of
+    :class:`.Functional` with similar gradients, e.g. the losses for
+    subsets of the projection angles of a tomographic problem computed
+    by :func:`.radon_jax.subset_losses`. Each iteration consists of
+    a pass through the subsets, in the order in which they are
+    specified, with a proximal gradient step
+
+    .. math::
+       \mb{x} \leftarrow \mathrm{prox}_{L^{-1} g} \left( \mb{x} -
+       L^{-1} K \nabla f_k(\mb{x}) \right)
+
+    for each subset :math:`k`, in which the gradient of the full
+    objective is approximated by :math:`K` times the gradient for a
+    single subset :cite:`hudson-1994-accelerated`. Each pass therefore
+    has approximately the cost of a single :class:`PGM` iteration, but
+    makes much more progress in early iterations. With a fixed step
+    size the iterates do not, in general, converge to a minimizer, but
+    to a limit cycle in its neighborhood; :class:`SVRG` should be used
+    when an accurate solution is required. The subset steps are only
+    stable if :math:`L` exceeds half of :math:`K` times the Lipschitz
+    constant of each :math:`\nabla f_k`, which, for subsets with
+    similar gradients, is close to the Lipschitz constant of the full
+    sum, but may not be when the number of subsets is large.
+
+    For documentation on inherited attributes, see :class:`.PGM`.
+    """
+
+    def __init__(
+        self,
+        f_list: Sequence[Union[Loss, Functional]],
+        g: Functional,
+        L0: float,
+        x0: Union[JaxArray, BlockArray],
+        maxiter: int = 100,
+        itstat_options: Optional[dict] = None,
+        eps_abs: float = 0.0,
+        eps_rel: float = 0.0,
+        check_period: int = 1,
+        profile: bool = False,
+    ):
+        r"""
 
-            self.fixed_point_residual = snp.linalg.norm(self.x - self.v)
-            t_old = self.t
-            self.t = 0.5 * (1 + snp.sqrt(1 + 4 * t_old**2))
-            self.v = self.x + ((t_old - 1) / self.t) * (self.x - x_old)
+        Args:
+            f_list: List of Loss or Functional objects with `grad`
+                defined.
+            g: Instance of Functional with defined prox method.
+            L0: Estimate of Lipschitz constant of
+                :math:`\sum_k f_k`. The step size is fixed at
+                :math:`1 / L_0`.
+            x0: Starting point for :math:`\mb{x}`.
+            maxiter: Maximum number of passes through the subsets to
+                perform. Default: 100.
+            itstat_options: A dict of named parameters to be passed to
+                the :class:`.diagnostics.IterationStats` initializer
+                (see :class:`PGM`).
+            eps_abs: Absolute tolerance for the convergence test (see
+                :meth:`PGM.converged`).
+            eps_rel: Relative tolerance for the convergence test (see
+                :meth:`PGM.converged`).
+            check_period: Number of iterations between convergence
+                tests.
+            profile: If ``True``, record the time spent in each phase of
+                the iterations performed by :meth:`PGM.solve`.
+        """
+        if len(f_list) == 0:
+            raise ValueError("Parameter f_list may not be empty.")
+        #: List of functionals or losses for each subset
+        self.f_list: List[Union[Loss, Functional]] = list(f_list)
+        super().__init__(
+            f=reduce(op.add, self.f_list),
+            g=g,
+            L0=L0,
+            x0=x0,
+            maxiter=maxiter,
+            itstat_options=itstat_options,
+            eps_abs=eps_abs,
+            eps_rel=eps_rel,
+            check_period=check_period,
+            profile=profile,
+        )
+        K = len(self.f_list)
+
+        def subset_step(
+            f: Union[Loss, Functional], v: Union[JaxArray, BlockArray], L: float
+        ) -> Union[JaxArray, BlockArray]:
+            return self.g.prox(v - K / L * f.grad(v), 1.0 / L)
+
+        self.subset_steps = [jax.jit(partial(subset_step, f)) for f in self.f_list]
+
+    def step(self):
+        """Take a single pass through the subsets."""
+        with ProfilePhase(self, "x_update") as phase:
+            x = self.x
+            for subset_step in self.subset_steps:
+                x = subset_step(x, self.L)
+            self.fixed_point_residual = phase.sync(snp.linalg.norm(self.x - x))
+            self.x = x
+
+
+class SVRG(SubsetPGM):
+    r"""Proximal stochastic variance reduced gradient method.
+
+    Minimize a function of the form :math:`\sum_{k=1}^K f_k(\mb{x}) +
+    g(\mb{x})` as in :class:`SubsetPGM`, but with the variance reduced
+    gradient estimate of the proximal SVRG method
+    :cite:`xiao-2014-proximal`. At the start of each iteration, the
+    full gradient :math:`\mb{\mu} = \sum_k \nabla f_k(\tilde{\mb{x}})`
+    is computed at a snapshot :math:`\tilde{\mb{x}}` of the current
+    solution, followed by a pass through the subsets, with step
+
+    .. math::
+       \mb{x} \leftarrow \mathrm{prox}_{L^{-1} g} \left( \mb{x} -
+       L^{-1} \left( K \nabla f_k(\mb{x}) - K \nabla
+       f_k(\tilde{\mb{x}}) + \mb{\mu} \right) \right)
+
+    for each subset :math:`k`. The variance reduction removes the
+    error in the gradient estimate at a minimizer, so that, unlike
+    :class:`SubsetPGM`, a fixed step size does not prevent the iterates
+    from approaching a minimizer. Note, however, that the convergence
+    results of :cite:`xiao-2014-proximal` apply, in expectation, to
+    randomly sampled subsets and a step size smaller than
+    :math:`1 / (4 L)`, whereas the subsets here are visited in a
+    deterministic cyclic order with step size :math:`1 / L`, so that
+    convergence is not guaranteed. A larger value of `L0`, and
+    therefore a smaller step size, may be required for stability. The
+    subset gradients at the snapshot are recomputed in each step
+    rather than stored, so that memory use does not grow with the
+    number of subsets, and each iteration has approximately the cost
+    of three :class:`PGM` iterations.
+
+    For documentation on inherited attributes, see :class:`.PGM`.
+    """
+
+    def __init__(
+        self,
+        f_list: Sequence[Union[Loss, Functional]],
+        g: Functional,
+        L0: float,
+        x0: Union[JaxArray, BlockArray],
+        maxiter: int = 100,
+        itstat_options: Optional[dict] = None,
+        eps_abs: float = 0.0,
+        eps_rel: float = 0.0,
+        check_period: int = 1,
+        profile: bool = False,
+    ):
+        r"""
+
+        Args:
+            f_list: List of Loss or Functional objects with `grad`
+                defined.
+            g: Instance of Functional with defined prox method.
+            L0: Estimate of Lipschitz constant of
+                :math:`\sum_k f_k`. The step size is fixed at
+                :math:`1 / L_0`.
+            x0: Starting point for :math:`\mb{x}`.
+            maxiter: Maximum number of iterations to perform.
+                Default: 100.
+            itstat_options: A dict of named parameters to be passed to
+                the :class:`.diagnostics.IterationStats` initializer
+                (see :class:`PGM`).
+            eps_abs: Absolute tolerance for the convergence test (see
+                :meth:`PGM.converged`).
+            eps_rel: Relative tolerance for the convergence test (see
+                :meth:`PGM.converged`).
+            check_period: Number of iterations between convergence
+                tests.
+            profile: If ``True``, record the time spent in each phase of
+                the iterations performed by :meth:`PGM.solve`.
+        """
+        super().__init__(
+            f_list=f_list,
+            g=g,
+            L0=L0,
+            x0=x0,
+            maxiter=maxiter,
+            itstat_options=itstat_options,
+            eps_abs=eps_abs,
+            eps_rel=eps_rel,
+            check_period=check_period,
+            profile=profile,
+        )
+        K = len(self.f_list)
+
+        def subset_step(
+            f: Union[Loss, Functional],
+            v: Union[JaxArray, BlockArray],
+            x_snap: Union[JaxArray, BlockArray],
+            mu: Union[JaxArray, BlockArray],
+            L: float,
+        ) -> Union[JaxArray, BlockArray]:
+            grad = K * (f.grad(v) - f.grad(x_snap)) + mu
+            return self.g.prox(v - grad / L, 1.0 / L)
+
+        self.subset_steps = [jax.jit(partial(subset_step, f)) for f in self.f_list]
+        self.full_grad = jax.jit(self.f.grad)
+
+    def step(self):
+        """Take a single SVRG iteration."""
+        with ProfilePhase(self, "x_update") as phase:
+            x_snap = self.x
+            mu = self.full_grad(x_snap)
+            x = x_snap
+            for subset_step in self.subset_steps:
+                x = subset_step(x, x_snap, mu, self.L)
+            self.fixed_point_residual = phase.sync(snp.linalg.norm(x_snap - x))
+            self.x = x
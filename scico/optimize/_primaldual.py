@@ -23,7 +23,14 @@ from scico.operator import Operator
 from scico.typing import JaxArray
 from scico.util import Timer
 
-from ._common import itstat_func_and_object
+from ._common import (
+    ProfilePhase,
+    check_convergence,
+    itstat_func_and_object,
+    load_checkpoint,
+    save_checkpoint,
+    set_convergence_params,
+)
 
 
 class PDHG:
@@ -75,6 +82,13 @@ class PDHG:
        \mb{x}^{(k+1)} = \mathrm{prox}_{\tau f} \left( \mb{x}^{(k)} -
        \tau [\nabla C(\mb{x}^{(k)})]^T \mb{z}^{(k)} \right) \;.
 
+    The phases of each iteration are annotated as JAX profiler named
+    scopes with labels "x_update" and "prox_g", and the iteration
+    statistics and convergence test phases of :meth:`solve` with labels
+    "itstat_eval", "itstat_insert", and "convergence_test". If
+    profiling is enabled, the time spent in each phase is accumulated
+    in :attr:`timer` under the corresponding label.
+
 
     Attributes:
         f (:class:`.Functional`): Functional :math:`f` (usually a
@@ -82,7 +96,13 @@ class PDHG:
         g (:class:`.Functional`): Functional :math:`g`.
         C (:class:`.Operator`): :math:`C` operator.
         itnum (int): Iteration counter.
-        maxiter (int): Number of PDHG outer-loop iterations.
+        maxiter (int): Maximum number of PDHG outer-loop iterations.
+        eps_abs (float): Absolute tolerance for convergence test.
+        eps_rel (float): Relative tolerance for convergence test.
+        check_period (int): Number of iterations between convergence
+            tests.
+        profile (bool): Flag indicating whether per-phase timings are
+            recorded.
         timer (:class:`.Timer`): Iteration timer.
         tau (scalar): First algorithm parameter.
         sigma (scalar): Second algorithm parameter.
@@ -109,6 +129,10 @@ class PDHG:
         z0: Optional[Union[JaxArray, BlockArray]] = None,
         maxiter: int = 100,
         itstat_options: Optional[dict] = None,
+        eps_abs: float = 0.0,
+        eps_rel: float = 0.0,
+        check_period: int = 1,
+        profile: bool = False,
     ):
         r"""Initialize a :class:`PDHG` object.
 
@@ -123,7 +147,8 @@ class PDHG:
                to an array of zeros.
             z0: Starting point for :math:`\mb{z}`. If ``None``, defaults
                to an array of zeros.
-            maxiter: Number of PDHG outer-loop iterations. Default: 100.
+            maxiter: Maximum number of PDHG outer-loop iterations.
+                Default: 100.
             itstat_options: A dict of named parameters to be passed to
                 the :class:`.diagnostics.IterationStats` initializer. The
                 dict may also include an additional key "itstat_func"
@@ -134,6 +159,19 @@ class PDHG:
                 ``None``, default values are used for the dict entries,
                 otherwise the default dict is updated with the dict
                 specified by this parameter.
+            eps_abs: Absolute tolerance for the convergence test (see
+                :meth:`converged`). The test is disabled if both
+                `eps_abs` and `eps_rel` are zero, in which case
+                `maxiter` iterations are always performed.
+            eps_rel: Relative tolerance for the convergence test (see
+                :meth:`converged`).
+            check_period: Number of iterations between convergence
+                tests. Since each test requires a device-to-host
+                transfer, a value greater than one reduces
+                synchronization overhead.
+            profile: If ``True``, record the time spent in each phase of
+                the iterations performed by :meth:`solve` (see
+                :class:`PDHG`).
         """
         self.f: Functional = f
         self.g: Functional = g
@@ -143,6 +181,8 @@ class PDHG:
         self.alpha: float = alpha
         self.itnum: int = 0
         self.maxiter: int = maxiter
+        set_convergence_params(self, eps_abs, eps_rel, check_period)
+        self.profile: bool = profile
         self.timer: Timer = Timer()
 
         if x0 is None:
@@ -245,46 +285,169 @@ class PDHG:
         """
         return norm(self.z - self.z_old) / self.sigma
 
+    def converged(self) -> bool:
+        r"""Test for convergence based on the primal and dual residuals.
+
+        Test for convergence by requiring that the primal and dual
+        residuals (see :meth:`norm_primal_residual` and
+        :meth:`norm_dual_residual`) satisfy
+
+        .. math::
+            \begin{aligned}
+            \tau^{-1} \norm{\mb{x}^{(k)} - \mb{x}^{(k-1)}}_2 &\leq
+            \sqrt{n} \, \epsilon_{\text{abs}} + \epsilon_{\text{rel}}
+            \tau^{-1} \norm{\mb{x}^{(k)}}_2 \\
+            \sigma^{-1} \norm{\mb{z}^{(k)} - \mb{z}^{(k-1)}}_2 &\leq
+            \sqrt{m} \, \epsilon_{\text{abs}} + \epsilon_{\text{rel}}
+            \sigma^{-1} \norm{\mb{z}^{(k)}}_2 \;,
+            \end{aligned}
+
+        where :math:`n` and :math:`m` are the sizes of :math:`\mb{x}`
+        and :math:`\mb{z}` respectively.
+
+        Returns:
+            ``True`` if the convergence criteria are satisfied,
+            ``False`` otherwise.
+        """
+        eps_pri = (
+            snp.sqrt(self.C.input_size) * self.eps_abs + self.eps_rel * norm(self.x) / self.tau
+        )
+        eps_dual = (
+            snp.sqrt(self.C.output_size) * self.eps_abs + self.eps_rel * norm(self.z) / self.sigma
+        )
+        return snp.logical_and(
+            self.norm_primal_residual() <= eps_pri, self.norm_dual_residual() <= eps_dual
+        )
+
     def step(self):
         """Perform a single iteration."""
         self.x_old = self.x
         self.z_old = self.z
-        if isinstance(self.C, LinearOperator):
-            proxarg = self.x - self.tau * self.C.conj().T(self.z)
-        else:
-            proxarg = self.x - self.tau * self.C.vjp(self.x, conjugate=True)[1](self.z)
-        self.x = self.f.prox(proxarg, self.tau, v0=self.x)
-        proxarg = self.z + self.sigma * self.C(
-            (1.0 + self.alpha) * self.x - self.alpha * self.x_old
-        )
-        self.z = self.g.conj_prox(proxarg, self.sigma, v0=self.z)
+        with ProfilePhase(self, "x_update") as phase:
+            if isinstance(self.C, LinearOperator):
+                proxarg = self.x - self.tau * self.C.conj().T(self.z)
+            else:
+                proxarg = self.x - self.tau * self.C.vjp(self.x, conjugate=True)[1](self.z)
+            self.x = phase.sync(self.f.prox(proxarg, self.tau, v0=self.x))
+        with ProfilePhase(self, "prox_g") as phase:
+            proxarg = self.z + self.sigma * self.C(
+                (1.0 + self.alpha) * self.x - self.alpha * self.x_old
+            )
+            self.z = phase.sync(self.g.conj_prox(proxarg, self.sigma, v0=self.z))
+
+    def _checkpoint_state(self, itnum: Optional[int] = None) -> dict:
+        """Construct a dict of the solver state for checkpointing.
+
+        Args:
+            itnum: Iteration number to record. If ``None``, use
+                :code:`self.itnum`.
+
+        Returns:
+            Dict of solver state components.
+        """
+        return {
+            "itnum": self.itnum if itnum is None else itnum,
+            "x": self.x,
+            "x_old": self.x_old,
+            "z": self.z,
+            "z_old": self.z_old,
+            "tau": self.tau,
+            "sigma": self.sigma,
+        }
+
+    def _set_checkpoint_state(self, state: dict):
+        """Set the solver state from a dict restored from a checkpoint.
+
+        Args:
+            state: Dict of solver state components.
+        """
+        self.itnum = state["itnum"]
+        self.x = state["x"]
+        self.x_old = state["x_old"]
+        self.z = state["z"]
+        self.z_old = state["z_old"]
+        self.tau = state["tau"]
+        self.sigma = state["sigma"]
+
+    def save_state(self, path: str):
+        """Save the solver state to a checkpoint file.
+
+        Save the current solver state, iteration statistics history,
+        and timer totals to an uncompressed ``.npz`` file from which
+        they can be restored by :meth:`load_state`.
+
+        Args:
+            path: Path of checkpoint file.
+        """
+        save_checkpoint(path, self, self._checkpoint_state())
+
+    def load_state(self, path: str):
+        """Restore the solver state from a checkpoint file.
+
+        Restore the solver state, iteration statistics history, and
+        timer totals saved by :meth:`save_state`. The solver is
+        required to have been initialized with the same functionals and
+        operators as the solver from which the state was saved. State
+        arrays are memory-mapped from the file rather than being read
+        into memory before transfer to the device. A subsequent call to
+        :meth:`solve` continues from the restored iteration number.
+
+        Args:
+            path: Path of checkpoint file.
+        """
+        self._set_checkpoint_state(load_checkpoint(path, self))
 
     def solve(
         self,
         callback: Optional[Callable[[PDHG], None]] = None,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_period: Optional[int] = None,
     ) -> Union[JaxArray, BlockArray]:
         r"""Initialize and run the PDHG algorithm.
 
         Initialize and run the PDHG algorithm for a total of
-        `self.maxiter` iterations.
+        `self.maxiter` iterations, or until the convergence test (see
+        :meth:`converged`), if enabled, is satisfied.
 
         Args:
             callback: An optional callback function, taking an a single
                argument of type :class:`PDHG`, that is called at the end
                of every iteration.
+            checkpoint_path: Path of checkpoint file (see
+               :meth:`save_state`) to which the solver state is saved at
+               the end of the solve and, if `checkpoint_period` is not
+               ``None``, every `checkpoint_period` iterations.
+            checkpoint_period: Number of iterations between checkpoints.
+               If ``None``, a checkpoint is only saved at the end of the
+               solve.
 
         Returns:
             Computed solution.
         """
+        if checkpoint_period and checkpoint_path is None:
+            raise ValueError("Parameter checkpoint_path must be specified with checkpoint_period.")
         self.timer.start()
         for self.itnum in range(self.itnum, self.itnum + self.maxiter):
             self.step()
-            self.itstat_object.insert(self.itstat_insert_func(self))
+            with ProfilePhase(self, "itstat_eval") as phase:
+                itstat = phase.sync(self.itstat_insert_func(self))
+            with ProfilePhase(self, "itstat_insert"):
+                self.itstat_object.insert(itstat)
             if callback:
                 self.timer.stop()
                 callback(self)
                 self.timer.start()
+            if checkpoint_period and (self.itnum + 1) % checkpoint_period == 0:
+                self.timer.stop()
+                save_checkpoint(checkpoint_path, self, self._checkpoint_state(self.itnum + 1))
+                self.timer.start()
+            with ProfilePhase(self, "convergence_test"):
+                converged = check_convergence(self)
+            if converged:
+                break
         self.timer.stop()
         self.itnum += 1
         self.itstat_object.end()
+        if checkpoint_path is not None:
+            self.save_state(checkpoint_path)
         return self.x
@@ -15,6 +15,11 @@ from ._admmaux import (
     GenericSubproblemSolver,
     LinearSubproblemSolver,
     CircularConvolveSolver,
+    BlockCircularConvolveSolver,
+    FactorizedSubproblemSolver,
+    PenaltyUpdate,
+    ResidualBalancingPenalty,
+    SpectralPenalty,
 )
 from ._admm import ADMM
 
@@ -23,6 +28,11 @@ __all__ = [
     "GenericSubproblemSolver",
     "LinearSubproblemSolver",
     "CircularConvolveSolver",
+    "BlockCircularConvolveSolver",
+    "FactorizedSubproblemSolver",
+    "PenaltyUpdate",
+    "ResidualBalancingPenalty",
+    "SpectralPenalty",
     "ADMM",
 ]
 
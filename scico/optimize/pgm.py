@@ -16,7 +16,7 @@ from ._pgmaux import (
     LineSearchStepSize,
     RobustLineSearchStepSize,
 )
-from ._pgm import PGM, AcceleratedPGM
+from ._pgm import PGM, AcceleratedPGM, SubsetPGM, SVRG
 
 __all__ = [
     "PGMStepSize",
@@ -26,6 +26,8 @@ __all__ = [
     "RobustLineSearchStepSize",
     "PGM",
     "AcceleratedPGM",
+    "SubsetPGM",
+    "SVRG",
 ]
 
 # Imported items in __all__ appear to originate in top-level linop module
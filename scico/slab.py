@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2022 by SCICO Developers
+# All rights reserved. BSD 3-clause License.
+# This file is part of the SCICO package. Details of the copyright and
+# user license can be found in the 'LICENSE' file distributed with the
+# package.
+
+"""Slab-wise streaming reconstruction of large volumes.
+
+Support for reconstruction of volumes that are too large to be
+reconstructed in a single solve, for imaging problems, such as 3D
+parallel beam tomography, in which the forward model acts independently
+on each slice of the volume. The measurements are read from, and the
+reconstruction written to, array-like stores, e.g. :class:`numpy.memmap`
+arrays (see :func:`numpy.lib.format.open_memmap`), HDF5 datasets, or
+zarr arrays, one slab of slices at a time, so that only a few slabs
+are held in memory at once.
+"""
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+import jax
+
+from scico.typing import JaxArray
+
+
+class Slab(NamedTuple):
+    """Slice ranges for reconstruction of a single slab.
+
+    A slab is reconstructed from the slices in range `read`, which
+    include halo slices on either side of the slices in range `write`,
+    when available. The slices of the reconstruction in range `write`
+    are obtained by indexing the reconstruction of the full range `read`
+    with `crop`.
+    """
+
+    read: slice
+    write: slice
+    crop: slice
+
+
+def slab_partition(num_slices: int, slab_size: int, halo: int = 0) -> List[Slab]:
+    """Partition a range of slices into slabs.
+
+    Partition the slice indices :code:`range(num_slices)` into
+    consecutive slabs of `slab_size` slices (the final slab may be
+    smaller), each of which is reconstructed from a window including
+    `halo` additional slices on either side. Windows that would extend
+    beyond the ends of the range are shifted to lie within it, so that
+    all windows have the same size, and a jit-compiled reconstruction
+    function is only compiled once.
+
+    Args:
+        num_slices: Number of slices.
+        slab_size: Number of slices written per slab. When the store
+            is chunked along the slice axis, this should be a multiple
+            of the chunk size to avoid partial chunk writes.
+        halo: Number of additional slices on either side of each slab
+            included in its reconstruction, e.g. to avoid boundary
+            artifacts from a regularizer coupling neighboring slices.
+
+    Returns:
+        List of slabs.
+    """
+    if slab_size < 1:
+        raise ValueError(f"Parameter slab_size must be positive; got {slab_size}.")
+    if halo < 0:
+        raise ValueError(f"Parameter halo must be non-negative; got {halo}.")
+    window = min(slab_size + 2 * halo, num_slices)
+    slabs = []
+    for start in range(0, num_slices, slab_size):
+        stop = min(start + slab_size, num_slices)
+        read_start = min(max(start - halo, 0), num_slices - window)
+        slabs.append(
+            Slab(
+                read=slice(read_start, read_start + window),
+                write=slice(start, stop),
+                crop=slice(start - read_start, stop - read_start),
+            )
+        )
+    return slabs
+
+
+def _index(ndim: int, axis: int, slc: slice) -> Tuple:
+    """Construct an index selecting `slc` along axis `axis`."""
+    return (slice(None),) * (axis % ndim) + (slc,)
+
+
+def reconstruct_slabs(
+    y: Any,
+    x: Any,
+    reconstruct: Callable[[JaxArray], JaxArray],
+    slab_size: int,
+    halo: int = 0,
+    y_axis: int = 0,
+    x_axis: int = 0,
+    prefetch: int = 2,
+):
+    r"""Reconstruct a volume slab by slab.
+
+    Reconstruct a volume from measurements of its slices, e.g. a
+    sinogram, stored in array-like object `y`, writing the
+    reconstruction to array-like object `x` one slab at a time (see
+    :func:`slab_partition`). The slabs of `y` are read by a background
+    thread, which reads up to `prefetch` slabs ahead of the slab being
+    reconstructed, and the reconstructed slabs are written by another
+    background thread, so that I/O is overlapped with computation.
+
+    The reconstruction is performed by `reconstruct`, which maps a slab
+    of measurements to a slab of the volume, e.g.
+
+    ::
+
+        def reconstruct(y_slab):
+            A = TomographicProjector(
+                (y_slab.shape[0], N, N), 1.0, N, angles
+            )
+            f = loss.SquaredL2Loss(y=y_slab, A=A)
+            C = linop.FiniteDifference((y_slab.shape[0], N, N))
+            solver = ADMM(f=f, g_list=[λ * functional.L21Norm()],
+                          C_list=[C], rho_list=[ρ], x0=A.fbp(y_slab),
+                          maxiter=20)
+            return solver.solve()
+
+    for a projector from :mod:`scico.linop.radon_jax`, for which the
+    measurement and volume slice axes are both zero.
+
+    Args:
+        y: Array-like store of measurements, supporting :code:`shape`
+            and indexing with slices, e.g. a :class:`numpy.memmap`
+            array, HDF5 dataset, or zarr array.
+        x: Writable array-like store for the reconstruction.
+        reconstruct: Function mapping a slab of `y` to the
+            corresponding slab of the reconstruction.
+        slab_size: Number of slices written per slab.
+        halo: Number of additional slices on either side of each slab
+            included in its reconstruction.
+        y_axis: Slice axis of `y`. For example, the slice axis of a
+            sinogram for :class:`.radon_svmbir.TomographicProjector` is
+            axis 1.
+        x_axis: Slice axis of `x`.
+        prefetch: Maximum number of slabs of `y` read ahead of the slab
+            being reconstructed.
+    """
+    num_slices = y.shape[y_axis]
+    if x.shape[x_axis] != num_slices:
+        raise ValueError(
+            f"Number of slices of x ({x.shape[x_axis]}) and y ({num_slices}) must be equal."
+        )
+    if prefetch < 1:
+        raise ValueError(f"Parameter prefetch must be positive; got {prefetch}.")
+    slabs = slab_partition(num_slices, slab_size, halo)
+
+    def read(slab: Slab) -> np.ndarray:
+        return np.asarray(y[_index(len(y.shape), y_axis, slab.read)])
+
+    def write(slab: Slab, x_slab: np.ndarray):
+        x[_index(len(x.shape), x_axis, slab.write)] = x_slab
+
+    with ThreadPoolExecutor(max_workers=1) as reader, ThreadPoolExecutor(max_workers=1) as writer:
+        pending: Deque[Future] = deque(reader.submit(read, slab) for slab in slabs[:prefetch])
+        written: Optional[Future] = None
+        for k, slab in enumerate(slabs):
+            y_slab = jax.device_put(pending.popleft().result())
+            if k + prefetch < len(slabs):
+                pending.append(reader.submit(read, slabs[k + prefetch]))
+            x_slab = np.asarray(reconstruct(y_slab)[_index(len(x.shape), x_axis, slab.crop)])
+            if written is not None:
+                written.result()  # at most one slab waiting to be written
+            written = writer.submit(write, slab, x_slab)
+        if written is not None:
+            written.result()
+    if hasattr(x, "flush"):
+        x.flush()
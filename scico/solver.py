@@ -57,13 +57,14 @@ In the future, this module may be replaced with a dependency on
 """
 
 
-from functools import wraps
+from functools import lru_cache, partial, wraps
 from typing import Any, Callable, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
 import jax
 import jax.experimental.host_callback as hcb
+from jax.flatten_util import ravel_pytree
 
 import scico.linop
 import scico.numpy as snp
@@ -294,6 +295,160 @@ def minimize_scalar(
     return res
 
 
+def _identity(x: Union[JaxArray, BlockArray]) -> Union[JaxArray, BlockArray]:
+    """Identity function, used as the default CG preconditioner."""
+    return x
+
+
+def _cg_init(
+    A: Callable, M: Callable, b: Union[JaxArray, BlockArray], x0: Union[JaxArray, BlockArray]
+) -> Tuple:
+    r"""Compute the initial state of the conjugate gradient iterations.
+
+    Args:
+        A: Callable implementing linear operator :math:`A`.
+        M: Preconditioner for `A`.
+        b: Input array :math:`\mb{b}`.
+        x0: Initial solution.
+
+    Returns:
+        Tuple consisting of the initial solution, residual, search
+        direction, squared preconditioned residual norm, and the norm
+        of `b`.
+    """
+    Ax = A(x0)
+    bn = snp.linalg.norm(b)
+    r = b - Ax
+    # ensure that solution dtype is consistent with the residual dtype
+    x0 = jax.tree_util.tree_map(lambda x, r: x.astype(snp.result_type(x, r)), x0, r)
+    z = M(r)
+    p = z
+    num = snp.sum(r.conj() * z)
+    return x0, r, p, num, bn
+
+
+def _cg_update(A: Callable, M: Callable, state: Tuple) -> Tuple:
+    """Perform a single conjugate gradient iteration.
+
+    Args:
+        A: Callable implementing linear operator :math:`A`.
+        M: Preconditioner for `A`.
+        state: Tuple consisting of the current solution, residual,
+            search direction, and squared preconditioned residual norm.
+
+    Returns:
+        Updated state tuple.
+    """
+    x, r, p, num = state
+    Ap = A(p)
+    alpha = num / snp.sum(p.conj() * Ap)
+    x = x + alpha * p
+    r = r - alpha * Ap
+    z = M(r)
+    num_old = num
+    num = snp.sum(r.conj() * z)
+    beta = num / num_old
+    p = z + beta * p
+    return x, r, p, num
+
+
+@jax.jit
+def _cg_device(
+    A: jax.tree_util.Partial,
+    M: jax.tree_util.Partial,
+    b: Union[JaxArray, BlockArray],
+    x0: Union[JaxArray, BlockArray],
+    tol: float,
+    atol: float,
+    maxiter: int,
+) -> Tuple[Union[JaxArray, BlockArray], JaxArray, JaxArray]:
+    r"""Conjugate gradient iterations within a :func:`jax.lax.while_loop`.
+
+    Args:
+        A: Linear operator :math:`A`, represented as a pytree by
+           :func:`_as_pytree`.
+        M: Preconditioner for `A`, represented as a pytree by
+           :func:`_as_pytree`.
+        b: Input array :math:`\mb{b}`.
+        x0: Initial solution.
+        tol: Relative residual stopping tolerance.
+        atol: Absolute residual stopping tolerance.
+        maxiter: Maximum iterations.
+
+    Returns:
+        Tuple consisting of the solution, the number of iterations, and
+        the relative residual.
+    """
+    x, r, p, num, bn = _cg_init(A, M, b, x0)
+    # termination tolerance (uses the "non-legacy" form of scicpy.sparse.linalg.cg)
+    termination_tol_sq = snp.maximum(tol * bn, atol) ** 2
+
+    def cond(carry):
+        ii, _, _, _, num = carry
+        return (ii < maxiter) & (snp.real(num) > termination_tol_sq)
+
+    def body(carry):
+        ii, *state = carry
+        return (ii + 1,) + _cg_update(A, M, tuple(state))
+
+    ii, x, _, _, num = jax.lax.while_loop(cond, body, (snp.array(0), x, r, p, num))
+    return x, ii, snp.sqrt(num).real / bn
+
+
+def _cg_host(
+    A: Callable,
+    M: Callable,
+    b: Union[JaxArray, BlockArray],
+    x0: Union[JaxArray, BlockArray],
+    tol: float,
+    atol: float,
+    maxiter: int,
+) -> Tuple[Union[JaxArray, BlockArray], int, JaxArray]:
+    """Conjugate gradient iterations within a Python loop.
+
+    Used when `A` or `M` cannot be traced by :func:`jax.jit`, e.g. when
+    they are implemented using NumPy. Parameters and return values are
+    the same as for :func:`_cg_device`.
+    """
+    x, r, p, num, bn = _cg_init(A, M, b, x0)
+    termination_tol_sq = snp.maximum(tol * bn, atol) ** 2
+    ii = 0
+    while (ii < maxiter) and (snp.real(num) > termination_tol_sq):
+        x, r, p, num = _cg_update(A, M, (x, r, p, num))
+        ii += 1
+    return x, ii, snp.sqrt(num).real / bn
+
+
+def _is_hashable(obj: Any) -> bool:
+    """Determine whether `obj` is hashable."""
+    try:
+        hash(obj)
+    except TypeError:
+        return False
+    return True
+
+
+def _as_pytree(f: Callable) -> jax.tree_util.Partial:
+    """Represent a callable as a pytree.
+
+    The arguments bound by a :class:`jax.tree_util.Partial` are pytree
+    leaves, so that when it is passed to a jitted function, a change in
+    their values does not require recompilation. Any other callable is
+    wrapped in a :class:`jax.tree_util.Partial` without arguments, so
+    that it is treated as static, and compilation is cached by its
+    hash.
+
+    Args:
+        f: Callable to be represented as a pytree.
+
+    Returns:
+        Callable `f` as a :class:`jax.tree_util.Partial`.
+    """
+    if isinstance(f, jax.tree_util.Partial):
+        return f
+    return jax.tree_util.Partial(f)
+
+
 def cg(
     A: Callable,
     b: JaxArray,
@@ -304,12 +459,35 @@ def cg(
     maxiter: int = 1000,
     info: bool = True,
     M: Optional[Callable] = None,
+    jit: bool = True,
 ) -> Tuple[JaxArray, dict]:
     r"""Conjugate Gradient solver.
 
     Solve the linear system :math:`A\mb{x} = \mb{b}`, where :math:`A` is
     positive definite, via the conjugate gradient method.
 
+    The iterations are performed within a :func:`jax.lax.while_loop`,
+    so that the termination test does not require a device to host
+    transfer at each iteration, and this function can be called within
+    functions transformed by :func:`jax.jit` and :func:`jax.vmap`.
+
+    Unless `A` or `M` is a :class:`jax.tree_util.Partial`, it is a
+    static argument of the compiled loop, which is compiled once for
+    each distinct pair of `A` and `M` objects, which remain referenced
+    by the compilation cache. When solving multiple systems with the
+    same operator, the same operator object should be used for each
+    solve, rather than constructing a new one, e.g. :code:`A.T @ A + I`,
+    for each solve, which would incur compilation on every call. An
+    operator that depends on parameters that change between solves
+    should be passed as a :class:`jax.tree_util.Partial` of a fixed
+    function with the parameters as array arguments, which are traced
+    rather than static. If `A` or `M` is not hashable, or cannot be traced
+    by :func:`jax.jit` (e.g. if it is implemented using NumPy), or if
+    `jit` is ``False``, the iterations are performed within a Python
+    loop instead. In the second of these cases, the failed attempt to
+    trace `A` or `M` is repeated on every call, which can be avoided by
+    setting `jit` to ``False``.
+
     Args:
         A: Callable implementing linear operator :math:`A`, which should
            be positive definite.
@@ -328,6 +506,8 @@ def cg(
         M: Preconditioner for `A`. The preconditioner should approximate
            the inverse of `A`. The default, ``None``, uses no
            preconditioner.
+        jit: If ``True``, attempt to perform the iterations within a
+           compiled loop, otherwise perform them within a Python loop.
 
     Returns:
         tuple: A tuple (x, info) containing:
@@ -342,36 +522,448 @@ def cg(
             raise ValueError("Parameter x0 must be specified if A is not a LinearOperator")
 
     if M is None:
-        M = lambda x: x
+        M = _identity
+
+    A = _as_pytree(A)
+    M = _as_pytree(M)
+    b = jax.tree_util.tree_map(snp.asarray, b)
+    x0 = jax.tree_util.tree_map(snp.asarray, x0)
+    if jit and _is_hashable(A.func) and _is_hashable(M.func):
+        try:
+            x, ii, rel_res = _cg_device(A, M, b, x0, tol, atol, maxiter)
+        except (jax.errors.ConcretizationTypeError, jax.errors.TracerArrayConversionError):
+            # A or M cannot be traced
+            x, ii, rel_res = _cg_host(A, M, b, x0, tol, atol, maxiter)
+    else:
+        x, ii, rel_res = _cg_host(A, M, b, x0, tol, atol, maxiter)
 
-    x = x0
-    Ax = A(x0)
-    bn = snp.linalg.norm(b)
-    r = b - Ax
-    z = M(r)
+    if info:
+        return (x, {"num_iter": ii, "rel_res": rel_res})
+    else:
+        return x
+
+
+def _ritz_basis(Z: JaxArray, AZ: JaxArray, nvec: int) -> Tuple[JaxArray, JaxArray]:
+    """Compute Ritz vectors for the smallest Ritz values in a subspace.
+
+    Apply the Rayleigh-Ritz procedure to the subspace spanned by the
+    rows of `Z`, given the corresponding rows `AZ` of the operator
+    applied to them, so that no additional operator applications are
+    required. Rows of `Z` that are zero or linearly dependent are
+    discarded; if there are fewer than `nvec` remaining independent
+    rows, the additional returned vectors are zero.
+
+    Args:
+        Z: Array with rows spanning the subspace.
+        AZ: Array with rows consisting of the operator applied to the
+            rows of `Z`.
+        nvec: Number of Ritz vectors to compute.
+
+    Returns:
+        Tuple of arrays with rows consisting of the Ritz vectors and the
+        operator applied to the Ritz vectors.
+    """
+    F = Z.conj() @ Z.T
+    s, V = snp.linalg.eigh((F + F.conj().T) / 2)
+    keep = s > 1e2 * snp.finfo(s.dtype).eps * s[-1]
+    T = V * snp.where(keep, 1.0 / snp.sqrt(snp.where(keep, s, 1.0)), 0.0)
+    G = Z.conj() @ AZ.T
+    theta, Y = snp.linalg.eigh(T.conj().T @ ((G + G.conj().T) / 2) @ T)
+    # eigenvectors supported on discarded directions are spurious
+    weight = snp.sum(snp.abs(Y) ** 2 * keep[:, snp.newaxis], axis=0)
+    theta = snp.where(weight > 0.5, theta, snp.inf)
+    C = T @ Y[:, snp.argsort(theta)[:nvec]]
+    return C.T @ Z, C.T @ AZ
+
+
+@partial(jax.jit, static_argnums=(8, 9))
+def _recycled_cg_device(
+    A: jax.tree_util.Partial,
+    M: jax.tree_util.Partial,
+    b: Union[JaxArray, BlockArray],
+    x0: Union[JaxArray, BlockArray],
+    basis: Optional[Tuple[JaxArray, JaxArray]],
+    tol: float,
+    atol: float,
+    maxiter: int,
+    nvec: int,
+    nstore: int,
+) -> Tuple[Union[JaxArray, BlockArray], Tuple[JaxArray, JaxArray], JaxArray, JaxArray]:
+    r"""Deflated conjugate gradient iterations with basis recycling.
+
+    Args:
+        A: Linear operator :math:`A`, represented as a pytree by
+           :func:`_as_pytree`.
+        M: Preconditioner for `A`, represented as a pytree by
+           :func:`_as_pytree`.
+        b: Input array :math:`\mb{b}`.
+        x0: Initial solution.
+        basis: Deflation basis or ``None``.
+        tol: Relative residual stopping tolerance.
+        atol: Absolute residual stopping tolerance.
+        maxiter: Maximum iterations.
+        nvec: Number of basis vectors.
+        nstore: Number of search directions stored for updating the
+            basis.
+
+    Returns:
+        Tuple consisting of the solution, the updated basis, the number
+        of iterations, and the relative residual.
+    """
+    bf, unravel = ravel_pytree(b)
+    x = ravel_pytree(x0)[0]
+    dtype = snp.result_type(x, bf)
+    x = x.astype(dtype)
+    Af = lambda v: ravel_pytree(A(unravel(v)))[0].astype(dtype)
+    Mf = lambda v: ravel_pytree(M(unravel(v)))[0].astype(dtype)
+
+    bn = snp.linalg.norm(bf)
+    r = bf - Af(x)
+    if basis is None:
+        precond = Mf
+    else:
+        W, AW = basis
+        E = W.conj() @ AW.T
+        E = (E + E.conj().T) / 2
+        # regularization handles zero basis vectors
+        E = E + (
+            snp.finfo(bn.dtype).eps * snp.real(snp.trace(E)) + snp.finfo(bn.dtype).tiny
+        ) * snp.eye(W.shape[0], dtype=E.dtype)
+        Einv = lambda v: snp.linalg.solve(E, v)
+        # initial solution correction x + Q r, where Q = W E^{-1} W^H
+        c = Einv(W.conj() @ r)
+        x = x + W.T @ c
+        r = r - AW.T @ c
+
+        def precond(v):
+            # balancing preconditioner (I - Q A) M (I - A Q) + Q
+            y = Mf(v - AW.T @ Einv(W.conj() @ v))
+            return y + W.T @ Einv(W.conj() @ v - AW.conj() @ y)
+
+    z = precond(r)
     p = z
     num = snp.sum(r.conj() * z)
-    ii = 0
-
-    # termination tolerance (uses the "non-legacy" form of scicpy.sparse.linalg.cg)
+    P = snp.zeros((nstore, x.size), dtype=dtype)
+    AP = snp.zeros((nstore, x.size), dtype=dtype)
     termination_tol_sq = snp.maximum(tol * bn, atol) ** 2
 
-    while (ii < maxiter) and (num > termination_tol_sq):
-        Ap = A(p)
+    def cond(carry):
+        ii, _, _, _, num, _, _ = carry
+        return (ii < maxiter) & (snp.real(num) > termination_tol_sq)
+
+    def body(carry):
+        ii, x, r, p, num, P, AP = carry
+        Ap = Af(p)
+        # store normalized initial search directions for updating the basis
+        pn = snp.linalg.norm(p)
+        store = (ii < nstore) & (pn > 0)
+        idx = snp.minimum(ii, nstore - 1)
+        P = snp.where(store, P.at[idx].set(p / snp.where(store, pn, 1.0)), P)
+        AP = snp.where(store, AP.at[idx].set(Ap / snp.where(store, pn, 1.0)), AP)
         alpha = num / snp.sum(p.conj() * Ap)
         x = x + alpha * p
         r = r - alpha * Ap
-        z = M(r)
+        z = precond(r)
         num_old = num
         num = snp.sum(r.conj() * z)
         beta = num / num_old
         p = z + beta * p
-        ii += 1
+        return ii + 1, x, r, p, num, P, AP
 
-    if info:
-        return (x, {"num_iter": ii, "rel_res": snp.sqrt(num).real / bn})
+    ii, x, _, _, num, P, AP = jax.lax.while_loop(cond, body, (snp.array(0), x, r, p, num, P, AP))
+    if basis is not None:
+        P = snp.concatenate((W, P))
+        AP = snp.concatenate((AW, AP))
+    basis = _ritz_basis(P, AP, nvec)
+    return unravel(x), basis, ii, snp.sqrt(num).real / bn
+
+
+def recycled_cg(
+    A: Callable,
+    b: Union[JaxArray, BlockArray],
+    x0: Optional[Union[JaxArray, BlockArray]] = None,
+    basis: Optional[Tuple[JaxArray, JaxArray]] = None,
+    *,
+    nvec: int = 4,
+    nstore: Optional[int] = None,
+    tol: float = 1e-5,
+    atol: float = 0.0,
+    maxiter: int = 1000,
+    M: Optional[Callable] = None,
+) -> Tuple[Union[JaxArray, BlockArray], Tuple[JaxArray, JaxArray], dict]:
+    r"""Deflated conjugate gradient solver with Krylov subspace recycling.
+
+    Solve the linear system :math:`A\mb{x} = \mb{b}`, where :math:`A` is
+    positive definite, via a deflated conjugate gradient method
+    :cite:`saad-2000-deflated`, in which the components of the solution
+    in the span of the columns of a deflation basis :math:`W` are
+    computed directly. When :math:`W` consists of approximate
+    eigenvectors corresponding to the smallest eigenvalues of :math:`A`,
+    the convergence rate is determined by the remaining eigenvalues,
+    which can greatly reduce the number of iterations for
+    ill-conditioned systems. The deflation is implemented via the
+    balancing preconditioner :cite:`tang-2009-comparison`
+
+    .. math::
+       (I - Q A) M (I - A Q) + Q \;, \quad \text{where} \quad
+       Q = W (W^H A W)^{-1} W^H \;,
+
+    and :math:`M` is the user-specified preconditioner, which, unlike
+    explicit projection of the search directions, remains stable in
+    single precision arithmetic when :math:`W` is only a rough
+    approximation of an invariant subspace.
+
+    This function is designed for solving a sequence of linear systems
+    with the same operator :math:`A` and slowly changing right hand
+    sides. The first `nstore` search directions of each solve, together
+    with the current basis, are used to compute an updated basis,
+    consisting of the `nvec` Ritz vectors with smallest Ritz values,
+    via the Rayleigh-Ritz procedure. Since the product of :math:`A`
+    with each vector is stored together with the basis, no additional
+    applications of :math:`A` are required. The updated basis is
+    returned for use in the next solve.
+
+    The iterations and the basis update are performed on device within
+    a single compiled function, which requires that `A` and `M` can be
+    traced by :func:`jax.jit`. As for :func:`cg`, compilation is cached
+    by the `A` and `M` objects, unless they are
+    :class:`jax.tree_util.Partial` objects. Vectors in the basis are represented as
+    flattened rows of a 2D array.
+
+    Args:
+        A: Callable implementing linear operator :math:`A`, which should
+           be positive definite.
+        b: Input array :math:`\mb{b}`.
+        x0: Initial solution. If `A` is a :class:`.LinearOperator`, this
+          parameter need not be specified, and defaults to a zero array.
+          Otherwise, it is required.
+        basis: Deflation basis returned by a previous call with the same
+          operator `A`, or ``None`` if no basis is available.
+        nvec: Number of basis vectors.
+        nstore: Number of search directions stored for updating the
+          basis. Defaults to :code:`2 * nvec`.
+        tol: Relative residual stopping tolerance. Convergence occurs
+           when `norm(residual) <= max(tol * norm(b), atol)`.
+        atol: Absolute residual stopping tolerance. Convergence occurs
+           when `norm(residual) <= max(tol * norm(b), atol)`.
+        maxiter: Maximum iterations. Default: 1000.
+        M: Preconditioner for `A`. The preconditioner should approximate
+           the inverse of `A`. The default, ``None``, uses no
+           preconditioner.
+
+    Returns:
+        tuple: A tuple (x, basis, info) containing:
+
+            - **x** : Solution array.
+            - **basis** : Tuple of arrays with rows consisting of the
+              flattened updated basis vectors and the product of
+              :math:`A` with each of them.
+            - **info**: Dictionary containing diagnostic information.
+    """
+    if x0 is None:
+        if isinstance(A, scico.linop.LinearOperator):
+            x0 = snp.zeros(A.input_shape, b.dtype)
+        else:
+            raise ValueError("Parameter x0 must be specified if A is not a LinearOperator")
+
+    if M is None:
+        M = _identity
+    if nstore is None:
+        nstore = 2 * nvec
+
+    b = jax.tree_util.tree_map(snp.asarray, b)
+    x0 = jax.tree_util.tree_map(snp.asarray, x0)
+    x, basis, ii, rel_res = _recycled_cg_device(
+        _as_pytree(A), _as_pytree(M), b, x0, basis, tol, atol, maxiter, nvec, nstore
+    )
+    return x, basis, {"num_iter": ii, "rel_res": rel_res}
+
+
+class ToleranceSchedule:
+    r"""Base class for inexact inner solve tolerance schedules.
+
+    Iterative optimization algorithms such as :class:`.ADMM` often
+    involve an inner iterative solve, e.g. of a linear system via
+    :func:`cg`, at each outer iteration. Solving these inner problems
+    to a fixed, tight tolerance wastes effort in early outer iterations,
+    when the outer iterate is far from the solution. A tolerance
+    schedule specifies the relative residual tolerance for the inner
+    solve at each outer iteration. The base class specifies a constant
+    tolerance.
+
+    Attributes:
+        tol0 (float): Initial tolerance.
+        tol_min (float): Lower bound on the tolerance.
+        uses_residual (bool): Flag indicating whether the schedule
+            depends on a measure of the outer residual.
+    """
+
+    uses_residual = False
+
+    def __init__(self, tol0: float = 1e-2, tol_min: float = 0.0):
+        """Initialize a :class:`ToleranceSchedule` object.
+
+        Args:
+            tol0: Initial tolerance.
+            tol_min: Lower bound on the tolerance.
+        """
+        self.tol0 = tol0
+        self.tol_min = tol_min
+
+    def __call__(self, k: int, residual: Optional[float] = None) -> float:
+        """Compute the tolerance for an outer iteration.
+
+        Args:
+            k: Outer iteration number.
+            residual: Measure of the outer residual, required if
+                :attr:`uses_residual` is ``True``.
+
+        Returns:
+            Inner solve tolerance.
+        """
+        return max(self.compute_tol(k, residual), self.tol_min)
+
+    def compute_tol(self, k: int, residual: Optional[float] = None) -> float:
+        """Hook for computing the tolerance in derived classes.
+
+        The base class returns the initial tolerance.
+
+        Args:
+            k: Outer iteration number.
+            residual: Measure of the outer residual.
+
+        Returns:
+            Inner solve tolerance before application of the lower bound.
+        """
+        return self.tol0
+
+
+class GeometricTolerance(ToleranceSchedule):
+    r"""Geometrically decaying tolerance schedule.
+
+    The tolerance at outer iteration :math:`k` is
+    :math:`\max(\epsilon_0 \gamma^k, \epsilon_{\text{min}})`.
+    """
+
+    def __init__(self, tol0: float = 1e-2, factor: float = 0.8, tol_min: float = 1e-6):
+        r"""Initialize a :class:`GeometricTolerance` object.
+
+        Args:
+            tol0: Initial tolerance :math:`\epsilon_0`.
+            factor: Decay factor :math:`\gamma`, which must be in the
+                interval :math:`(0, 1]`.
+            tol_min: Lower bound :math:`\epsilon_{\text{min}}` on the
+                tolerance.
+        """
+        if not 0.0 < factor <= 1.0:
+            raise ValueError(f"Parameter factor must be in the interval (0, 1]; got {factor}.")
+        super().__init__(tol0=tol0, tol_min=tol_min)
+        self.factor = factor
+
+    def compute_tol(self, k: int, residual: Optional[float] = None) -> float:
+        return self.tol0 * self.factor**k
+
+
+class ResidualTolerance(ToleranceSchedule):
+    r"""Tolerance schedule tied to the outer residual.
+
+    The tolerance at outer iteration :math:`k > 0` is
+    :math:`\max(\min(\epsilon_0, \eta r^{(k)}),
+    \epsilon_{\text{min}})`, where :math:`r^{(k)}` is a relative measure
+    of the outer residual provided by the calling algorithm. This
+    ensures that the inner solve error decreases in proportion to the
+    progress of the outer iterations. The tolerance at iteration 0,
+    at which the outer residual is usually not meaningful, is
+    :math:`\epsilon_0`.
+    """
+
+    uses_residual = True
+
+    def __init__(self, eta: float = 1e-2, tol0: float = 1e-2, tol_min: float = 1e-6):
+        r"""Initialize a :class:`ResidualTolerance` object.
+
+        Args:
+            eta: Ratio :math:`\eta` of inner tolerance to outer
+                residual.
+            tol0: Initial and maximum tolerance :math:`\epsilon_0`.
+            tol_min: Lower bound :math:`\epsilon_{\text{min}}` on the
+                tolerance.
+        """
+        super().__init__(tol0=tol0, tol_min=tol_min)
+        self.eta = eta
+
+    def compute_tol(self, k: int, residual: Optional[float] = None) -> float:
+        if k == 0 or residual is None:
+            return self.tol0
+        return min(self.tol0, self.eta * residual)
+
+
+class SummableTolerance(ToleranceSchedule):
+    r"""Summable tolerance schedule.
+
+    The tolerance at outer iteration :math:`k` is
+    :math:`\max(\epsilon_0 / (k + 1)^p, \epsilon_{\text{min}})`. When
+    :math:`\epsilon_{\text{min}} = 0`, the tolerances form a summable
+    sequence for :math:`p > 1`, so that the convergence guarantees of
+    ADMM with inexact subproblem solutions apply
+    :cite:`eckstein-1992-douglas`.
+    """
+
+    def __init__(self, tol0: float = 1e-2, power: float = 2.0, tol_min: float = 0.0):
+        r"""Initialize a :class:`SummableTolerance` object.
+
+        Args:
+            tol0: Initial tolerance :math:`\epsilon_0`.
+            power: Exponent :math:`p`, which must be greater than 1.
+            tol_min: Lower bound :math:`\epsilon_{\text{min}}` on the
+                tolerance.
+        """
+        if power <= 1.0:
+            raise ValueError(f"Parameter power must be greater than 1; got {power}.")
+        super().__init__(tol0=tol0, tol_min=tol_min)
+        self.power = power
+
+    def compute_tol(self, k: int, residual: Optional[float] = None) -> float:
+        return self.tol0 / (k + 1) ** self.power
+
+
+@lru_cache(maxsize=16)
+def _lstsq_operators(
+    A: Callable,
+    input_shape: Union[Shape, BlockShape],
+    output_shape: Union[Shape, BlockShape],
+    dtype: DType,
+) -> Tuple[scico.linop.LinearOperator, scico.linop.LinearOperator]:
+    """Construct the operators of the normal equations for :func:`lstsq`.
+
+    The operators are cached so that repeated calls of :func:`lstsq`
+    with the same `A` pass the same operator to :func:`cg`, and
+    therefore do not require recompilation.
+
+    Args:
+        A: Callable implementing linear operator :math:`A`.
+        input_shape: Shape of input of `A`.
+        output_shape: Shape of output of `A`.
+        dtype: `dtype` of input and output of `A`.
+
+    Returns:
+        Tuple consisting of `A` as a :class:`.LinearOperator` and the
+        operator :math:`A^T A`.
+    """
+    if isinstance(A, scico.linop.LinearOperator):
+        Aop = A
     else:
-        return x
+        Aop = scico.linop.LinearOperator(
+            input_shape=input_shape,
+            output_shape=output_shape,
+            eval_fn=A,
+            input_dtype=dtype,
+            output_dtype=dtype,
+        )
+    # for a real operator, the Gram operator is equivalent to Aop.T @ Aop, and
+    # may have a more efficient implementation
+    ATA = Aop.T @ Aop if snp.util.is_complex_dtype(Aop.input_dtype) else Aop.gram_op
+    return Aop, ATA
 
 
 def lstsq(
@@ -419,18 +1011,14 @@ def lstsq(
             - **info**: Dictionary containing diagnostic information.
     """
     if isinstance(A, scico.linop.LinearOperator):
-        Aop = A
+        key = (A, A.input_shape, A.output_shape, A.input_dtype)
     else:
         assert x0 is not None
-        Aop = scico.linop.LinearOperator(
-            input_shape=x0.shape,
-            output_shape=b.shape,
-            eval_fn=A,
-            input_dtype=b.dtype,
-            output_dtype=b.dtype,
-        )
-
-    ATA = Aop.T @ Aop
+        key = (A, x0.shape, b.shape, b.dtype)
+    if _is_hashable(key):
+        Aop, ATA = _lstsq_operators(*key)
+    else:
+        Aop, ATA = _lstsq_operators.__wrapped__(*key)
     ATb = Aop.T @ b
     return cg(ATA, ATb, x0=x0, tol=tol, atol=atol, maxiter=maxiter, info=info, M=M)
 
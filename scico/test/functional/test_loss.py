@@ -10,7 +10,7 @@ config.update("jax_enable_x64", True)
 from prox import prox_test
 
 import scico.numpy as snp
-from scico import functional, linop, loss
+from scico import functional, linop, loss, solver
 from scico.numpy.util import complex_dtype
 from scico.random import randn, uniform
 
@@ -102,6 +102,45 @@ class TestLoss:
         )
         pf = prox_test(self.v, L_d, L_d.prox, 0.75)
 
+    def test_squared_l2_prox_schedule(self):
+        L = loss.SquaredL2Loss(
+            y=self.y, A=self.Ao, prox_kwargs={"tol": solver.GeometricTolerance(1e-2, 0.1, 1e-8)}
+        )
+        x0 = L.prox(self.v, 0.75)
+        assert L.prox_count == 1
+        assert L.prox_info["tol"] == 1e-2
+        x1 = L.prox(self.v, 0.75)
+        assert L.prox_count == 2
+        assert L.prox_info["tol"] == pytest.approx(1e-3)
+        assert L.prox_info["rel_res"] <= 1e-3
+        L = loss.SquaredL2Loss(y=self.y, A=self.Ao, prox_kwargs={"tol": 1e-10})
+        x = L.prox(self.v, 0.75)
+        assert snp.linalg.norm(x1 - x) < snp.linalg.norm(x0 - x) + 1e-12
+        L = loss.SquaredL2Loss(
+            y=self.y, A=self.Ao, prox_kwargs={"tol": solver.ResidualTolerance(tol0=1e-2)}
+        )
+        L.prox(self.v, 0.75)
+        L.prox(self.v, 0.75)
+        assert L.prox_info["tol"] == L.prox_kwargs["tol"].tol_min
+
+    def test_squared_l2_prox_numpy(self):
+        # operator that cannot be traced by jax.jit
+        M = np.asarray(self.Ao.A)
+        A = linop.LinearOperator(
+            input_shape=M.shape[1:],
+            output_shape=M.shape[:1],
+            eval_fn=lambda x: M @ np.asarray(x),
+            adj_fn=lambda x: M.T @ np.asarray(x),
+            input_dtype=M.dtype,
+        )
+        L = loss.SquaredL2Loss(y=self.y, A=A, prox_kwargs={"tol": 1e-10})
+        L_ref = loss.SquaredL2Loss(y=self.y, A=self.Ao, prox_kwargs={"tol": 1e-10})
+        np.testing.assert_allclose(L.prox(self.v, 0.75), L_ref.prox(self.v, 0.75), rtol=1e-6)
+        # the solve reflects modification of the forward operator
+        L_ref.A = self.Ao_abs
+        L = loss.SquaredL2Loss(y=self.y, A=self.Ao_abs, prox_kwargs={"tol": 1e-10})
+        np.testing.assert_allclose(L.prox(self.v, 0.75), L_ref.prox(self.v, 0.75), rtol=1e-6)
+
     def test_poisson(self):
         L = loss.PoissonLoss(y=self.y, A=self.Ao_abs)
         assert L.has_eval
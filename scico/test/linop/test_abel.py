@@ -64,3 +64,10 @@ def test_adjoint_grad(Nx, Ny):
     Ax = A @ x
     f = lambda y: jax.numpy.linalg.norm(A.T(y)) ** 2
     np.testing.assert_allclose(jax.grad(f)(Ax), 2 * A(A.adj(Ax)), rtol=5e-5)
+
+
+@pytest.mark.parametrize("Nx, Ny", (BIG_INPUT, SMALL_INPUT, (6, 8)))
+def test_gram(Nx, Ny):
+    x = make_im(Nx, Ny)
+    A = AbelProjector(x.shape)
+    np.testing.assert_allclose(A.gram(x), A.adj(A(x)), rtol=5e-5, atol=1e-5)
@@ -160,6 +160,20 @@ class TestCircularConvolve:
 
         np.testing.assert_allclose(A @ x, B @ x, atol=1e-5)
 
+    @pytest.mark.parametrize("input_dtype", [np.float32, np.complex64])
+    @pytest.mark.parametrize("axes_shape_spec", SHAPE_SPECS)
+    def test_gram(self, axes_shape_spec, input_dtype):
+        x_shape, ndims, h_shape = axes_shape_spec
+
+        h, key = randn(tuple(h_shape), dtype=input_dtype, key=self.key)
+        x, key = randn(tuple(x_shape), dtype=input_dtype, key=key)
+
+        A = CircularConvolve(h, x_shape, ndims, input_dtype)
+        G = A.gram_op
+        assert isinstance(G, CircularConvolve)
+        np.testing.assert_allclose(A.gram(x), A.adj(A(x)), atol=1e-4)
+        np.testing.assert_allclose(G @ x, A.adj(A(x)), atol=1e-4)
+
     def test_from_operator_block_array(self):
         """`from_operator` should throw an exception if asked to work
         on an operator with blockarray inputs."""
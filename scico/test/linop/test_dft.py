@@ -51,6 +51,11 @@ class TestDFT:
         # Test adjoint
         adjoint_test(F, self.key)
 
+        # Test gram
+        FHFx = F.adj(Fx)
+        np.testing.assert_allclose(F.gram(x), FHFx, rtol=1e-5, atol=1e-5 * np.abs(FHFx).max())
+        np.testing.assert_allclose(F.gram_op @ x, FHFx, rtol=1e-5, atol=1e-5 * np.abs(FHFx).max())
+
         # Test inverse
         y, self.key = randn(F.output_shape, dtype=np.complex64, key=self.key)
         Fiy = F.inv(y)
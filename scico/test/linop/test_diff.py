@@ -105,3 +105,31 @@ def test_eval_circular(shape_axes, input_dtype, jit):
             atol=1e-5,
             rtol=0,
         )
+
+
+@pytest.mark.parametrize(
+    "boundary",
+    [
+        dict(circular=True),
+        dict(),
+        dict(prepend=0),
+        dict(prepend=1),
+        dict(append=0),
+        dict(append=1),
+        dict(prepend=1, append=1),
+    ],
+)
+@pytest.mark.parametrize("input_dtype", [np.float32, np.complex64])
+def test_gram(boundary, input_dtype):
+    input_shape = (6, 7)
+    x, _ = randn(input_shape, dtype=input_dtype)
+    A = SingleAxisFiniteDifference(input_shape, input_dtype=input_dtype, axis=1, **boundary)
+    np.testing.assert_allclose(A.gram(x), A.adj(A(x)), atol=1e-5, rtol=0)
+    # matrix of the gram operator for a single row
+    D = SingleAxisFiniteDifference((7,), **boundary)
+    M = np.stack([D(e) for e in np.eye(7, dtype=np.float32)], axis=1)
+    G = np.stack([D.gram(e) for e in np.eye(7, dtype=np.float32)], axis=1)
+    np.testing.assert_allclose(G, M.T @ M, atol=1e-6)
+    if boundary.get("circular"):
+        A = FiniteDifference(input_shape, input_dtype=input_dtype, circular=True)
+        np.testing.assert_allclose(A.gram(x), A.adj(A(x)), atol=1e-5, rtol=0)
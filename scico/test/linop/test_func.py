@@ -64,6 +64,17 @@ def test_crop_pad_adjoint(pad):
     assert linop.valid_adjoint(H, G, eps=1e-6)
 
 
+@pytest.mark.parametrize("pad", [1, (1, 2), ((1, 0), (0, 1))])
+def test_crop_gram(pad):
+    shape = (9, 10)
+    x, _ = randn(shape)
+    H = linop.Crop(pad, shape)
+    G = H.gram_op
+    assert isinstance(G, linop.Diagonal)
+    np.testing.assert_allclose(H.gram(x), H.adj(H(x)))
+    np.testing.assert_allclose(G @ x, H.adj(H(x)))
+
+
 class SliceTestObj:
     def __init__(self, dtype):
         self.x = snp.zeros((4, 5, 6, 7), dtype=dtype)
@@ -98,6 +109,16 @@ def test_slice_adj(slicetestobj, idx):
     adjoint_test(A)
 
 
+@pytest.mark.parametrize("idx", slice_examples)
+def test_slice_gram(idx):
+    x, _ = randn((4, 5, 6, 7))
+    A = linop.Slice(idx=idx, input_shape=x.shape)
+    G = A.gram_op
+    assert isinstance(G, linop.Diagonal)
+    np.testing.assert_allclose(A.gram(x), A.adj(A(x)))
+    np.testing.assert_allclose(G @ x, A.adj(A(x)))
+
+
 block_slice_examples = [
     1,
     np.s_[0:1],
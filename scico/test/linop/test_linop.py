@@ -352,6 +352,26 @@ class TestDiagonal:
 
         adjoint_test(D)
 
+    @pytest.mark.parametrize("diagonal_dtype", [np.float32, np.complex64])
+    @pytest.mark.parametrize("input_shape", [(8,), (8, 12)])
+    def test_gram(self, input_shape, diagonal_dtype):
+        diagonal, key = randn(input_shape, dtype=diagonal_dtype, key=self.key)
+        x, key = randn(input_shape, dtype=diagonal_dtype, key=key)
+        D = linop.Diagonal(diagonal=diagonal)
+        G = D.gram_op
+        assert isinstance(G, linop.Diagonal)
+        np.testing.assert_allclose(G.diagonal, np.abs(diagonal) ** 2, rtol=1e-5)
+        np.testing.assert_allclose(D.gram(x), D.adj(D(x)), rtol=1e-5)
+
+        # broadcast diagonal
+        D = linop.Diagonal(diagonal=diagonal, input_shape=(3,) + input_shape)
+        x, key = randn(D.input_shape, dtype=diagonal_dtype, key=key)
+        np.testing.assert_allclose(D.gram(x), D.adj(D(x)), rtol=1e-5)
+        np.testing.assert_allclose(D.gram_op @ x, D.adj(D(x)), rtol=1e-5)
+
+        I = linop.Identity(input_shape)
+        assert I.gram_op is I
+
     @pytest.mark.parametrize("operator", [op.add, op.sub])
     @pytest.mark.parametrize("diagonal_dtype", [np.float32, np.complex64])
     @pytest.mark.parametrize("input_shape1", input_shapes)
@@ -444,3 +464,14 @@ def test_jit_adj_lazy():
     a = Ao.adj(y)
     b = A.T @ y
     np.testing.assert_allclose(a, b, rtol=1e-5)
+
+
+def test_gram_fn():
+    A = linop.LinearOperator(
+        input_shape=(4,), eval_fn=lambda x: 2 * x, gram_fn=lambda x: 4 * x, jit=True
+    )
+    x = snp.arange(4, dtype=np.float32)
+    np.testing.assert_allclose(A.gram(x), A.adj(A(x)))
+    np.testing.assert_allclose(A.gram_op @ x, A.adj(A(x)))
+    with pytest.raises(TypeError):
+        linop.LinearOperator(input_shape=(4,), eval_fn=lambda x: 2 * x, gram_fn=4)
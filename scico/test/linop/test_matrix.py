@@ -1,4 +1,6 @@
 import operator as op
+import os
+import tempfile
 
 import numpy as np
 
@@ -8,10 +10,10 @@ from jax.interpreters.xla import DeviceArray
 import pytest
 
 import scico.numpy as snp
-from scico import linop
+from scico import linop, solver
 from scico.linop import MatrixOperator
 from scico.random import randn
-from scico.test.linop.test_linop import AbsMatOp
+from scico.test.linop.test_linop import AbsMatOp, adjoint_test
 
 
 class TestMatrix:
@@ -79,6 +81,7 @@ class TestMatrix:
         A, key = randn(matrix_shape, dtype=input_dtype, key=self.key)
         Ao = MatrixOperator(A, input_cols=input_cols)
         G = Ao.gram_op
+        assert G.input_shape == Ao.input_shape and G.output_shape == Ao.input_shape
         x, key = randn(Ao.input_shape, dtype=Ao.input_dtype, key=key)
         np.testing.assert_allclose(G @ x, A.conj().T @ A @ x, rtol=5e-5)
 
@@ -277,3 +280,68 @@ class TestMatrix:
             x = Ao.norm(ord=ord, axis=axis, keepdims=keepdims)
             y = snp.linalg.norm(A, ord=ord, axis=axis, keepdims=keepdims)
             np.testing.assert_allclose(x, y, rtol=5e-5)
+
+
+class TestOutOfCoreMatrix:
+    def setup_method(self, method):
+        np.random.seed(12345)
+        self.Amx = np.random.randn(50, 12).astype(np.float32)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "A.npy")
+        np.save(self.path, self.Amx)
+
+    def teardown_method(self, method):
+        self.tmpdir.cleanup()
+
+    @pytest.mark.parametrize("input_cols", [0, 3])
+    def test_eval(self, input_cols):
+        A = linop.OutOfCoreMatrixOperator(self.path, input_cols=input_cols, block_rows=7)
+        assert isinstance(A.A, np.memmap)
+        x = np.random.randn(*A.input_shape).astype(np.float32)
+        y = np.random.randn(*A.output_shape).astype(np.float32)
+        np.testing.assert_allclose(A(x), self.Amx @ x, rtol=1e-5, atol=1e-5)
+        np.testing.assert_allclose(A.adj(y), self.Amx.T @ y, rtol=1e-5, atol=1e-5)
+        np.testing.assert_allclose(A.gram(x), self.Amx.T @ (self.Amx @ x), rtol=1e-5, atol=1e-4)
+        np.testing.assert_allclose(jax.jit(A.gram_op)(x), A.gram(x), rtol=1e-6)
+        adjoint_test(A)
+
+    def test_raw(self):
+        path = os.path.join(self.tmpdir.name, "A.raw")
+        with open(path, "wb") as f:
+            f.write(b"\0" * 16)
+            self.Amx.tofile(f)
+        A = linop.OutOfCoreMatrixOperator(
+            path, shape=self.Amx.shape, dtype=np.float32, offset=16, block_rows=9
+        )
+        x = np.random.randn(12).astype(np.float32)
+        np.testing.assert_allclose(A(x), self.Amx @ x, rtol=1e-5, atol=1e-5)
+        with pytest.raises(ValueError):
+            linop.OutOfCoreMatrixOperator(path)
+
+    def test_grad(self):
+        A = linop.OutOfCoreMatrixOperator(self.path, block_rows=16)
+        x = np.random.randn(12).astype(np.float32)
+        g = jax.grad(lambda x: snp.sum(A(x) ** 2))(x)
+        np.testing.assert_allclose(g, 2 * self.Amx.T @ (self.Amx @ x), rtol=1e-4, atol=1e-4)
+        g = jax.grad(lambda x: snp.sum(A.gram(x) ** 2))(x)
+        G = self.Amx.T @ self.Amx
+        np.testing.assert_allclose(g, 2 * G @ (G @ x), rtol=1e-4, atol=1e-2)
+
+    def test_float64(self):
+        path = os.path.join(self.tmpdir.name, "A64.npy")
+        np.save(path, self.Amx.astype(np.float64))
+        A = linop.OutOfCoreMatrixOperator(path, block_rows=16)
+        dtype = jax.dtypes.canonicalize_dtype(np.float64)
+        assert A.input_dtype == dtype and A.output_dtype == dtype
+        x = np.random.randn(12).astype(dtype)
+        y = jax.jit(A)(x)
+        assert y.dtype == dtype
+        np.testing.assert_allclose(y, self.Amx @ x, rtol=1e-5, atol=1e-5)
+        assert A.gram(x).dtype == dtype
+
+    def test_lstsq(self):
+        A = linop.OutOfCoreMatrixOperator(self.path, block_rows=16)
+        b = np.random.randn(50).astype(np.float32)
+        x = solver.lstsq(A, b, tol=1e-6, info=False)
+        x_ref = np.linalg.lstsq(self.Amx, b, rcond=None)[0]
+        np.testing.assert_allclose(x, x_ref, rtol=1e-3, atol=1e-4)
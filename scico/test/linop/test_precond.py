@@ -0,0 +1,96 @@
+import numpy as np
+
+import jax
+
+import pytest
+
+import scico.numpy as snp
+from scico import functional, linop, loss, solver
+from scico.optimize.admm import ADMM, LinearSubproblemSolver
+from scico.random import randn
+
+
+class TestPrecond:
+    def setup_method(self, method):
+        np.random.seed(12345)
+        N = 64
+        # symmetric positive definite matrix with badly scaled diagonal
+        B = np.random.randn(N, N).astype(np.float32) / np.sqrt(N)
+        s = np.logspace(0, 2, N).astype(np.float32)
+        self.Amx = s[:, np.newaxis] * (B @ B.T + np.eye(N, dtype=np.float32)) * s[np.newaxis, :]
+        self.A = linop.MatrixOperator(self.Amx)
+        self.b = jax.device_put(np.random.randn(N).astype(np.float32))
+        self.N = N
+
+    def test_estimate_diagonal(self):
+        D = linop.Diagonal(snp.arange(1.0, 9.0))
+        np.testing.assert_allclose(linop.estimate_diagonal(D, num_probes=1), D.diagonal)
+        np.testing.assert_allclose(
+            linop.estimate_diagonal(D, num_probes=1, gram=True), D.diagonal**2
+        )
+        d = linop.estimate_diagonal(self.A, num_probes=128)
+        assert snp.linalg.norm(d - np.diag(self.Amx)) / np.linalg.norm(np.diag(self.Amx)) < 0.2
+        with pytest.raises(ValueError):
+            linop.estimate_diagonal(linop.MatrixOperator(np.ones((4, 3), dtype=np.float32)))
+
+    def test_jacobi(self):
+        M = linop.jacobi_preconditioner(self.A, num_probes=32)
+        assert isinstance(M, linop.Diagonal)
+        x0 = snp.zeros((self.N,), dtype=np.float32)
+        x, info = solver.cg(self.A, self.b, x0, tol=1e-5, maxiter=1000)
+        xp, infop = solver.cg(self.A, self.b, x0, tol=1e-5, maxiter=1000, M=M)
+        assert infop["num_iter"] < info["num_iter"] / 2
+        x_ref = np.linalg.solve(self.Amx, np.array(self.b))
+        assert np.linalg.norm(xp - x_ref) / np.linalg.norm(x_ref) < 1e-2
+
+    def test_block_jacobi(self):
+        C = 3
+        H, key = randn((C, C, 8, 8), dtype=np.float32, seed=1)
+        G = snp.einsum("ki...,kj...->ij...", H, H) + snp.eye(C)[..., np.newaxis, np.newaxis]
+        A = linop.LinearOperator(
+            input_shape=(C, 8, 8),
+            eval_fn=lambda x: snp.einsum("ij...,j...->i...", G, x),
+            adj_fn=lambda x: snp.einsum("ij...,j...->i...", G, x),
+            input_dtype=np.float32,
+        )
+        M = linop.block_jacobi_preconditioner(A, axis=0, num_probes=1, eps=0.0)
+        x, key = randn((C, 8, 8), dtype=np.float32, key=key)
+        np.testing.assert_allclose(M(A(x)), x, rtol=1e-3, atol=1e-3)
+
+    def test_circulant(self):
+        psf = snp.ones((3, 3), dtype=np.float32) / 9
+        H = linop.CircularConvolve(h=psf, input_shape=(16, 16), input_dtype=np.float32)
+        A = H.gram_op + 1e-2 * linop.Identity(H.input_shape)
+        M = linop.circulant_preconditioner(A)
+        assert isinstance(M, linop.CircularConvolve)
+        x, key = randn((16, 16), dtype=np.float32, seed=2)
+        np.testing.assert_allclose(M(A(x)), x, rtol=1e-3, atol=1e-3)
+        Mg = linop.circulant_preconditioner(H, gram=True, eps=1e-2)
+        b = A(x)
+        x0 = snp.zeros(b.shape, dtype=b.dtype)
+        _, info = solver.cg(A, b, x0, tol=1e-5, maxiter=500)
+        _, infop = solver.cg(A, b, x0, tol=1e-5, maxiter=500, M=Mg)
+        assert infop["num_iter"] < info["num_iter"] / 2
+
+    def test_admm(self):
+        x = np.pad(np.ones((8, 8), dtype=np.float32), 4)
+        psf = snp.ones((5, 5), dtype=np.float32) / 25
+        A = linop.CircularConvolve(h=psf, input_shape=x.shape, input_dtype=np.float32)
+        y = A(x)
+        C = linop.FiniteDifference(x.shape, circular=True)
+        rho = 1e-2
+        M = linop.circulant_preconditioner(A.gram_op + rho * C.gram_op)
+        num_iter = []
+        for cg_kwargs in ({"tol": 1e-5}, {"tol": 1e-5, "M": M}):
+            admm_ = ADMM(
+                f=loss.SquaredL2Loss(y=y, A=A),
+                g_list=[1e-2 * functional.L1Norm()],
+                C_list=[C],
+                rho_list=[rho],
+                maxiter=10,
+                x0=A.adj(y),
+                subproblem_solver=LinearSubproblemSolver(cg_kwargs=cg_kwargs),
+            )
+            admm_.solve()
+            num_iter.append(sum(admm_.itstat_object.history(transpose=True).CG_It))
+        assert num_iter[1] < num_iter[0] / 2
@@ -118,3 +118,28 @@ def test_adjoint_typical_input(testobj):
     x = make_im(A.input_shape[0], A.input_shape[1], is_3d=False)
 
     adjoint_test(A, x=x, rtol=get_tol())
+
+
+def test_reuse(testobj):
+    # repeated calls reuse the ASTRA objects and must not accumulate
+    A = testobj.A
+    np.testing.assert_allclose(A(testobj.x), A(testobj.x), rtol=0)
+    np.testing.assert_allclose(A.adj(testobj.y), A.adj(testobj.y), rtol=0)
+    np.testing.assert_allclose(A.fbp(testobj.y), A.fbp(testobj.y), rtol=0)
+
+
+@pytest.mark.parametrize("num_threads", [1, 3])
+def test_3d(num_threads):
+    angles = np.linspace(0, np.pi, 45, False)
+    A2 = TomographicProjector((32, 32), 1.0, 48, angles)
+    A3 = TomographicProjector((5, 32, 32), 1.0, 48, angles, num_threads=num_threads)
+    assert A3.output_shape == (5, 45, 48)
+    x = np.random.randn(5, 32, 32).astype(np.float32)
+    y = A3(x)
+    np.testing.assert_allclose(y, np.stack([A2(xs) for xs in x]), rtol=get_tol())
+    np.testing.assert_allclose(
+        A3.adj(y), np.stack([A2.adj(ys) for ys in y]), rtol=get_tol(), atol=1e-4
+    )
+    np.testing.assert_allclose(
+        A3.fbp(y), np.stack([A2.fbp(ys) for ys in y]), rtol=get_tol(), atol=1e-4
+    )
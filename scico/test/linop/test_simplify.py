@@ -0,0 +1,108 @@
+import numpy as np
+
+import jax
+
+from scico import linop
+from scico.random import randn
+from scico.test.linop.test_linop import adjoint_test
+
+
+class CountingOp(linop.LinearOperator):
+    """Matrix operator that counts its evaluations."""
+
+    def __init__(self, A):
+        self.A = A
+        self.count = 0
+        super().__init__(
+            input_shape=A.shape[1],
+            output_shape=A.shape[0],
+            input_dtype=A.dtype,
+            output_dtype=A.dtype,
+            adj_fn=lambda y: self.A.conj().T @ y,
+        )
+
+    def _eval(self, x):
+        self.count += 1
+        return self.A @ x
+
+
+class TestSimplify:
+    def setup_method(self, method):
+        key = jax.random.PRNGKey(12345)
+        self.N = 16
+        self.x, key = randn((self.N, self.N), key=key)
+        d0, key = randn((self.N, self.N), key=key)
+        d1, key = randn((self.N, self.N), key=key)
+        h0, key = randn((3, 3), key=key)
+        h1, key = randn((3, 3), key=key)
+        M, key = randn((self.N, self.N), key=key)
+        self.v, key = randn((self.N,), key=key)
+        self.D0 = linop.Diagonal(d0)
+        self.D1 = linop.Diagonal(d1)
+        self.I = linop.Identity((self.N, self.N))
+        self.C0 = linop.CircularConvolve(h0, (self.N, self.N))
+        self.C1 = linop.CircularConvolve(h1, (self.N, self.N))
+        self.M = CountingOp(M)
+
+    def test_sum_scalar(self):
+        A = self.D0 + self.C0
+        S = linop.simplify(2.0 * (3.0 * A) / 4.0)
+        assert isinstance(S, linop.ScaledLinearOperator)
+        assert S.scalar == 1.5
+        assert isinstance(S.A, linop.SumLinearOperator)
+        np.testing.assert_allclose(S(self.x), 1.5 * A(self.x), rtol=1e-5)
+
+    def test_diagonal(self):
+        E = 2.0 * (self.D0 @ self.I @ self.D1) + 3.0 * self.D0 - self.I
+        S = linop.simplify(E)
+        assert isinstance(S, linop.Diagonal)
+        np.testing.assert_allclose(S(self.x), E(self.x), rtol=1e-5, atol=1e-5)
+
+    def test_circconv(self):
+        E = 0.5 * self.C0 + self.C1 @ self.C0 - self.C1 / 4.0
+        S = linop.simplify(E)
+        assert isinstance(S, linop.CircularConvolve)
+        np.testing.assert_allclose(S(self.x), E(self.x), rtol=1e-5, atol=1e-5)
+        adjoint_test(S)
+
+    def test_identity(self):
+        A = self.M @ linop.Identity((self.N,))
+        assert linop.simplify(A) is self.M
+        assert isinstance(linop.simplify(self.I @ self.I), linop.Identity)
+
+    def test_shared_factor(self):
+        M = self.M
+        E = M + M.H @ M
+        M.count = 0
+        Ex = E(self.v)
+        assert M.count == 2
+        S = linop.simplify(E)
+        M.count = 0
+        Sx = S(self.v)
+        assert M.count == 1
+        np.testing.assert_allclose(Sx, Ex, rtol=1e-5)
+        adjoint_test(S)
+
+    def test_shared_left_factor(self):
+        M = self.M
+        E = 2.0 * M @ linop.Diagonal(self.v) + M @ linop.Diagonal(self.v**2)
+        S = linop.simplify(E)
+        assert isinstance(S, linop.ComposedLinearOperator)
+        assert S.A is M and isinstance(S.B, linop.Diagonal)
+        np.testing.assert_allclose(S(self.v), E(self.v), rtol=1e-5)
+
+    def test_jit(self):
+        @jax.jit
+        def f(x, rho):
+            return linop.simplify(rho * self.C0 + rho * self.D0 - self.C1)(x)
+
+        E = 2.0 * self.C0 + 2.0 * self.D0 - self.C1
+        np.testing.assert_allclose(f(self.x, 2.0), E(self.x), rtol=1e-5, atol=1e-5)
+
+    def test_sum_adjoint(self):
+        A = linop.LinearOperator(
+            input_shape=self.C0.input_shape, output_shape=self.C0.output_shape, eval_fn=self.C0
+        )
+        adjoint_test(self.D0 + A)
+        adjoint_test(self.D0 - A)
+        adjoint_test(linop.simplify(self.D0 + self.C0 - 2.0 * A))
@@ -0,0 +1,107 @@
+import os
+import tempfile
+
+import numpy as np
+
+import jax
+from jax.experimental import sparse
+
+import pytest
+import scipy.sparse
+
+import scico.numpy as snp
+from scico import linop
+from scico.linop.radon_jax import TomographicProjector
+from scico.random import randn
+from scico.test.linop.test_linop import adjoint_test
+
+
+class TestSparse:
+    def setup_method(self, method):
+        np.random.seed(12345)
+        self.Amx = scipy.sparse.random(30, 20, density=0.1, format="csr", dtype=np.float32)
+
+    @pytest.mark.parametrize("fmt", ["csr", "coo"])
+    def test_eval(self, fmt):
+        A = linop.SparseMatrixOperator(self.Amx.asformat(fmt))
+        assert isinstance(A.A, sparse.CSR if fmt == "csr" else sparse.BCOO)
+        assert A.shape == ((30,), (20,))
+        assert A.nnz == self.Amx.nnz
+        x, key = randn((20,), dtype=np.float32, seed=1)
+        y, key = randn((30,), dtype=np.float32, key=key)
+        np.testing.assert_allclose(A(x), self.Amx @ np.array(x), rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(A.adj(y), self.Amx.T @ np.array(y), rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(A.gram(x), A.adj(A(x)), rtol=1e-5)
+        np.testing.assert_allclose(A.to_array(), self.Amx.toarray())
+        adjoint_test(A)
+        # operators can be applied within jit
+        np.testing.assert_allclose(jax.jit(lambda x: 2 * A(x))(x), 2 * A(x), rtol=1e-6)
+
+    @pytest.mark.parametrize("fmt", ["csr", "coo"])
+    def test_complex(self, fmt):
+        Amx = (self.Amx.astype(np.complex64) * (1 + 2j)).asformat(fmt)
+        A = linop.SparseMatrixOperator(Amx)
+        y, key = randn((30,), dtype=np.complex64, seed=1)
+        np.testing.assert_allclose(A.adj(y), Amx.conj().T @ np.array(y), rtol=1e-5, atol=1e-6)
+
+    def test_shapes(self):
+        A = linop.SparseMatrixOperator(self.Amx, input_shape=(4, 5), output_shape=(3, 10))
+        x, key = randn((4, 5), dtype=np.float32, seed=1)
+        np.testing.assert_allclose(A(x).ravel(), self.Amx @ np.array(x).ravel(), rtol=1e-5)
+        with pytest.raises(ValueError):
+            linop.SparseMatrixOperator(self.Amx, input_shape=(4, 4))
+        with pytest.raises(TypeError):
+            linop.SparseMatrixOperator(self.Amx.toarray())
+
+    @pytest.mark.parametrize("fmt", ["csr", "coo"])
+    @pytest.mark.parametrize("mmap", [False, True])
+    def test_save_load(self, fmt, mmap):
+        A = linop.SparseMatrixOperator(self.Amx.asformat(fmt), input_shape=(4, 5))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "A.npz")
+            A.save(path)
+            B = linop.SparseMatrixOperator.load(path, mmap=mmap)
+            assert type(B.A) == type(A.A)
+            assert B.shape == A.shape
+            np.testing.assert_array_equal(B.to_array(), A.to_array())
+            # files are interchangeable with scipy.sparse
+            np.testing.assert_array_equal(scipy.sparse.load_npz(path).toarray(), A.to_array())
+            scipy.sparse.save_npz(path, self.Amx.asformat(fmt), compressed=False)
+            C = linop.SparseMatrixOperator.load(path, mmap=mmap)
+            assert C.shape == ((30,), (20,))
+            np.testing.assert_array_equal(C.to_array(), self.Amx.toarray())
+
+    @pytest.mark.parametrize("fmt", ["csr", "coo"])
+    def test_scaling(self, fmt):
+        A = linop.SparseMatrixOperator(self.Amx.asformat(fmt))
+        dr = np.arange(1, 31, dtype=np.float32)
+        dc = np.arange(1, 21, dtype=np.float32)
+        np.testing.assert_allclose(A.scale_rows(dr).to_array(), dr[:, None] * A.to_array())
+        np.testing.assert_allclose(A.scale_columns(dc).to_array(), A.to_array() * dc[None, :])
+        for B, Bmx in ((2 * A, 2 * A.to_array()), (A * 2, 2 * A.to_array()), (-A, -A.to_array())):
+            assert isinstance(B, linop.SparseMatrixOperator)
+            np.testing.assert_allclose(B.to_array(), Bmx)
+        assert isinstance(A / 2, linop.SparseMatrixOperator)
+
+    def test_stack(self):
+        A = linop.SparseMatrixOperator(self.Amx)
+        B = linop.SparseMatrixOperator(self.Amx[:10].tocoo())
+        S = linop.SparseMatrixOperator.vstack([A, B])
+        assert S.shape == ((40,), (20,))
+        x, key = randn((20,), dtype=np.float32, seed=1)
+        np.testing.assert_allclose(S(x), snp.concatenate((A(x), B(x))), rtol=1e-5)
+        V = linop.VerticalStack([A, B])
+        Vx = V(x)
+        np.testing.assert_allclose(Vx[0], A(x), rtol=1e-6)
+        np.testing.assert_allclose(Vx[1], B(x), rtol=1e-6)
+        with pytest.raises(ValueError):
+            linop.SparseMatrixOperator.vstack([A, linop.SparseMatrixOperator(self.Amx.T)])
+
+    def test_from_operator(self):
+        P = TomographicProjector((16, 16), 1.0, 24, np.linspace(0, np.pi, 10, False))
+        A = linop.SparseMatrixOperator.from_operator(P, batch_size=48)
+        assert A.shape == P.shape
+        assert A.nnz < 0.25 * P.output_size * P.input_size
+        x, key = randn(P.input_shape, dtype=np.float32, seed=1)
+        np.testing.assert_allclose(A(x), P(x), rtol=1e-5, atol=1e-5)
+        np.testing.assert_allclose(A.adj(P(x)), P.adj(P(x)), rtol=1e-5, atol=1e-4)
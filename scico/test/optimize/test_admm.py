@@ -1,15 +1,25 @@
+import os
+import tempfile
+
 import numpy as np
 
 import jax
 
+import pytest
+
 import scico.numpy as snp
-from scico import functional, linop, loss, metric, random
+from scico import functional, linop, loss, metric, random, solver
 from scico.optimize import ADMM
 from scico.optimize.admm import (
+    BlockCircularConvolveSolver,
     CircularConvolveSolver,
+    FactorizedSubproblemSolver,
     GenericSubproblemSolver,
     LinearSubproblemSolver,
+    ResidualBalancingPenalty,
+    SpectralPenalty,
 )
+from scico.solver import GeometricTolerance, ResidualTolerance, SummableTolerance
 
 
 class TestMisc:
@@ -143,6 +153,179 @@ class TestReal:
         x = admm_.solve()
         assert (snp.linalg.norm(self.grdA(x) - self.grdb) / snp.linalg.norm(self.grdb)) < 1e-4
 
+    def test_admm_early_stopping(self):
+        maxiter = 200
+        ρ = 4e-1
+        A = linop.MatrixOperator(self.Amx)
+        f = loss.SquaredL2Loss(y=self.y, A=A, scale=self.𝛼 / 2.0)
+        g_list = [(self.λ / 2) * functional.SquaredL2Norm()]
+        C_list = [linop.MatrixOperator(self.Bmx)]
+        rho_list = [ρ]
+        admm_ = ADMM(
+            f=f,
+            g_list=g_list,
+            C_list=C_list,
+            rho_list=rho_list,
+            maxiter=maxiter,
+            itstat_options={"display": False},
+            x0=A.adj(self.y),
+            subproblem_solver=LinearSubproblemSolver(cg_kwargs={"tol": 1e-6}, cg_function="jax"),
+            eps_abs=1e-6,
+            eps_rel=1e-5,
+            check_period=5,
+        )
+        x = admm_.solve()
+        assert admm_.itnum < maxiter
+        assert admm_.itnum % 5 == 0
+        assert admm_.converged()
+        assert (snp.linalg.norm(self.grdA(x) - self.grdb) / snp.linalg.norm(self.grdb)) < 1e-3
+        with pytest.raises(ValueError):
+            admm_ = ADMM(
+                f=f,
+                g_list=g_list,
+                C_list=C_list,
+                rho_list=rho_list,
+                eps_abs=1e-6,
+                check_period=0,
+            )
+
+    def test_admm_profile(self):
+        maxiter = 5
+        A = linop.MatrixOperator(self.Amx)
+        f = loss.SquaredL2Loss(y=self.y, A=A, scale=self.𝛼 / 2.0)
+        g_list = [(self.λ / 2) * functional.SquaredL2Norm()]
+        C_list = [linop.MatrixOperator(self.Bmx)]
+        rho_list = [4e-1]
+        admm_ = ADMM(
+            f=f,
+            g_list=g_list,
+            C_list=C_list,
+            rho_list=rho_list,
+            maxiter=maxiter,
+            itstat_options={"display": False},
+            x0=A.adj(self.y),
+            subproblem_solver=LinearSubproblemSolver(),
+            rho_update=ResidualBalancingPenalty(),
+            eps_abs=1e-12,
+            profile=True,
+        )
+        admm_.solve()
+        labels = [
+            "x_update",
+            "prox_g0",
+            "dual_update",
+            "penalty_update",
+            "itstat_eval",
+            "itstat_insert",
+            "convergence_test",
+        ]
+        assert set(admm_.timer.labels()) == set(["main"] + labels)
+        assert all([admm_.timer.elapsed(label) > 0.0 for label in labels])
+        assert sum([admm_.timer.elapsed(label) for label in labels]) <= admm_.timer.elapsed()
+        admm_ = ADMM(
+            f=f,
+            g_list=g_list,
+            C_list=C_list,
+            rho_list=rho_list,
+            maxiter=maxiter,
+            itstat_options={"display": False},
+            x0=A.adj(self.y),
+            subproblem_solver=LinearSubproblemSolver(),
+        )
+        admm_.solve()
+        assert admm_.timer.labels() == ["main"]
+
+    @pytest.mark.parametrize("rho_update", [ResidualBalancingPenalty(), SpectralPenalty()])
+    def test_admm_rho_update(self, rho_update):
+        maxiter = 50
+        ρ = 1e-3
+        A = linop.MatrixOperator(self.Amx)
+        f = loss.SquaredL2Loss(y=self.y, A=A, scale=self.𝛼 / 2.0)
+        g_list = [(self.λ / 2) * functional.SquaredL2Norm()]
+        C_list = [linop.MatrixOperator(self.Bmx)]
+        rho_list = [ρ]
+        admm_ = ADMM(
+            f=f,
+            g_list=g_list,
+            C_list=C_list,
+            rho_list=rho_list,
+            maxiter=maxiter,
+            itstat_options={"display": False},
+            x0=A.adj(self.y),
+            subproblem_solver=LinearSubproblemSolver(cg_kwargs={"tol": 1e-6}),
+            rho_update=rho_update,
+        )
+        # penalty parameter updates should not require recompilation of CG
+        cache_size = solver._cg_device._cache_size()
+        x = admm_.solve()
+        assert solver._cg_device._cache_size() <= cache_size + 1
+        assert admm_.rho_list[0] != ρ
+        assert (snp.linalg.norm(self.grdA(x) - self.grdb) / snp.linalg.norm(self.grdb)) < 1e-3
+
+    def test_admm_set_rho(self):
+        A = linop.MatrixOperator(self.Amx)
+        f = loss.SquaredL2Loss(y=self.y, A=A, scale=self.𝛼 / 2.0)
+        g_list = [(self.λ / 2) * functional.SquaredL2Norm()]
+        C_list = [linop.MatrixOperator(self.Bmx)]
+        admm_ = ADMM(
+            f=f,
+            g_list=g_list,
+            C_list=C_list,
+            rho_list=[1.0],
+            maxiter=2,
+            x0=A.adj(self.y),
+            subproblem_solver=LinearSubproblemSolver(),
+        )
+        admm_.solve()
+        lmbda = admm_.rho_list[0] * admm_.u_list[0]
+        admm_.set_rho([4.0])
+        np.testing.assert_allclose(admm_.rho_list[0] * admm_.u_list[0], lmbda, rtol=1e-6)
+        lhs = lambda x: (self.𝛼 * self.Amx.T @ self.Amx + 4.0 * self.Bmx.T @ self.Bmx) @ x
+        x = np.random.randn(self.Amx.shape[1])
+        np.testing.assert_allclose(admm_.subproblem_solver.lhs_op(x), lhs(x), rtol=1e-5)
+        with pytest.raises(ValueError):
+            admm_.set_rho([1.0, 2.0])
+
+    def test_admm_checkpoint(self):
+        A = linop.MatrixOperator(self.Amx)
+        f = loss.SquaredL2Loss(y=self.y, A=A, scale=self.𝛼 / 2.0)
+        g_list = [(self.λ / 2) * functional.SquaredL2Norm()]
+        C_list = [linop.MatrixOperator(self.Bmx)]
+
+        def admm(maxiter):
+            return ADMM(
+                f=f,
+                g_list=g_list,
+                C_list=C_list,
+                rho_list=[4e-1],
+                maxiter=maxiter,
+                x0=A.adj(self.y),
+                subproblem_solver=LinearSubproblemSolver(cg_kwargs={"tol": 1e-6}),
+            )
+
+        temp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(temp_dir.name, "admm.npz")
+        admm_ = admm(8)
+        admm_.solve(checkpoint_path=path, checkpoint_period=3)
+        admm_.solve()
+        admm_ = admm(8)
+        admm_.load_state(path)
+        assert admm_.itnum == 8
+        assert len(admm_.itstat_object.history()) == 8
+        admm_.set_rho([8e-1])
+        admm_.load_state(path)
+        assert admm_.rho_list == [4e-1]
+        x = admm_.solve()
+        admm_ref = admm(16)
+        x_ref = admm_ref.solve()
+        assert admm_.itnum == admm_ref.itnum
+        np.testing.assert_allclose(x, x_ref, rtol=1e-5)
+        np.testing.assert_allclose(
+            admm_.itstat_object.history(transpose=True).Prml_Rsdl,
+            admm_ref.itstat_object.history(transpose=True).Prml_Rsdl,
+            rtol=1e-4,
+        )
+
     def test_admm_quadratic_relax(self):
         maxiter = 25
         ρ = 1e0
@@ -323,3 +506,425 @@ class TestCircularConvolveSolve:
         x_dft = admm_dft.solve()
         np.testing.assert_allclose(x_dft, x_lin, atol=1e-4, rtol=0)
         assert metric.mse(x_lin, x_dft) < 1e-9
+
+    def test_set_rho(self):
+        admm_ = ADMM(
+            f=self.f,
+            g_list=self.g_list,
+            C_list=self.C_list,
+            rho_list=[1e-1],
+            maxiter=2,
+            x0=self.A.adj(self.y),
+            subproblem_solver=CircularConvolveSolver(),
+        )
+        admm_.set_rho([5e-1])
+        admm_ref = ADMM(
+            f=self.f,
+            g_list=self.g_list,
+            C_list=self.C_list,
+            rho_list=[5e-1],
+            maxiter=2,
+            x0=self.A.adj(self.y),
+            subproblem_solver=CircularConvolveSolver(),
+        )
+        np.testing.assert_allclose(
+            admm_.subproblem_solver.A_lhs.h_dft, admm_ref.subproblem_solver.A_lhs.h_dft, rtol=1e-5
+        )
+
+
+class TestBlockCircularConvolveSolve:
+    def setup_method(self, method):
+        np.random.seed(12345)
+        self.M = 4
+        self.N = 16
+        h = np.random.randn(self.M, 5, 5).astype(np.float32)
+        h /= np.sqrt(np.sum(h**2, axis=(1, 2), keepdims=True))
+        self.D = linop.Sum(input_shape=(self.M, self.N, self.N), axis=0) @ linop.CircularConvolve(
+            h=jax.device_put(h),
+            input_shape=(self.M, self.N, self.N),
+            ndims=2,
+            input_dtype=np.float32,
+        )
+        self.y = jax.device_put(np.random.randn(self.N, self.N).astype(np.float32))
+        self.f = loss.SquaredL2Loss(y=self.y, A=self.D)
+
+    def _solve(self, subproblem_solver, C_list, f=None, rho=1.0):
+        admm_ = ADMM(
+            f=self.f if f is None else f,
+            g_list=[1e-1 * functional.L1Norm()] * len(C_list),
+            C_list=C_list,
+            rho_list=[rho] * len(C_list),
+            maxiter=20,
+            itstat_options={"display": False},
+            x0=snp.zeros(C_list[0].input_shape, dtype=np.float32),
+            subproblem_solver=subproblem_solver,
+        )
+        return admm_.solve(), admm_
+
+    @pytest.mark.parametrize("finite_diff", [False, True])
+    def test_admm(self, finite_diff):
+        shape = (self.M, self.N, self.N)
+        C_list = [linop.Identity(shape)]
+        if finite_diff:
+            C_list.append(linop.FiniteDifference(shape, axes=(1, 2), circular=True))
+        x_lin, _ = self._solve(
+            LinearSubproblemSolver(cg_kwargs={"tol": 1e-7, "maxiter": 1000}), C_list
+        )
+        x_dft, admm_ = self._solve(BlockCircularConvolveSolver(ndims=2), C_list)
+        assert admm_.subproblem_solver.woodbury
+        assert snp.linalg.norm(x_dft - x_lin) / snp.linalg.norm(x_lin) < 1e-4
+
+    def test_full(self):
+        # two output channels, all C_i finite differences: the left hand
+        # side is singular at zero frequency and the Woodbury identity
+        # cannot be used
+        shape = (self.M - 1, self.N, self.N)
+        h = jax.device_put(np.random.randn(2, self.M - 1, 5, 5).astype(np.float32))
+        A = linop.Sum(input_shape=(2,) + shape, axis=1) @ linop.CircularConvolve(
+            h=h, input_shape=shape, ndims=2, input_dtype=np.float32
+        )
+        y = jax.device_put(np.random.randn(2, self.N, self.N).astype(np.float32))
+        f = loss.SquaredL2Loss(y=y, A=A)
+        C_list = [linop.FiniteDifference(shape, axes=(1, 2), circular=True)]
+        x_lin, _ = self._solve(
+            LinearSubproblemSolver(cg_kwargs={"tol": 1e-7, "maxiter": 2000}), C_list, f=f
+        )
+        x_dft, admm_ = self._solve(BlockCircularConvolveSolver(ndims=2), C_list, f=f)
+        assert not admm_.subproblem_solver.woodbury
+        assert snp.linalg.norm(x_dft - x_lin) / snp.linalg.norm(x_lin) < 1e-3
+
+    def test_single_channel(self):
+        A = linop.CircularConvolve(
+            h=snp.ones((3, 3), dtype=np.float32) / 9,
+            input_shape=(self.N, self.N),
+            input_dtype=np.float32,
+        )
+        f = loss.SquaredL2Loss(y=self.y, A=A)
+        C_list = [linop.FiniteDifference((self.N, self.N), circular=True)]
+        x_ref, _ = self._solve(CircularConvolveSolver(), C_list, f=f)
+        x_dft, _ = self._solve(BlockCircularConvolveSolver(ndims=2), C_list, f=f)
+        np.testing.assert_allclose(x_dft, x_ref, atol=1e-5, rtol=0)
+
+    def test_set_rho(self):
+        C_list = [linop.Identity((self.M, self.N, self.N))]
+        _, admm_ = self._solve(BlockCircularConvolveSolver(ndims=2), C_list)
+        admm_.set_rho([5e-1])
+        _, admm_ref = self._solve(BlockCircularConvolveSolver(ndims=2), C_list, rho=5e-1)
+        np.testing.assert_allclose(
+            admm_.subproblem_solver._Ginv, admm_ref.subproblem_solver._Ginv, rtol=1e-5
+        )
+
+    def test_invalid(self):
+        C_list = [linop.Identity((self.M, self.N, self.N))]
+        with pytest.raises(ValueError):
+            self._solve(
+                BlockCircularConvolveSolver(ndims=2),
+                C_list,
+                f=loss.SquaredL2Loss(y=self.y, A=self.D, W=linop.Diagonal(snp.ones(self.y.shape))),
+            )
+
+
+class TestFactorized:
+    def setup_method(self, method):
+        np.random.seed(12345)
+
+    def admm(self, M, N, subproblem_solver, diagonal=False, weighted=False):
+        Amx = np.random.RandomState(0).randn(M, N).astype(np.float32)
+        y = jax.device_put(np.random.RandomState(1).randn(M).astype(np.float32))
+        A = linop.MatrixOperator(Amx)
+        W = None
+        if weighted:
+            W = linop.Diagonal(jax.device_put(np.linspace(0.5, 2.0, M).astype(np.float32)))
+        if diagonal:
+            C = linop.Diagonal(jax.device_put(np.linspace(0.5, 2.0, N).astype(np.float32)))
+        else:
+            C = linop.Identity((N,), input_dtype=np.float32)
+        return ADMM(
+            f=loss.SquaredL2Loss(y=y, A=A, W=W),
+            g_list=[1e-1 * functional.L1Norm(), functional.NonNegativeIndicator()],
+            C_list=[C, linop.Identity((N,), input_dtype=np.float32)],
+            rho_list=[1.0, 1.0],
+            maxiter=50,
+            itstat_options={"display": False},
+            x0=A.adj(y),
+            subproblem_solver=subproblem_solver,
+        )
+
+    @pytest.mark.parametrize("shape", [(8, 16), (16, 8)])
+    @pytest.mark.parametrize("diagonal", [False, True])
+    @pytest.mark.parametrize("weighted", [False, True])
+    def test_admm(self, shape, diagonal, weighted):
+        lin_solver = LinearSubproblemSolver(cg_kwargs={"tol": 1e-7, "maxiter": 1000})
+        x_lin = self.admm(*shape, lin_solver, diagonal, weighted).solve()
+        admm_fct = self.admm(*shape, FactorizedSubproblemSolver(), diagonal, weighted)
+        assert admm_fct.subproblem_solver.woodbury == (shape[0] < shape[1])
+        x_fct = admm_fct.solve()
+        assert snp.linalg.norm(x_fct - x_lin) / snp.linalg.norm(x_lin) < 1e-4
+
+    @pytest.mark.parametrize("shape", [(8, 16), (16, 8)])
+    @pytest.mark.parametrize("diagonal", [False, True])
+    def test_set_rho(self, shape, diagonal):
+        admm_ = self.admm(*shape, FactorizedSubproblemSolver(), diagonal)
+        # an eigendecomposition is used when all of the C_i are Identity
+        assert (admm_.subproblem_solver.factor is None) == (not diagonal)
+        admm_.set_rho([2.0, 5e-1])
+        admm_.solve()
+        admm_lin = self.admm(
+            *shape, LinearSubproblemSolver(cg_kwargs={"tol": 1e-7, "maxiter": 1000}), diagonal
+        )
+        admm_lin.set_rho([2.0, 5e-1])
+        admm_lin.solve()
+        assert snp.linalg.norm(admm_.x - admm_lin.x) / snp.linalg.norm(admm_lin.x) < 1e-4
+
+    def test_unsupported(self):
+        with pytest.raises(ValueError):
+            ADMM(
+                f=loss.SquaredL2Loss(y=snp.zeros((4,)), A=linop.Identity((4,))),
+                g_list=[functional.L1Norm()],
+                C_list=[linop.Identity((4,))],
+                rho_list=[1.0],
+                subproblem_solver=FactorizedSubproblemSolver(),
+            )
+        A = linop.MatrixOperator(np.ones((4, 4), dtype=np.float32))
+        with pytest.raises(ValueError):
+            ADMM(
+                f=loss.SquaredL2Loss(y=snp.zeros((4,)), A=A),
+                g_list=[functional.L1Norm()],
+                C_list=[A],
+                rho_list=[1.0],
+                subproblem_solver=FactorizedSubproblemSolver(),
+            )
+
+
+class TestRecycle:
+    def setup_method(self, method):
+        np.random.seed(12345)
+        N = 64
+        # Set up ill-conditioned problem argmin (1/2) ||A x - y||_2^2 + λ ||x||_1
+        U, _ = np.linalg.qr(np.random.randn(N, N))
+        V, _ = np.linalg.qr(np.random.randn(N, N))
+        sv = np.concatenate([np.logspace(-2, -1, 4), np.linspace(1, 2, N - 4)])
+        self.Amx = ((U * sv) @ V.T).astype(np.float32)
+        self.y = jax.device_put(np.random.randn(N).astype(np.float32))
+        self.N = N
+
+    def solve(self, recycle):
+        A = linop.MatrixOperator(self.Amx)
+        admm_ = ADMM(
+            f=loss.SquaredL2Loss(y=self.y, A=A),
+            g_list=[1e-2 * functional.L1Norm()],
+            C_list=[linop.Identity((self.N,), input_dtype=np.float32)],
+            rho_list=[1e-4],
+            maxiter=30,
+            itstat_options={"display": False},
+            x0=A.adj(self.y),
+            subproblem_solver=LinearSubproblemSolver(
+                cg_kwargs={"tol": 1e-5, "maxiter": 500}, recycle=recycle
+            ),
+        )
+        x = admm_.solve()
+        return admm_, x
+
+    def test_admm_recycle(self):
+        admm_ref, x_ref = self.solve(0)
+        admm_rcy, x_rcy = self.solve(4)
+        num_iter_ref = sum(admm_ref.itstat_object.history(transpose=True).CG_It)
+        num_iter_rcy = sum(admm_rcy.itstat_object.history(transpose=True).CG_It)
+        assert num_iter_rcy < num_iter_ref / 2
+        assert snp.linalg.norm(x_rcy - x_ref) / snp.linalg.norm(x_ref) < 5e-2
+        admm_rcy.set_rho([2e-4])
+        assert admm_rcy.subproblem_solver.basis is None
+        with pytest.raises(ValueError):
+            admm_rcy.solve_compiled()
+
+    def test_recycle_jax_cg(self):
+        with pytest.raises(ValueError):
+            LinearSubproblemSolver(cg_function="jax", recycle=4)
+
+
+class TestToleranceSchedule:
+    def setup_method(self, method):
+        np.random.seed(12345)
+        N = 64
+        U, _ = np.linalg.qr(np.random.randn(N, N))
+        V, _ = np.linalg.qr(np.random.randn(N, N))
+        sv = np.concatenate([np.logspace(-2, -1, 4), np.linspace(1, 2, N - 4)])
+        self.A = linop.MatrixOperator(((U * sv) @ V.T).astype(np.float32))
+        self.y = jax.device_put(np.random.randn(N).astype(np.float32))
+        self.N = N
+
+    def admm(self, maxiter, tol_schedule=None):
+        return ADMM(
+            f=loss.SquaredL2Loss(y=self.y, A=self.A),
+            g_list=[1e-2 * functional.L1Norm()],
+            C_list=[linop.Identity((self.N,), input_dtype=np.float32)],
+            rho_list=[1e-1],
+            maxiter=maxiter,
+            itstat_options={"display": False},
+            x0=self.A.adj(self.y),
+            subproblem_solver=LinearSubproblemSolver(
+                cg_kwargs={"tol": 1e-6, "maxiter": 1000}, tol_schedule=tol_schedule
+            ),
+        )
+
+    @pytest.mark.parametrize(
+        "tol_schedule",
+        [
+            GeometricTolerance(1e-1, 0.8, 1e-6),
+            ResidualTolerance(1e-2, 1e-1, 1e-6),
+            SummableTolerance(1e-1, 2.0),
+        ],
+    )
+    def test_admm_tol_schedule(self, tol_schedule):
+        x_ref = self.admm(300).solve()
+        admm_fix = self.admm(60)
+        admm_fix.solve()
+        admm_sch = self.admm(60, tol_schedule)
+        x_sch = admm_sch.solve()
+        hist_fix = admm_fix.itstat_object.history(transpose=True)
+        hist_sch = admm_sch.itstat_object.history(transpose=True)
+        assert sum(hist_sch.CG_It) < 0.6 * sum(hist_fix.CG_It)
+        assert hist_sch.CG_Tol[0] == 1e-1
+        assert snp.linalg.norm(x_sch - x_ref) / snp.linalg.norm(x_ref) < 2e-2
+        with pytest.raises(ValueError):
+            admm_sch.solve_compiled()
+
+
+class TestCompiled:
+    def setup_method(self, method):
+        np.random.seed(12345)
+        Nx = 8
+        x = np.pad(np.ones((Nx, Nx), dtype=np.float32), Nx)
+        Npsf = 3
+        psf = snp.ones((Npsf, Npsf), dtype=np.float32) / (Npsf**2)
+        self.A = linop.CircularConvolve(
+            h=psf,
+            input_shape=x.shape,
+            input_dtype=np.float32,
+        )
+        self.y = self.A(x)
+        λ = 1e-2
+        self.f = loss.SquaredL2Loss(y=self.y, A=self.A)
+        self.g_list = [λ * functional.L1Norm()]
+        self.C_list = [linop.FiniteDifference(input_shape=x.shape, circular=True)]
+
+    def test_admm_compiled(self):
+        maxiter = 20
+        ρ = 1e-1
+        kwargs = dict(
+            f=self.f,
+            g_list=self.g_list,
+            C_list=self.C_list,
+            rho_list=[ρ],
+            maxiter=maxiter,
+            itstat_options={"display": False},
+            x0=self.A.adj(self.y),
+        )
+        admm_ref = ADMM(**kwargs, subproblem_solver=CircularConvolveSolver())
+        x_ref = admm_ref.solve()
+        admm_cmp = ADMM(**kwargs, subproblem_solver=CircularConvolveSolver())
+        x_cmp = admm_cmp.solve_compiled()
+        np.testing.assert_allclose(x_cmp, x_ref, atol=1e-5, rtol=0)
+        assert admm_cmp.itnum == admm_ref.itnum
+        hist_ref = admm_ref.itstat_object.history(transpose=True)
+        hist_cmp = admm_cmp.itstat_object.history(transpose=True)
+        assert len(hist_cmp.Iter) == maxiter
+        np.testing.assert_allclose(hist_cmp.Prml_Rsdl, hist_ref.Prml_Rsdl, rtol=1e-3, atol=1e-6)
+        assert not isinstance(admm_cmp.x, jax.core.Tracer)
+
+    @pytest.mark.parametrize("cg_function", ["jax", "scico"])
+    def test_admm_compiled_cg(self, cg_function):
+        admm_ = ADMM(
+            f=self.f,
+            g_list=self.g_list,
+            C_list=self.C_list,
+            rho_list=[1e-1],
+            maxiter=5,
+            x0=self.A.adj(self.y),
+            subproblem_solver=LinearSubproblemSolver(cg_function=cg_function),
+        )
+        admm_.solve_compiled()
+        assert admm_.itnum == 5
+
+    def test_admm_compiled_early_stopping(self):
+        kwargs = {
+            "f": self.f,
+            "g_list": self.g_list,
+            "C_list": self.C_list,
+            "rho_list": [1e-1],
+            "maxiter": 100,
+            "x0": self.A.adj(self.y),
+            "subproblem_solver": CircularConvolveSolver(),
+            "eps_abs": 1e-4,
+            "eps_rel": 1e-3,
+            "check_period": 2,
+        }
+        admm_ = ADMM(**kwargs)
+        x = admm_.solve()
+        admm_c = ADMM(**kwargs)
+        xc = admm_c.solve_compiled()
+        assert admm_.itnum < 100
+        assert admm_c.itnum == admm_.itnum
+        np.testing.assert_allclose(x, xc, rtol=1e-4, atol=1e-5)
+
+    def test_admm_batch(self):
+        y = snp.stack([self.y, 0.5 * self.y, snp.roll(self.y, 3, axis=0)])
+        admm_ = ADMM(
+            f=self.f,
+            g_list=self.g_list,
+            C_list=self.C_list,
+            rho_list=[1e-1],
+            maxiter=10,
+            subproblem_solver=CircularConvolveSolver(),
+        )
+        x = admm_.solve_batch(y)
+        assert x.shape == (3,) + self.y.shape
+        assert admm_.itnum == 0
+        assert len(admm_.itstat_batch) == 3
+        for b in range(3):
+            admm_b = ADMM(
+                f=loss.SquaredL2Loss(y=y[b], A=self.A),
+                g_list=self.g_list,
+                C_list=self.C_list,
+                rho_list=[1e-1],
+                maxiter=10,
+                subproblem_solver=CircularConvolveSolver(),
+            )
+            xb = admm_b.solve()
+            np.testing.assert_allclose(x[b], xb, rtol=1e-4, atol=1e-5)
+            hist = admm_.itstat_batch[b].history(transpose=True)
+            assert len(hist.Iter) == 10
+            np.testing.assert_allclose(
+                hist.Prml_Rsdl, admm_b.itstat_object.history(transpose=True).Prml_Rsdl, rtol=1e-3
+            )
+
+    def test_admm_batch_early_stopping(self):
+        y = snp.stack([self.y, 1e-3 * self.y])
+        admm_ = ADMM(
+            f=self.f,
+            g_list=self.g_list,
+            C_list=self.C_list,
+            rho_list=[1e-1],
+            maxiter=100,
+            subproblem_solver=LinearSubproblemSolver(cg_function="jax"),
+            eps_abs=1e-4,
+            eps_rel=1e-3,
+        )
+        admm_.solve_batch(y, x0=snp.stack([self.A.adj(yb) for yb in y]))
+        numiter = [len(itstat.history()) for itstat in admm_.itstat_batch]
+        assert numiter[0] < 100
+        assert numiter[0] != numiter[1]
+
+    def test_admm_compiled_unsupported(self):
+        admm_ = ADMM(
+            f=self.f,
+            g_list=self.g_list,
+            C_list=self.C_list,
+            rho_list=[1e-1],
+            maxiter=5,
+            subproblem_solver=GenericSubproblemSolver(),
+        )
+        with pytest.raises(ValueError):
+            admm_.solve_compiled()
+        with pytest.raises(ValueError):
+            admm_.solve_batch(snp.stack([self.y, self.y]))
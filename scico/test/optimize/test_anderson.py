@@ -0,0 +1,104 @@
+import os
+import tempfile
+
+import numpy as np
+
+import pytest
+
+import scico.numpy as snp
+from scico import functional, linop, loss
+from scico.optimize import ADMM, PDHG, AcceleratedPGM, AndersonAcceleration
+from scico.optimize.admm import CircularConvolveSolver
+
+
+class TestAnderson:
+    def setup_method(self, method):
+        Nx = 8
+        x = np.pad(np.ones((Nx, Nx), dtype=np.float32), Nx)
+        Npsf = 3
+        psf = snp.ones((Npsf, Npsf), dtype=np.float32) / (Npsf**2)
+        self.A = linop.CircularConvolve(
+            h=psf,
+            input_shape=x.shape,
+            input_dtype=np.float32,
+        )
+        self.y = self.A(x)
+        λ = 1e-2
+        self.f = loss.SquaredL2Loss(y=self.y, A=self.A)
+        self.g = λ * functional.L1Norm()
+        self.C = linop.FiniteDifference(input_shape=x.shape, circular=True)
+
+    def admm(self, maxiter):
+        return ADMM(
+            f=self.f,
+            g_list=[self.g],
+            C_list=[self.C],
+            rho_list=[1e-1],
+            maxiter=maxiter,
+            x0=self.A.adj(self.y),
+            subproblem_solver=CircularConvolveSolver(),
+        )
+
+    def test_admm(self):
+        admm_ = self.admm(50)
+        admm_.solve()
+        admm_aa = self.admm(50)
+        aa = AndersonAcceleration(admm_aa, m=5)
+        aa.solve()
+        assert admm_aa.itnum == 50
+        assert admm_aa.norm_primal_residual() < admm_.norm_primal_residual()
+        x_ref = self.admm(500).solve()
+        assert snp.linalg.norm(admm_aa.x - x_ref) < snp.linalg.norm(admm_.x - x_ref)
+
+    def test_pdhg(self):
+        admm_ = self.admm(500)
+        admm_.solve()
+        obj_ref = admm_.objective()
+        pdhg_ = PDHG(
+            f=self.f, g=self.g, C=self.C, tau=1e-1, sigma=1e-1, maxiter=100, x0=self.A.adj(self.y)
+        )
+        pdhg_.solve()
+        pdhg_aa = PDHG(
+            f=self.f, g=self.g, C=self.C, tau=1e-1, sigma=1e-1, maxiter=100, x0=self.A.adj(self.y)
+        )
+        AndersonAcceleration(pdhg_aa).solve()
+        assert abs(pdhg_aa.objective() - obj_ref) < abs(pdhg_.objective() - obj_ref)
+
+    def test_solver_unmodified(self):
+        admm_ = self.admm(5)
+        aa = AndersonAcceleration(admm_)
+        aa.solve()
+        assert "step" not in vars(admm_)
+        assert admm_.itnum == 5
+
+    def test_checkpoint(self):
+        x_ref = AndersonAcceleration(self.admm(20)).solve()
+        temp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(temp_dir.name, "checkpoint.npz")
+        aa0 = AndersonAcceleration(self.admm(12))
+        aa0.solve(checkpoint_path=path)
+        aa = AndersonAcceleration(self.admm(8))
+        aa.load_state(path)
+        assert aa.solver.itnum == 12
+        assert aa._count == aa0._count and aa._count > 0
+        x = aa.solve()
+        np.testing.assert_allclose(x, x_ref, rtol=1e-5, atol=1e-6)
+        temp_dir.cleanup()
+
+    def test_reject(self):
+        # zero safeguard ratio rejects every extrapolated step
+        aa = AndersonAcceleration(self.admm(3), safeguard=0.0)
+        for k in range(3):
+            aa.step()
+        assert aa.num_reject == 1
+        # state reverted to the plain update of the last accepted state
+        admm_ = self.admm(2)
+        admm_.step()
+        admm_.step()
+        np.testing.assert_allclose(aa.solver.z_list[0], admm_.z_list[0], rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(aa.solver.u_list[0], admm_.u_list[0], rtol=1e-5, atol=1e-6)
+
+    def test_unsupported(self):
+        apgm_ = AcceleratedPGM(f=self.f, g=self.g, L0=1.0, x0=self.A.adj(self.y))
+        with pytest.raises(TypeError):
+            AndersonAcceleration(apgm_)
@@ -1,3 +1,6 @@
+import os
+import tempfile
+
 import numpy as np
 
 import jax
@@ -137,6 +140,77 @@ class TestReal:
         x = ladmm_.solve()
         assert (snp.linalg.norm(self.grdA(x) - self.grdb) / snp.linalg.norm(self.grdb)) < 1e-4
 
+    def test_ladmm_checkpoint(self):
+        A = linop.Diagonal(snp.diag(self.Amx))
+        f = loss.SquaredL2Loss(y=self.y, A=A)
+        g = (self.λ / 2) * functional.SquaredL2Norm()
+        C = linop.MatrixOperator(self.Bmx)
+
+        def ladmm(maxiter, mu=1e-2, nu=2e-1):
+            return LinearizedADMM(f=f, g=g, C=C, mu=mu, nu=nu, maxiter=maxiter, x0=A.adj(self.y))
+
+        temp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(temp_dir.name, "ladmm.npz")
+        ladmm_ = ladmm(10)
+        ladmm_.solve(checkpoint_path=path, checkpoint_period=5)
+        ladmm_ = ladmm(10, mu=1.0, nu=1.0)
+        ladmm_.load_state(path)
+        assert ladmm_.itnum == 10
+        assert ladmm_.mu == 1e-2 and ladmm_.nu == 2e-1
+        x = ladmm_.solve()
+        x_ref = ladmm(20).solve()
+        np.testing.assert_allclose(x, x_ref, rtol=1e-5)
+        assert len(ladmm_.itstat_object.history()) == 20
+
+    def test_ladmm_checkpoint_itstat(self):
+        A = linop.Diagonal(snp.diag(self.Amx))
+        f = loss.SquaredL2Loss(y=self.y, A=A)
+        g = (self.λ / 2) * functional.SquaredL2Norm()
+        C = linop.MatrixOperator(self.Bmx)
+        itstat_options = {
+            "fields": {"Iter": "%d", "Label": "%s", "Value": "%s"},
+            "itstat_func": lambda obj: (obj.itnum, f"it{obj.itnum}", complex(obj.itnum, 1.0)),
+            "display": False,
+        }
+
+        def ladmm():
+            return LinearizedADMM(
+                f=f, g=g, C=C, mu=1e-2, nu=2e-1, maxiter=5, itstat_options=itstat_options
+            )
+
+        temp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(temp_dir.name, "ladmm.npz")
+        ladmm_ = ladmm()
+        ladmm_.solve(checkpoint_path=path)
+        hist = ladmm_.itstat_object.iterations
+        ladmm_ = ladmm()
+        ladmm_.load_state(path)
+        assert ladmm_.itstat_object.iterations == hist
+        assert isinstance(ladmm_.itstat_object.iterations[-1].Label, str)
+
+    def test_ladmm_early_stopping(self):
+        maxiter = 1000
+        μ = 1e-2
+        ν = 2e-1
+        A = linop.Diagonal(snp.diag(self.Amx))
+        f = loss.SquaredL2Loss(y=self.y, A=A)
+        g = (self.λ / 2) * functional.SquaredL2Norm()
+        C = linop.MatrixOperator(self.Bmx)
+        ladmm_ = LinearizedADMM(
+            f=f,
+            g=g,
+            C=C,
+            mu=μ,
+            nu=ν,
+            maxiter=maxiter,
+            x0=A.adj(self.y),
+            eps_abs=1e-6,
+            eps_rel=1e-5,
+        )
+        x = ladmm_.solve()
+        assert ladmm_.itnum < maxiter
+        assert (snp.linalg.norm(self.grdA(x) - self.grdb) / snp.linalg.norm(self.grdb)) < 1e-3
+
 
 class TestComplex:
     def setup_method(self, method):
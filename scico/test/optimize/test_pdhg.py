@@ -1,3 +1,6 @@
+import os
+import tempfile
+
 import numpy as np
 
 import jax
@@ -137,6 +140,51 @@ class TestReal:
         x = pdhg_.solve()
         assert (snp.linalg.norm(self.grdA(x) - self.grdb) / snp.linalg.norm(self.grdb)) < 1e-4
 
+    def test_pdhg_checkpoint(self):
+        A = linop.Diagonal(snp.diag(self.Amx))
+        f = loss.SquaredL2Loss(y=self.y, A=A)
+        g = (self.λ / 2) * functional.SquaredL2Norm()
+        C = linop.MatrixOperator(self.Bmx)
+
+        def pdhg(maxiter, tau=2e-1, sigma=2e-1):
+            return PDHG(f=f, g=g, C=C, tau=tau, sigma=sigma, maxiter=maxiter, x0=A.adj(self.y))
+
+        temp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(temp_dir.name, "pdhg.npz")
+        pdhg_ = pdhg(10)
+        pdhg_.solve(checkpoint_path=path)
+        pdhg_ = pdhg(10, tau=1.0, sigma=1.0)
+        pdhg_.load_state(path)
+        assert pdhg_.itnum == 10
+        assert pdhg_.tau == 2e-1 and pdhg_.sigma == 2e-1
+        x = pdhg_.solve()
+        x_ref = pdhg(20).solve()
+        np.testing.assert_allclose(x, x_ref, rtol=1e-5)
+        assert len(pdhg_.itstat_object.history()) == 20
+
+    def test_pdhg_early_stopping(self):
+        maxiter = 1000
+        τ = 2e-1
+        σ = 2e-1
+        A = linop.Diagonal(snp.diag(self.Amx))
+        f = loss.SquaredL2Loss(y=self.y, A=A)
+        g = (self.λ / 2) * functional.SquaredL2Norm()
+        C = linop.MatrixOperator(self.Bmx)
+        pdhg_ = PDHG(
+            f=f,
+            g=g,
+            C=C,
+            tau=τ,
+            sigma=σ,
+            maxiter=maxiter,
+            x0=A.adj(self.y),
+            eps_abs=1e-6,
+            eps_rel=1e-5,
+        )
+        x = pdhg_.solve()
+        assert pdhg_.itnum < maxiter
+        assert (snp.linalg.norm(self.grdA(x) - self.grdb) / snp.linalg.norm(self.grdb)) < 1e-3
+
     def test_nlpdhg(self):
         maxiter = 300
         τ = 2e-1
@@ -1,9 +1,14 @@
+import os
+import tempfile
+
 import numpy as np
 
 import jax
 
+import pytest
+
 from scico import functional, linop, loss, random
-from scico.optimize import PGM, AcceleratedPGM
+from scico.optimize import PGM, SVRG, AcceleratedPGM, SubsetPGM
 from scico.optimize.pgm import (
     AdaptiveBBStepSize,
     BBStepSize,
@@ -51,6 +56,61 @@ class TestSet:
         x = apgm_.solve()
         np.testing.assert_allclose(self.grdA(x), self.grdb, rtol=5e-3)
 
+    def test_pgm_early_stopping(self):
+        maxiter = 1000
+        A = linop.MatrixOperator(self.Amx)
+        L0 = 1.05 * linop.power_iteration(A.T @ A)[0]
+        loss_ = loss.SquaredL2Loss(y=self.y, A=A)
+        g = (self.λ / 2.0) * functional.SquaredL2Norm()
+        apgm_ = AcceleratedPGM(
+            f=loss_, g=g, L0=L0, maxiter=maxiter, x0=A.adj(self.y), eps_abs=1e-6, check_period=10
+        )
+        x = apgm_.solve()
+        assert apgm_.itnum < maxiter
+        assert apgm_.itnum % 10 == 0
+        np.testing.assert_allclose(self.grdA(x), self.grdb, rtol=5e-3)
+        with pytest.raises(ValueError):
+            apgm_ = AcceleratedPGM(f=loss_, g=g, L0=L0, x0=A.adj(self.y), check_period=0)
+
+    @pytest.mark.parametrize("pgm_class", [PGM, AcceleratedPGM])
+    def test_pgm_checkpoint(self, pgm_class):
+        A = linop.MatrixOperator(self.Amx)
+        L0 = 1.05 * linop.power_iteration(A.T @ A)[0] / 5.0
+        loss_ = loss.SquaredL2Loss(y=self.y, A=A)
+        g = (self.λ / 2.0) * functional.SquaredL2Norm()
+
+        def pgm(maxiter):
+            return pgm_class(
+                f=loss_, g=g, L0=L0, x0=A.adj(self.y), step_size=BBStepSize(), maxiter=maxiter
+            )
+
+        temp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(temp_dir.name, "pgm.npz")
+        pgm_ = pgm(10)
+        pgm_.solve(checkpoint_path=path, checkpoint_period=4)
+        pgm_ = pgm(10)
+        pgm_.load_state(path)
+        assert pgm_.itnum == 10
+        x = pgm_.solve()
+        x_ref = pgm(20).solve()
+        np.testing.assert_allclose(x, x_ref, rtol=1e-5)
+        with pytest.raises(ValueError):
+            pgm_.solve(checkpoint_period=4)
+
+    @pytest.mark.parametrize("pgm_class", [PGM, AcceleratedPGM])
+    def test_pgm_profile(self, pgm_class):
+        A = linop.MatrixOperator(self.Amx)
+        L0 = 1.05 * linop.power_iteration(A.T @ A)[0]
+        loss_ = loss.SquaredL2Loss(y=self.y, A=A)
+        g = (self.λ / 2.0) * functional.SquaredL2Norm()
+        pgm_ = pgm_class(f=loss_, g=g, L0=L0, maxiter=5, x0=A.adj(self.y), profile=True)
+        pgm_.solve()
+        labels = ["step_size", "x_update", "itstat_eval", "itstat_insert", "convergence_test"]
+        if pgm_class is AcceleratedPGM:
+            labels.append("extrapolation")
+        assert set(pgm_.timer.labels()) == set(["main"] + labels)
+        assert all([pgm_.timer.elapsed(label) > 0.0 for label in labels])
+
     def test_pgm_BB_step_size(self):
         maxiter = 100
         A = linop.MatrixOperator(self.Amx)
@@ -163,6 +223,38 @@ class TestSet:
             assert 0
 
 
+class TestSubset:
+    def setup_method(self, method):
+        np.random.seed(12345)
+        M = 256
+        N = 8
+        K = 4
+        Amx = np.random.randn(M, N).astype(np.float32)
+        y = np.random.randn(M).astype(np.float32)
+        λ = 1e0
+        self.f_list = [
+            loss.SquaredL2Loss(y=y[k::K], A=linop.MatrixOperator(Amx[k::K])) for k in range(K)
+        ]
+        self.g = (λ / 2.0) * functional.SquaredL2Norm()
+        self.L0 = 1.05 * float(np.linalg.norm(Amx, 2) ** 2)
+        self.x0 = jax.device_put(np.zeros(N, dtype=np.float32))
+        self.x_ref = np.linalg.solve(Amx.T @ Amx + λ * np.identity(N), Amx.T @ y)
+
+    def test_subset_pgm(self):
+        ospgm_ = SubsetPGM(f_list=self.f_list, g=self.g, L0=self.L0, x0=self.x0, maxiter=10)
+        ospgm_.solve()
+        # iterates approach a neighborhood of the solution
+        f_ref = sum(f(self.x_ref) for f in self.f_list) + self.g(self.x_ref)
+        assert ospgm_.objective() < 1.02 * f_ref
+        with pytest.raises(ValueError):
+            SubsetPGM(f_list=[], g=self.g, L0=self.L0, x0=self.x0)
+
+    def test_svrg(self):
+        svrg_ = SVRG(f_list=self.f_list, g=self.g, L0=self.L0, x0=self.x0, maxiter=50)
+        x = svrg_.solve()
+        np.testing.assert_allclose(x, self.x_ref, rtol=1e-4, atol=1e-5)
+
+
 class TestComplex:
     def setup_method(self, method):
         M = 5
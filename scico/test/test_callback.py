@@ -0,0 +1,64 @@
+import numpy as np
+
+import jax
+
+import scico._callback
+import scico.numpy as snp
+from scico._callback import host_view, pure_host_callback
+
+
+def test_host_view():
+    x = np.arange(12, dtype=np.float32).reshape(3, 4)
+    assert host_view(x) is x
+    assert np.shares_memory(host_view(x[1:]), x)
+    y = host_view(x.T)
+    assert y.flags.c_contiguous
+    np.testing.assert_array_equal(y, x.T)
+    assert host_view(x, dtype=np.float64).dtype == np.float64
+
+
+def test_pure_host_callback():
+    def func(x):
+        assert isinstance(x, np.ndarray)
+        return np.cumsum(x, axis=-1)  # result dtype converted as required
+
+    x = snp.arange(12, dtype=np.float32).reshape(3, 4)
+    shape = jax.ShapeDtypeStruct(x.shape, x.dtype)
+    y = pure_host_callback(func, shape, x)
+    assert y.dtype == np.float32
+    np.testing.assert_allclose(y, np.cumsum(np.array(x), axis=-1))
+    yj = jax.jit(lambda x: 2 * pure_host_callback(func, shape, x))(x)
+    np.testing.assert_allclose(yj, 2 * y)
+
+
+def test_pure_host_callback_vmap():
+    calls = []
+
+    def func(x, s):
+        calls.append(x.shape)
+        return s * np.cumsum(x)
+
+    def f(x, s):
+        return pure_host_callback(func, jax.ShapeDtypeStruct(x.shape, x.dtype), x, s)
+
+    x = snp.arange(24, dtype=np.float32).reshape(2, 3, 4)
+    s = snp.array([1.0, 2.0, 3.0], dtype=np.float32)
+    y_ref = s[np.newaxis, :, np.newaxis] * np.cumsum(np.array(x), axis=-1)
+    np.testing.assert_allclose(jax.vmap(f, in_axes=(0, None))(x[0], s[0]), np.cumsum(x[0], axis=-1))
+    # nested vmap with an argument batched only in the inner map
+    y = jax.jit(jax.vmap(jax.vmap(f, in_axes=(0, 0)), in_axes=(0, None)))(x, s)
+    np.testing.assert_allclose(y, y_ref)
+    y = jax.vmap(jax.vmap(f, in_axes=(0, None)), in_axes=(None, 0))(x[0], s)
+    np.testing.assert_allclose(y, np.array(s)[:, None, None] * np.cumsum(np.array(x[0]), axis=-1))
+    # each element is processed by a separate call of func within a single callback
+    assert set(calls) == {(4,)}
+
+
+def test_pure_host_callback_vmap_fallback(monkeypatch):
+    monkeypatch.setattr(scico._callback, "have_custom_vmap", False)
+
+    def f(x):
+        return pure_host_callback(np.cumsum, jax.ShapeDtypeStruct(x.shape, x.dtype), x)
+
+    x = snp.arange(12, dtype=np.float32).reshape(3, 4)
+    np.testing.assert_allclose(jax.vmap(f)(x), np.cumsum(np.array(x), axis=-1))
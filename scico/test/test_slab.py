@@ -0,0 +1,82 @@
+import os
+import tempfile
+
+import numpy as np
+
+import pytest
+
+import scico.numpy as snp
+from scico.linop.radon_jax import TomographicProjector
+from scico.slab import reconstruct_slabs, slab_partition
+
+
+@pytest.mark.parametrize(
+    "num_slices,slab_size,halo", [(10, 3, 0), (10, 3, 2), (10, 4, 1), (3, 4, 1)]
+)
+def test_slab_partition(num_slices, slab_size, halo):
+    slabs = slab_partition(num_slices, slab_size, halo)
+    written = np.concatenate([np.arange(num_slices)[s.write] for s in slabs])
+    np.testing.assert_array_equal(written, np.arange(num_slices))
+    window = min(slab_size + 2 * halo, num_slices)
+    for s in slabs:
+        read = np.arange(num_slices)[s.read]
+        assert read.size == window
+        np.testing.assert_array_equal(read[s.crop], np.arange(num_slices)[s.write])
+        assert s.read.start <= max(s.write.start - halo, 0)
+        assert s.read.stop >= min(s.write.stop + halo, num_slices)
+
+
+def test_slab_partition_invalid():
+    with pytest.raises(ValueError):
+        slab_partition(10, 0)
+    with pytest.raises(ValueError):
+        slab_partition(10, 2, -1)
+
+
+def smooth(v):
+    # couples neighboring slices along axis 1
+    return (snp.roll(v, 1, axis=1) + v + snp.roll(v, -1, axis=1)) / 3
+
+
+@pytest.mark.parametrize("prefetch", [1, 3])
+def test_reconstruct_slabs(prefetch):
+    y = np.random.randn(4, 11, 5).astype(np.float32)
+    x = np.zeros((11, 4, 5), dtype=np.float32)
+    reconstruct_slabs(
+        y,
+        x,
+        lambda v: snp.swapaxes(smooth(v), 0, 1),
+        slab_size=3,
+        halo=1,
+        y_axis=1,
+        x_axis=0,
+        prefetch=prefetch,
+    )
+    x_ref = snp.swapaxes(smooth(y), 0, 1)
+    # slices at the volume boundary have no neighbors in the slab
+    np.testing.assert_allclose(x[1:-1], x_ref[1:-1], rtol=1e-6)
+    with pytest.raises(ValueError):
+        reconstruct_slabs(y, x[1:], lambda v: v, slab_size=3, y_axis=1)
+
+
+def test_reconstruct_slabs_memmap():
+    N = 16
+    angles = np.linspace(0, np.pi, 24, False)
+    v = np.random.rand(7, N, N).astype(np.float32)
+    A = TomographicProjector(v.shape, 1.0, N, angles)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        y_path = os.path.join(tmpdir, "y.npy")
+        x_path = os.path.join(tmpdir, "x.npy")
+        y = np.lib.format.open_memmap(y_path, mode="w+", dtype=np.float32, shape=A.output_shape)
+        y[:] = A(v)
+        y.flush()
+        del y
+        y = np.load(y_path, mmap_mode="r")
+        x = np.lib.format.open_memmap(x_path, mode="w+", dtype=np.float32, shape=v.shape)
+
+        def reconstruct(y_slab):
+            return TomographicProjector((y_slab.shape[0], N, N), 1.0, N, angles).fbp(y_slab)
+
+        reconstruct_slabs(y, x, reconstruct, slab_size=2)
+        del x
+        np.testing.assert_allclose(np.load(x_path), A.fbp(A(v)), rtol=1e-5, atol=1e-5)
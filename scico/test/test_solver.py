@@ -113,6 +113,98 @@ class TestSet:
         # Assert that PCG converges faster in a few iterations
         assert cg_info["rel_res"] > 3 * pcg_info["rel_res"]
 
+    def test_cg_jit_vmap(self):
+        N = 32
+        Ac = np.random.randn(N, N).astype(np.float32)
+        Am = jax.device_put(Ac.dot(Ac.T) + N * np.identity(N, dtype=np.float32))
+        A = linop.MatrixOperator(Am)
+        X = jax.device_put(np.random.randn(4, N).astype(np.float32))
+        B = (Am @ X.T).T
+        tol = 1e-6
+        x, info = jax.jit(lambda b: solver.cg(A, b, tol=tol))(B[0])
+        assert info["num_iter"] > 0
+        assert np.linalg.norm(Am @ x - B[0]) / np.linalg.norm(B[0]) < 1e-5
+        xb, infob = jax.vmap(lambda b: solver.cg(A, b, tol=tol))(B)
+        assert infob["num_iter"].shape == (4,)
+        np.testing.assert_allclose(xb, X, rtol=1e-3, atol=1e-4)
+
+    def test_cg_host(self):
+        N = 16
+        Ac = np.random.randn(N, N).astype(np.float32)
+        Am = Ac.dot(Ac.T) + N * np.identity(N, dtype=np.float32)
+        A = lambda x: Am @ np.asarray(x)
+        x = np.random.randn(N).astype(np.float32)
+        b = Am @ x
+        x0 = np.zeros_like(x)
+        xcg, info = solver.cg(A, b, x0, tol=1e-6)
+        np.testing.assert_allclose(xcg, x, rtol=1e-3, atol=1e-4)
+        xcg, info = solver.cg(A, b, x0, tol=1e-6, jit=False)
+        np.testing.assert_allclose(xcg, x, rtol=1e-3, atol=1e-4)
+
+        def A_err(x):
+            raise TypeError("error in A")
+
+        with pytest.raises(TypeError):
+            solver.cg(A_err, b, x0)
+
+    def test_cg_blockarray(self):
+        N = 16
+        Ac = np.random.randn(N, N).astype(np.float32)
+        Am = jax.device_put(Ac.dot(Ac.T) + N * np.identity(N, dtype=np.float32))
+        d = jax.device_put(np.linspace(1.0, 2.0, N).astype(np.float32))
+        A = lambda x: snp.blockarray([Am @ x[0], d * x[1]])
+        M = lambda x: snp.blockarray([x[0] / snp.diag(Am), x[1] / d])
+        x = snp.blockarray([np.random.randn(N), np.random.randn(N)]).astype(np.float32)
+        b = A(x)
+        x0 = snp.zeros_like(x)
+        xcg, info = solver.cg(A, b, x0, tol=1e-6, M=M)
+        assert isinstance(xcg, snp.BlockArray)
+        assert info["rel_res"] < 1e-5
+        np.testing.assert_allclose(xcg[0], x[0], rtol=1e-3, atol=1e-4)
+        np.testing.assert_allclose(xcg[1], x[1], rtol=1e-3, atol=1e-4)
+
+    def test_recycled_cg(self):
+        N = 128
+        Q, _ = np.linalg.qr(np.random.randn(N, N))
+        ev = np.concatenate([np.logspace(-4, -2, 6), np.linspace(1, 2, N - 6)])
+        Am = jax.device_put(((Q * ev) @ Q.T).astype(np.float32))
+        A = linop.MatrixOperator(Am)
+        b0 = np.random.randn(N).astype(np.float32)
+        x0 = snp.zeros((N,), dtype=np.float32)
+        basis = None
+        num_iter_cg = 0
+        num_iter_rcg = 0
+        for k in range(8):
+            b = jax.device_put(b0 + 1e-1 * np.random.randn(N).astype(np.float32))
+            _, info = solver.cg(A, b, x0, tol=1e-4, maxiter=500)
+            x, basis, rinfo = solver.recycled_cg(A, b, x0, basis, nvec=6, tol=1e-4, maxiter=500)
+            assert basis[0].shape == (6, N)
+            assert rinfo["rel_res"] < 1e-4
+            assert np.linalg.norm(Am @ x - b) / np.linalg.norm(b) < 2e-3
+            num_iter_cg += info["num_iter"]
+            num_iter_rcg += rinfo["num_iter"]
+        assert num_iter_rcg < num_iter_cg / 2
+
+    def test_tolerance_schedule(self):
+        sched = solver.ToleranceSchedule(tol0=1e-3)
+        assert sched(0) == 1e-3 and sched(10) == 1e-3
+        sched = solver.GeometricTolerance(tol0=1e-2, factor=0.5, tol_min=1e-4)
+        assert sched(1) == pytest.approx(5e-3)
+        assert sched(20) == 1e-4
+        sched = solver.ResidualTolerance(eta=0.1, tol0=1e-2, tol_min=1e-6)
+        assert sched.uses_residual
+        assert sched(0, 1e-3) == 1e-2
+        assert sched(1, 1.0) == 1e-2
+        assert sched(2, 1e-3) == pytest.approx(1e-4)
+        assert sched(3, 0.0) == 1e-6
+        sched = solver.SummableTolerance(tol0=1e-2, power=2.0)
+        assert sched(1) == pytest.approx(2.5e-3)
+        assert sum(sched(k) for k in range(10000)) < 2e-2
+        with pytest.raises(ValueError):
+            solver.GeometricTolerance(factor=1.5)
+        with pytest.raises(ValueError):
+            solver.SummableTolerance(power=1.0)
+
     def test_lstsq_func(self):
         N = 24
         M = 32
@@ -145,6 +237,19 @@ class TestSet:
             assert 0
         assert np.linalg.norm(A(xlsq) - b) / np.linalg.norm(b) < 1e-6
 
+    def test_lstsq_cache(self):
+        N = 32
+        M = 24
+        Ac = jax.device_put(np.random.randn(N, M).astype(np.float32))
+        A = linop.MatrixOperator(Ac)
+        x = jax.device_put(np.random.randn(M).astype(np.float32))
+        cache_size = solver._cg_device._cache_size()
+        for k in range(4):
+            xlsq = solver.lstsq(A, Ac.dot(x + k))
+        np.testing.assert_allclose(xlsq, x + 3, rtol=1e-4)
+        assert A.gram_op is A.gram_op
+        assert solver._cg_device._cache_size() == cache_size + 1
+
 
 class TestOptimizeScalar:
     # Adopted from SciPy minimize_scalar tests
@@ -12,12 +12,16 @@ from __future__ import annotations
 
 import io
 import socket
+import struct
 import urllib.error as urlerror
 import urllib.request as urlrequest
+import zipfile
 from functools import wraps
 from timeit import default_timer as timer
 from typing import Any, Callable, Dict, List, Optional, Sequence, Union
 
+import numpy as np
+
 import jax
 from jax.interpreters.batching import BatchTracer
 from jax.interpreters.partial_eval import DynamicJaxprTracer
@@ -449,3 +453,51 @@ class ContextTimer:
         """
 
         return self.timer.elapsed(self.label, total=total)
+
+
+def npz_memmap(path: str) -> Dict[str, np.ndarray]:
+    """Memory-map the arrays in an uncompressed ``.npz`` file.
+
+    The members of an uncompressed ``.npz`` file are stored
+    contiguously, so that each array can be memory-mapped from its
+    offset within the file rather than being read into memory.
+    Zero-dimensional and empty arrays, which cannot be memory-mapped,
+    are read directly.
+
+    Args:
+        path: Path of ``.npz`` file.
+
+    Returns:
+        Dict mapping array names to (possibly memory-mapped) arrays.
+    """
+    read_header = {
+        (1, 0): np.lib.format.read_array_header_1_0,
+        (2, 0): np.lib.format.read_array_header_2_0,
+    }
+    arrays = {}
+    with zipfile.ZipFile(path) as zf, open(path, "rb") as f:
+        for info in zf.infolist():
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"Member {name} of file {path} is compressed.")
+            # skip the local file header, which has a fixed 30 byte part
+            # followed by variable length file name and extra fields
+            f.seek(info.header_offset)
+            name_len, extra_len = struct.unpack("<HH", f.read(30)[26:30])
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+            version = np.lib.format.read_magic(f)
+            if version not in read_header:
+                raise ValueError(f"Unsupported npy format version {version} in file {path}.")
+            shape, fortran_order, dtype = read_header[version](f)
+            if len(shape) == 0 or 0 in shape or dtype.hasobject:
+                arrays[name] = np.lib.format.read_array(zf.open(info.filename))
+            else:
+                arrays[name] = np.memmap(
+                    path,
+                    dtype=dtype,
+                    mode="r",
+                    offset=f.tell(),
+                    shape=shape,
+                    order="F" if fortran_order else "C",
+                )
+    return arrays